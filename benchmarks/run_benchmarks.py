@@ -0,0 +1,275 @@
+"""
+Suite de benchmarks du pipeline : chargement, extraction des caractéristiques,
+entraînement et prédiction, sur données synthétiques.
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.run_benchmarks --cycles 2000 --output benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --cycles 2000 --baseline benchmarks/baseline.json
+
+La référence est propre à chaque machine : elle n'est pas versionnée et se
+génère avec la première commande avant de comparer.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import sklearn
+
+from src.data_loader import load_all_data
+from src.features import FEATURE_PROFILES, extract_features, extract_features_batch
+from src.synthetic import generate_cycles, iter_cycle_chunks, write_dataset
+from src.train_model import TRAINERS
+
+# Plafonds par défaut pour les étapes dont le coût n'est pas linéaire ou qui
+# écrivent des fichiers texte (le débit mesuré reste comparable entre exécutions).
+# Un plafond appliqué est signalé et enregistré ; None ou 0 le désactive.
+MAX_LOAD_CYCLES = 5000
+MAX_TRAIN_CYCLES = 5000
+
+# Tolérance relative par défaut avant de signaler une régression
+DEFAULT_TOLERANCE = 0.2
+
+
+def _percentiles_ms(durations):
+    """Latences p50/p90/p99 en millisecondes."""
+    p50, p90, p99 = np.percentile(np.asarray(durations) * 1000.0, [50, 90, 99])
+    return {'p50_ms': float(p50), 'p90_ms': float(p90), 'p99_ms': float(p99)}
+
+
+def _peak_memory_mb(func):
+    """Pic d'allocations Python/NumPy pendant un appel, en Mo (mesuré à part des temps)."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    finally:
+        tracemalloc.stop()
+
+
+def _capped(bench, n_cycles, max_cycles):
+    """Applique un plafond de taille et le signale ; renvoie (cycles mesurés, infos à enregistrer)."""
+    if not max_cycles or n_cycles <= max_cycles:
+        return n_cycles, {}
+    print(f"Attention : {bench} mesuré sur {max_cycles} cycles au lieu de {n_cycles} (plafond).",
+          file=sys.stderr)
+    return max_cycles, {'requested_cycles': n_cycles}
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def bench_load(n_cycles, work_dir, max_cycles=MAX_LOAD_CYCLES):
+    """Chargement : analyse du texte brut, construction du cache, relecture du cache."""
+    n_cycles, cap = _capped('load_all_data', n_cycles, max_cycles)
+    data_dir = os.path.join(work_dir, "data")
+    write_dataset(data_dir, n_cycles)
+
+    _, raw_s = _timed(lambda: load_all_data(use_cache=False, data_dir=data_dir))
+    _, build_s = _timed(lambda: load_all_data(data_dir=data_dir))
+    _, cached_s = _timed(lambda: load_all_data(data_dir=data_dir))
+    return {
+        'cycles': n_cycles,
+        **cap,
+        'raw_s': raw_s,
+        'cache_build_s': build_s,
+        'cached_s': cached_s,
+        'raw_cycles_per_s': n_cycles / raw_s,
+        'peak_mem_mb': _peak_memory_mb(lambda: load_all_data(use_cache=False, data_dir=data_dir)),
+    }
+
+
+def bench_features_single(profile, repeats=200):
+    """Extraction des caractéristiques d'un cycle isolé."""
+    pressure, flow, _ = generate_cycles(repeats, seed=1)
+    durations = []
+    for p_cycle, f_cycle in zip(pressure, flow):
+        _, duration = _timed(lambda: extract_features(p_cycle, f_cycle, profile=profile))
+        durations.append(duration)
+    return {
+        'cycles': repeats,
+        **_percentiles_ms(durations),
+        'cycles_per_s': repeats / sum(durations),
+        'peak_mem_mb': _peak_memory_mb(lambda: extract_features(pressure[0], flow[0], profile=profile)),
+    }
+
+
+def bench_features_dataset(n_cycles, profile, chunk_size=10000):
+    """Extraction vectorisée sur tout le jeu, générée par blocs pour tenir en mémoire."""
+    total = 0.0
+    for pressure, flow, _ in iter_cycle_chunks(n_cycles, chunk_size=chunk_size, seed=2):
+        _, duration = _timed(lambda: extract_features_batch(pressure, flow, profile=profile))
+        total += duration
+    pressure, flow, _ = generate_cycles(min(n_cycles, chunk_size), seed=2)
+    return {
+        'cycles': n_cycles,
+        'seconds_s': total,
+        'cycles_per_s': n_cycles / total,
+        'peak_mem_mb': _peak_memory_mb(lambda: extract_features_batch(pressure, flow, profile=profile)),
+    }
+
+
+def bench_models(n_cycles, prediction_repeats=200, max_cycles=MAX_TRAIN_CYCLES):
+    """Entraînement de chaque modèle puis latence unitaire et débit de prédiction."""
+    n_cycles, cap = _capped('models', n_cycles, max_cycles)
+    pressure, flow, valve_opening = generate_cycles(n_cycles, seed=3)
+    X = extract_features_batch(pressure, flow).to_numpy()
+    X = (X - X.mean(axis=0)) / X.std(axis=0)
+    y = (valve_opening == 100).astype(int)
+
+    results = {}
+    for name, trainer in TRAINERS.items():
+        model, fit_s = _timed(lambda: trainer(X, y))
+        durations = [_timed(lambda: model.predict_proba(X[i % n_cycles:i % n_cycles + 1]))[1]
+                     for i in range(prediction_repeats)]
+        _, batch_s = _timed(lambda: model.predict_proba(X))
+        results[f'train_{name}'] = {
+            'cycles': n_cycles,
+            **cap,
+            'fit_s': fit_s,
+            'peak_mem_mb': _peak_memory_mb(lambda: trainer(X, y)),
+        }
+        results[f'predict_{name}'] = {
+            'cycles': n_cycles,
+            **cap,
+            **_percentiles_ms(durations),
+            'batch_cycles_per_s': n_cycles / batch_s,
+        }
+    return results
+
+
+def run_benchmarks(n_cycles=2000, profiles=('base', 'extended'), include_load=True, include_models=True,
+                   max_load_cycles=MAX_LOAD_CYCLES, max_train_cycles=MAX_TRAIN_CYCLES):
+    """
+    Exécute la suite de benchmarks.
+    
+    Args:
+        n_cycles (int, optional): Nombre de cycles synthétiques (2k à 1M). Par défaut 2000
+        profiles (tuple, optional): Profils de caractéristiques mesurés. Par défaut tous
+        include_load (bool, optional): Mesurer le chargement. Par défaut True
+        include_models (bool, optional): Mesurer l'entraînement et la prédiction. Par défaut True
+        max_load_cycles (int, optional): Plafond du chargement (None : aucun). Par défaut 5000
+        max_train_cycles (int, optional): Plafond de l'entraînement (None : aucun). Par défaut 5000
+    
+    Returns:
+        dict: {'meta': environnement d'exécution, 'results': mesures par benchmark} ;
+            les mesures plafonnées portent 'requested_cycles' en plus de 'cycles'
+    """
+    results = {}
+    if include_load:
+        with tempfile.TemporaryDirectory() as work_dir:
+            results['load_all_data'] = bench_load(n_cycles, work_dir, max_load_cycles)
+    for profile in profiles:
+        results[f'features_single_{profile}'] = bench_features_single(profile)
+        results[f'features_dataset_{profile}'] = bench_features_dataset(n_cycles, profile)
+    if include_models:
+        results.update(bench_models(n_cycles, max_cycles=max_train_cycles))
+
+    return {
+        'meta': {
+            'cycles': n_cycles,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'capped': sorted(bench for bench, metrics in results.items() if 'requested_cycles' in metrics),
+        },
+        'results': results,
+    }
+
+
+def _lower_is_better(metric):
+    if metric.endswith('_per_s'):
+        return False
+    if metric.endswith(('_s', '_ms', '_mb')):
+        return True
+    return None
+
+
+def find_regressions(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare deux rapports et liste les mesures dégradées au-delà de la tolérance.
+    
+    Les temps, latences et mémoire (suffixes _s, _ms, _mb) doivent baisser ; les
+    débits (suffixe _per_s) doivent augmenter.
+    
+    Args:
+        current (dict): Rapport de `run_benchmarks`
+        baseline (dict): Rapport de référence
+        tolerance (float, optional): Dégradation relative tolérée. Par défaut 0.2
+    
+    Returns:
+        list: Dictionnaires {benchmark, metric, baseline, current, change}
+    """
+    regressions = []
+    for bench, metrics in current['results'].items():
+        reference = baseline.get('results', {}).get(bench, {})
+        for metric, value in metrics.items():
+            lower_is_better = _lower_is_better(metric)
+            reference_value = reference.get(metric)
+            if lower_is_better is None or not reference_value:
+                continue
+            change = (value - reference_value) / reference_value
+            if (change > tolerance) if lower_is_better else (change < -tolerance):
+                regressions.append({
+                    'benchmark': bench,
+                    'metric': metric,
+                    'baseline': reference_value,
+                    'current': value,
+                    'change': change,
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline de maintenance prédictive.")
+    parser.add_argument('--cycles', type=int, default=2000, help="Nombre de cycles synthétiques (2k à 1M)")
+    parser.add_argument('--profiles', nargs='+', default=list(FEATURE_PROFILES), choices=list(FEATURE_PROFILES))
+    parser.add_argument('--skip-load', action='store_true', help="Ne pas mesurer le chargement")
+    parser.add_argument('--skip-models', action='store_true', help="Ne pas mesurer l'entraînement ni la prédiction")
+    parser.add_argument('--max-load-cycles', type=int, default=MAX_LOAD_CYCLES,
+                        help="Plafond de cycles du chargement (0 : aucun)")
+    parser.add_argument('--max-train-cycles', type=int, default=MAX_TRAIN_CYCLES,
+                        help="Plafond de cycles de l'entraînement (0 : aucun)")
+    parser.add_argument('--output', default='benchmark_results.json', help="Fichier JSON des résultats")
+    parser.add_argument('--baseline', help="Rapport de référence pour détecter les régressions")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Dégradation relative tolérée (0.2 = 20 %%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.cycles, args.profiles, not args.skip_load, not args.skip_models,
+                            args.max_load_cycles, args.max_train_cycles)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for bench, metrics in report['results'].items():
+        summary = ', '.join(f"{key}={value:.4g}" for key, value in metrics.items())
+        print(f"{bench}: {summary}")
+    print(f"\nRésultats écrits dans {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"RÉGRESSION {regression['benchmark']}.{regression['metric']} : "
+                  f"{regression['baseline']:.4g} -> {regression['current']:.4g} "
+                  f"({regression['change']:+.0%})")
+        if regressions:
+            return 1
+        print("Aucune régression par rapport à la référence.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,50 +1,578 @@
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-import joblib
+import argparse
+import sys
+import time
 from pathlib import Path
 
-from src.data_loader import load_all_data
-from src.features import extract_features
-from src.train_model import train_gradient_boosting
-from src.evaluate import evaluate_model
+from src.instrumentation import RunReport
+
+# Les dépendances lourdes (pandas, scikit-learn, joblib, matplotlib) sont importées
+# dans chaque sous-commande : un processus de scoring ne charge que NumPy.
+
+# Sous-commandes de la ligne de commande ; sans sous-commande, 'train' est utilisée
+COMMANDS = ('ingest', 'features', 'train', 'evaluate', 'score')
+
+# Modèles acceptés par --models (doit rester aligné sur src.train_model.TRAINERS,
+# non importé ici pour ne pas charger scikit-learn au démarrage)
+MODEL_NAMES = ('random_forest', 'logistic_regression', 'svm', 'knn', 'gradient_boosting')
+
+DEFAULT_COMPILED_MODEL = 'models/gradient_boosting_model.npz'
+
+# Nombre de cycles déjà appris par le modèle sauvegardé et index de ses cycles de test
+# (mode --incremental et commande evaluate)
+INCREMENTAL_STATE = 'models/incremental_state.json'
+
+# Part des nouveaux cycles réservée à la validation d'une mise à jour incrémentale
+INCREMENTAL_VALIDATION_FRACTION = 0.2
+
+# Profil élagué écrit par features --select
+DEFAULT_SELECTION = 'models/selected_features.json'
+
+def resolve_profile(feature_profile):
+    """Un chemin .json désigne un profil élagué par `features --select`."""
+    if isinstance(feature_profile, str) and feature_profile.endswith('.json'):
+        from src.feature_selection import load_selected_profile
+
+        return load_selected_profile(feature_profile)
+    return feature_profile
+
+def load_features(feature_profile='base', report=None):
+    """
+    Charge les données et extrait (ou relit depuis le magasin) les caractéristiques.
+
+    Args:
+        feature_profile (str or list, optional): Profil de caractéristiques, ou chemin
+            du JSON écrit par `features --select`. Par défaut 'base'
+        report (RunReport, optional): Rapport dans lequel mesurer chaque étape
+
+    Returns:
+        tuple: (X, y) caractéristiques et cible (1 si la valve est optimale)
+    """
+    from src.data_loader import load_all_data
+    from src.feature_store import load_or_compute_features
+
+    report = report or RunReport()
 
-def main():
-    Path("models").mkdir(exist_ok=True)
-    
     print("Chargement des données...")
-    fs1_df, ps2_df, profile_df = load_all_data()
+    with report.stage('load') as info:
+        fs1_df, ps2_df, profile_df = load_all_data()
+        info['rows'] = len(profile_df)
 
     print("Extraction des caractéristiques...")
-    features_list = []
-    for idx in profile_df.index:
-        pressure_values = ps2_df.iloc[idx].values
-        flow_values = fs1_df.iloc[idx].values
-        features = extract_features(pressure_values, flow_values)
-        features_list.append(features)
-    
-    X = pd.DataFrame(features_list)
-    
+    with report.stage('features') as info:
+        X, cache_status = load_or_compute_features(
+            ps2_df.to_numpy()[profile_df.index],
+            fs1_df.to_numpy()[profile_df.index],
+            profile=resolve_profile(feature_profile),
+        )
+        info['rows'] = len(X)
+        info['cache'] = cache_status
+    print(f"Caractéristiques : cache {cache_status}")
+
     y = (profile_df['valve_opening'] == 100).astype(int)
-    
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, train_size=2000, random_state=42
-    )
-    
+    return X, y
+
+def split_data(X, y):
+    """Sépare les 2000 cycles d'entraînement des cycles de test (découpage fixe)."""
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(X, y, train_size=2000, random_state=42)
+
+def prepare_data(feature_profile='base', report=None):
+    """
+    Charge les données, extrait les caractéristiques, sépare et standardise les jeux.
+
+    Args:
+        feature_profile (str, optional): Profil de caractéristiques. Par défaut 'base'
+        report (RunReport, optional): Rapport dans lequel mesurer chaque étape
+
+    Returns:
+        tuple: (X_train_scaled, X_test_scaled, y_train, y_test, scaler)
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    report = report or RunReport()
+    X, y = load_features(feature_profile, report)
+    X_train, X_test, y_train, y_test = split_data(X, y)
+
     print("Standardisation des données...")
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
+    with report.stage('scaling', rows=len(X)):
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
+    return X_train_scaled, X_test_scaled, y_train, y_test, scaler
+
+def finish_report(report, report_path=None):
+    """Affiche le résumé des étapes et écrit le rapport JSON (reports/ par défaut)."""
+    report_path = report_path or f"reports/{report.name}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    report.save(report_path)
+    print(f"\n{report.summary()}")
+    print(f"Rapport d'exécution : {report_path}")
+
+def evaluation_dir():
+    """Dossier horodaté des métriques et figures d'évaluation."""
+    return f"reports/evaluation_{time.strftime('%Y%m%d_%H%M%S')}"
+
+def ingest(n_workers=None, profile_stage=None, report_path=None):
+    """
+    Construit (ou valide) les caches binaires des fichiers de capteurs PS2 et FS1.
+    """
+    from src.data_loader import ensure_cache, get_data_path
+
+    report = RunReport('ingest', profile_stage=profile_stage)
+    for filename in ("PS2.txt", "FS1.txt"):
+        with report.stage(filename.split('.')[0].lower()) as info:
+            meta, info['cache'] = ensure_cache(get_data_path(filename), n_workers=n_workers)
+            info['rows'] = meta['shape'][0]
+        print(f"{filename} : cache {info['cache']} ({meta['shape'][0]} x {meta['shape'][1]})")
+    finish_report(report, report_path)
+
+def ingest_shards(shard_root, plant, shard_cycles=None):
+    """
+    Convertit les fichiers texte de data/ en fragments d'une usine du jeu de données fragmenté.
+    """
+    from src.sharded_dataset import DEFAULT_SHARD_CYCLES, import_text_dataset
+
+    paths = import_text_dataset(shard_root, plant, shard_cycles=shard_cycles or DEFAULT_SHARD_CYCLES)
+    print(f"{len(paths)} fragments écrits dans {shard_root}/{plant}")
+
+def shard_features(shard_root, feature_dir=None, feature_profile='base', n_workers=None,
+                   profile_stage=None, report_path=None):
+    """
+    Calcule en parallèle les caractéristiques des fragments pas encore traités.
+    """
+    from src.sharded_dataset import extract_shard_features
+
+    feature_dir = feature_dir or f"{shard_root.rstrip('/')}_features"
+    report = RunReport('shard_features', profile_stage=profile_stage)
+    with report.stage('features') as info:
+        result = extract_shard_features(shard_root, feature_dir, profile=resolve_profile(feature_profile), n_workers=n_workers)
+        info['shards'] = len(result['computed'])
+    print(f"Fragments calculés : {len(result['computed'])}, déjà à jour : {len(result['skipped'])} ({feature_dir})")
+    finish_report(report, report_path)
+
+def train_shards(feature_dir, profile_stage=None, report_path=None):
+    """
+    Entraîne un modèle incrémental sur les caractéristiques fragmentées, lues par lots.
+    """
+    import joblib
+
+    from src.sharded_dataset import train_on_feature_chunks
+
+    Path("models").mkdir(exist_ok=True)
+    report = RunReport('train_shards', profile_stage=profile_stage)
+    with report.stage('training'):
+        model, scaler = train_on_feature_chunks(feature_dir)
+    joblib.dump(model, 'models/sgd_model.pkl')
+    joblib.dump(scaler, 'models/sgd_scaler.pkl')
+    print("Modèle incrémental sauvegardé dans models/sgd_model.pkl")
+    finish_report(report, report_path)
+
+def features(feature_profile='base', output_path=None, profile_stage=None, report_path=None):
+    """
+    Calcule les caractéristiques de tous les cycles dans le magasin, et les exporte en CSV si demandé.
+    """
+    report = RunReport('features', profile_stage=profile_stage)
+    X, y = load_features(feature_profile, report)
+    if output_path:
+        X.assign(valve_condition_optimal=y.to_numpy()).to_csv(output_path, index=False)
+        print(f"Caractéristiques écrites dans {output_path}")
+    finish_report(report, report_path)
+
+def select(budget_us, feature_profile='extended', tolerance=None, importance='permutation',
+           output_path=DEFAULT_SELECTION, profile_stage=None, report_path=None):
+    """
+    Élague un profil de caractéristiques pour respecter un budget de calcul par cycle.
+
+    La sélection ne voit que les cycles d'entraînement du découpage fixe : les
+    cycles de test restent inédits pour l'évaluation du modèle entraîné ensuite
+    sur le profil élagué.
+
+    Args:
+        budget_us (float): Temps de calcul maximal des caractéristiques, en µs par cycle
+        feature_profile (str or list, optional): Profil de départ. Par défaut 'extended'
+        tolerance (float, optional): Baisse tolérée de l'exactitude de validation.
+            Par défaut DEFAULT_TOLERANCE de src.feature_selection
+        importance (str, optional): 'permutation' ou 'model'. Par défaut 'permutation'
+        output_path (str, optional): Fichier JSON du profil élagué
+        profile_stage (str, optional): Étape à profiler (cProfile)
+        report_path (str, optional): Chemin du rapport d'exécution JSON
+    """
+    import numpy as np
+
+    from src.data_loader import load_all_data
+    from src.feature_selection import DEFAULT_TOLERANCE, save_selection, select_features
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    report = RunReport('select', profile_stage=profile_stage)
+    with report.stage('load') as info:
+        fs1_df, ps2_df, profile_df = load_all_data()
+        info['rows'] = len(profile_df)
+
+    y = (profile_df['valve_opening'] == 100).astype(int).to_numpy()
+    train_rows, _, y_train, _ = split_data(np.arange(len(y)), y)
+    rows = profile_df.index[train_rows]
+
+    print(f"Sélection des caractéristiques (budget {budget_us:g} µs par cycle)...")
+    with report.stage('selection', rows=len(rows)):
+        selection = select_features(
+            ps2_df.to_numpy()[rows], fs1_df.to_numpy()[rows], y_train, budget_us * 1e-6,
+            profile=resolve_profile(feature_profile),
+            tolerance=DEFAULT_TOLERANCE if tolerance is None else tolerance, importance=importance,
+        )
+    save_selection(selection, output_path)
+    first = selection['history'][0]
+    print(f"{len(selection['features'])} caractéristiques : {', '.join(selection['features'])}")
+    print(f"Coût : {first['cost_s'] * 1e6:.1f} -> {selection['cost_s'] * 1e6:.1f} µs par cycle, "
+          f"exactitude {selection['baseline_score']:.4f} -> {selection['score']:.4f}")
+    if not selection['within_budget']:
+        print("Attention : budget non atteint sans dépasser la tolérance d'exactitude.")
+    print(f"Profil élagué écrit dans {output_path} (à passer à --profile)")
+    finish_report(report, report_path)
+
+def main(feature_profile='base', profile_stage=None, report_path=None, show_plots=False):
+    import joblib
+
+    from src.compiled_model import compile_tree_ensemble
+    from src.evaluate import evaluate_model
+    from src.train_model import train_gradient_boosting
+
+    Path("models").mkdir(exist_ok=True)
+    report = RunReport('train', profile_stage=profile_stage)
+    output_dir = evaluation_dir()
+
+    X_train_scaled, X_test_scaled, y_train, y_test, scaler = prepare_data(feature_profile, report)
+
     print("Entraînement du modèle Gradient Boosting...")
-    model = train_gradient_boosting(X_train_scaled, y_train)
-    
+    with report.stage('training', rows=len(y_train)):
+        model = train_gradient_boosting(X_train_scaled, y_train)
+
     print("\nÉvaluation du modèle :")
-    evaluate_model(model, X_test_scaled, y_test)
-    
+    with report.stage('evaluation', rows=len(y_test)) as info:
+        metrics = evaluate_model(model, X_test_scaled, y_test, output_dir=output_dir, show=show_plots)
+        info['roc_auc'] = metrics.get('roc_auc')
+    print(f"Métriques et figures d'évaluation : {output_dir}")
+
     print("\nSauvegarde du modèle...")
-    joblib.dump(model, 'models/gradient_boosting_model.pkl')
+    with report.stage('save'):
+        joblib.dump(model, 'models/gradient_boosting_model.pkl')
+        joblib.dump(scaler, 'models/scaler.pkl')
+        compile_tree_ensemble(model, scaler).save(DEFAULT_COMPILED_MODEL)
+        save_incremental_state(len(y_train) + len(y_test), y_test.index, model.n_estimators)
     print("Modèle sauvegardé avec succès!")
+    finish_report(report, report_path)
+
+def save_incremental_state(n_cycles, test_index, base_n_estimators=None):
+    """
+    Enregistre les cycles déjà pris en compte par le modèle sauvegardé.
+
+    Args:
+        n_cycles (int): Nombre de cycles déjà appris ou réservés au test
+        test_index (iterable): Index des cycles de test, jamais appris
+        base_n_estimators (int, optional): Taille de l'ensemble à l'entraînement complet,
+            rétablie si une mise à jour doit réentraîner le modèle entièrement
+    """
+    import json
+
+    with open(INCREMENTAL_STATE, 'w') as f:
+        json.dump({'n_cycles': int(n_cycles), 'test_index': [int(i) for i in test_index],
+                   'base_n_estimators': base_n_estimators}, f)
+
+def load_incremental_state():
+    """
+    Returns:
+        dict or None: État écrit par `save_incremental_state`, None s'il n'existe pas
+    """
+    import json
+
+    if not Path(INCREMENTAL_STATE).exists():
+        return None
+    with open(INCREMENTAL_STATE) as f:
+        return json.load(f)
+
+def split_known(X, y, state):
+    """
+    Sépare les cycles connus du modèle sauvegardé en entraînement et test.
+
+    Les cycles de test sont ceux enregistrés dans l'état : ils restent les mêmes
+    quel que soit le nombre de cycles ajoutés depuis. Un état antérieur sans
+    index de test est complété par le découpage fixe de ses `n_cycles` cycles.
+
+    Args:
+        X (pandas.DataFrame): Caractéristiques de tous les cycles
+        y (pandas.Series): Étiquettes correspondantes
+        state (dict): État écrit par `save_incremental_state`
+
+    Returns:
+        tuple: (X_train, X_test, y_train, y_test)
+    """
+    import numpy as np
+
+    n_known = state['n_cycles']
+    if 'test_index' not in state:
+        return split_data(X.iloc[:n_known], y.iloc[:n_known])
+    test = y.index.isin(state['test_index'])
+    train = ~test & (np.arange(len(y)) < n_known)
+    return X[train], X[test], y[train], y[test]
+
+def train_incremental(feature_profile='base', profile_stage=None, report_path=None):
+    """
+    Met à jour le modèle Gradient Boosting sauvegardé avec les cycles ajoutés depuis
+    le dernier entraînement, au lieu de le réentraîner entièrement.
+
+    Le magasin ne calcule les caractéristiques que des cycles ajoutés. La fin des
+    nouveaux cycles, ajoutée aux cycles de test enregistrés lors de l'entraînement,
+    sert à valider la mise à jour puis rejoint ces cycles de test ; en cas de
+    dérive ou de dégradation, le modèle est réentraîné sur tous les cycles
+    d'entraînement.
+
+    Args:
+        feature_profile (str or list, optional): Profil de caractéristiques. Par défaut 'base'
+        profile_stage (str, optional): Étape à profiler (cProfile)
+        report_path (str, optional): Chemin du rapport d'exécution JSON
+    """
+    import joblib
+    import pandas as pd
+
+    from src.compiled_model import compile_tree_ensemble
+    from src.incremental import update_model
+
+    model_path, scaler_path = 'models/gradient_boosting_model.pkl', 'models/scaler.pkl'
+    state = load_incremental_state()
+    if not Path(model_path).exists() or state is None:
+        print("Aucun modèle à mettre à jour : entraînement complet.")
+        return main(feature_profile, profile_stage, report_path)
+
+    report = RunReport('train_incremental', profile_stage=profile_stage)
+    n_known = state['n_cycles']
+    X, y = load_features(feature_profile, report)
+    if len(X) <= n_known:
+        print(f"Aucun nouveau cycle depuis le dernier entraînement ({n_known} cycles).")
+        return finish_report(report, report_path)
+
+    model, scaler = joblib.load(model_path), joblib.load(scaler_path)
+    X_train, X_test, y_train, y_test = split_known(X, y, state)
+    X_added, y_added = X.iloc[n_known:], y.iloc[n_known:]
+    n_val = int(len(X_added) * INCREMENTAL_VALIDATION_FRACTION)
+    split = len(X_added) - n_val
+    X_new, y_new = X_added.iloc[:split], y_added.iloc[:split]
+    X_val = pd.concat([X_test, X_added.iloc[split:]])
+    y_val = pd.concat([y_test, y_added.iloc[split:]])
+
+    print(f"Mise à jour sur {len(X_new)} nouveaux cycles ({len(y_val)} cycles de validation)...")
+    with report.stage('training', rows=len(X_new)) as info:
+        model, scaler, result = update_model(
+            model, scaler, X_new, y_new, X_val, y_val,
+            X_full=pd.concat([X_train, X_new]), y_full=pd.concat([y_train, y_new]),
+            base_n_estimators=state.get('base_n_estimators'),
+        )
+        info.update(result)
+    reason = f" ({result['reason']})" if result['reason'] else ""
+    print(f"Mode : {result['mode']}{reason}, exactitude de validation "
+          f"{result['score_before']:.4f} -> {result['score_after']:.4f}")
+
+    with report.stage('save'):
+        joblib.dump(model, model_path)
+        joblib.dump(scaler, scaler_path)
+        compile_tree_ensemble(model, scaler).save(DEFAULT_COMPILED_MODEL)
+        save_incremental_state(len(X), y_val.index, state.get('base_n_estimators'))
+    print("Modèle mis à jour avec succès!")
+    finish_report(report, report_path)
+
+def compare(feature_profile='base', model_names=None, n_jobs=None, profile_stage=None, report_path=None):
+    """
+    Entraîne et compare plusieurs modèles en parallèle sur les mêmes caractéristiques.
+    """
+    import joblib
+
+    from src.model_comparison import compare_models
+
+    Path("models").mkdir(exist_ok=True)
+    report = RunReport('compare', profile_stage=profile_stage)
+
+    X_train_scaled, X_test_scaled, y_train, y_test, scaler = prepare_data(feature_profile, report)
+
+    print("Comparaison des modèles...")
+    with report.stage('training', rows=len(y_train)):
+        results = compare_models(
+            X_train_scaled, y_train, X_test_scaled, y_test,
+            model_names=model_names, n_jobs=n_jobs, output_dir='models',
+        )
+    joblib.dump(scaler, 'models/scaler.pkl')
+    print(results.to_string(index=False))
+    print(f"\nMeilleur modèle : {results.loc[0, 'model']} (models/best_model.pkl)")
+    finish_report(report, report_path)
+
+def tune(feature_profile='base', model_names=None, n_jobs=None, n_splits=5, profile_stage=None, report_path=None):
+    """
+    Recherche les meilleurs hyperparamètres par validation croisée et les écrit dans models/best_params.json.
+    """
+    from src.tuning import tune_models
+
+    Path("models").mkdir(exist_ok=True)
+    report = RunReport('tune', profile_stage=profile_stage)
+
+    X_train_scaled, _, y_train, _, _ = prepare_data(feature_profile, report)
+
+    print("Recherche des hyperparamètres...")
+    with report.stage('tuning', rows=len(y_train)):
+        results = tune_models(
+            X_train_scaled, y_train, model_names=model_names,
+            output_path='models/best_params.json', n_splits=n_splits, n_jobs=n_jobs or -1,
+        )
+    for name, result in results.items():
+        print(f"{name} : {result['scoring']}={result['cv_score']:.4f} "
+              f"({result['time_s']:.1f} s) {result['params']}")
+    print("\nMeilleures configurations sauvegardées dans models/best_params.json")
+    finish_report(report, report_path)
+
+def evaluate(model_path='models/gradient_boosting_model.pkl', scaler_path='models/scaler.pkl',
+             show_plots=False, profile_stage=None, report_path=None):
+    """
+    Réévalue un modèle sauvegardé sur les cycles de test, avec le scaler de l'entraînement.
+
+    Les cycles de test sont ceux enregistrés dans models/incremental_state.json
+    (entraînement puis mises à jour incrémentales) : un cycle ajouté depuis et
+    appris par le modèle n'y figure jamais. Sans état, le découpage fixe est utilisé.
+    """
+    import joblib
+
+    from src.evaluate import evaluate_model
+
+    report = RunReport('evaluate', profile_stage=profile_stage)
+    output_dir = evaluation_dir()
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    feature_names = getattr(scaler, 'feature_names_in_', None)
+    feature_profile = list(feature_names) if feature_names is not None else 'base'
+
+    X, y = load_features(feature_profile, report)
+    state = load_incremental_state()
+    _, X_test, _, y_test = split_known(X, y, state) if state else split_data(X, y)
+    with report.stage('evaluation', rows=len(y_test)) as info:
+        metrics = evaluate_model(model, scaler.transform(X_test), y_test, output_dir=output_dir, show=show_plots)
+        info['roc_auc'] = metrics.get('roc_auc')
+    print(f"Métriques et figures d'évaluation : {output_dir}")
+    finish_report(report, report_path)
+
+def score(pressure_path, flow_path, model_path=DEFAULT_COMPILED_MODEL, output_path=None, sep='\t', threshold=0.5):
+    """
+    Score des cycles bruts avec le modèle compilé, sans pandas ni scikit-learn.
+
+    Args:
+        pressure_path (str): Fichier PS2 (une ligne d'en-tête puis un cycle par ligne)
+        flow_path (str): Fichier FS1 au même format
+        model_path (str, optional): Archive .npz de `compile_tree_ensemble`
+        output_path (str, optional): Fichier CSV de sortie. Par défaut la sortie standard
+        sep (str, optional): Séparateur des fichiers d'entrée. Par défaut '\\t'
+        threshold (float, optional): Seuil de décision sur la probabilité optimale
+
+    Returns:
+        numpy.ndarray: Probabilité que la valve soit optimale, une par cycle
+    """
+    import numpy as np
+
+    from src.compiled_model import CompiledTreeEnsemble
+    from src.data_loader import load_sensor_matrix
+    from src.features import extract_features_matrix
+
+    model = CompiledTreeEnsemble.load(model_path)
+    pressure = load_sensor_matrix(pressure_path, sep, use_cache=False)
+    flow = load_sensor_matrix(flow_path, sep, use_cache=False)
+    X = extract_features_matrix(pressure, flow, profile=model.feature_names or 'base')
+    proba = model.predict_proba(X)[:, 1]
+
+    rows = np.column_stack([np.arange(len(proba)), proba, proba >= threshold])
+    np.savetxt(output_path or sys.stdout, rows, fmt=['%d', '%.6f', '%d'], delimiter=',',
+               header='cycle,proba_optimal,prediction', comments='')
+    return proba
+
+def parse_args(argv=None):
+    """
+    Analyse la ligne de commande. Sans sous-commande (options seules ou aucun
+    argument), 'train' est utilisée comme dans les versions précédentes.
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ('-h', '--help')):
+        argv.insert(0, 'train')
+
+    parser = argparse.ArgumentParser(description="Maintenance prédictive des valves.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_run_options(command):
+        command.add_argument('--cprofile', metavar='ETAPE', help="Profiler une étape avec cProfile (load, features, scaling, training, evaluation, save)")
+        command.add_argument('--report', help="Chemin du rapport JSON d'exécution (par défaut reports/<mode>_<date>.json)")
+
+    ingest_parser = commands.add_parser('ingest', help="Construire les caches binaires des capteurs")
+    ingest_parser.add_argument('--jobs', type=int, help="Nombre de processus (par défaut le nombre de cœurs)")
+    ingest_parser.add_argument('--shards', metavar='RACINE', help="Convertir les données en fragments sous RACINE")
+    ingest_parser.add_argument('--plant', default='default', help="Usine des fragments écrits (--shards)")
+    ingest_parser.add_argument('--shard-cycles', type=int, help="Nombre de cycles par fragment (--shards)")
+    add_run_options(ingest_parser)
+
+    features_parser = commands.add_parser('features', help="Calculer les caractéristiques dans le magasin")
+    features_parser.add_argument('--profile', help="Profil de caractéristiques ('base', 'extended' ou JSON de --select ; par défaut 'base', 'extended' avec --select)")
+    features_parser.add_argument('--output', help="Exporter les caractéristiques en CSV (dossier de sortie avec --shards)")
+    features_parser.add_argument('--shards', metavar='RACINE', help="Traiter le jeu de données fragmenté sous RACINE")
+    features_parser.add_argument('--jobs', type=int, help="Nombre de processus (--shards)")
+    features_parser.add_argument('--select', action='store_true', help="Élaguer le profil pour respecter --budget-us")
+    features_parser.add_argument('--budget-us', type=float, default=100.0, help="Budget de calcul des caractéristiques en µs par cycle (--select)")
+    features_parser.add_argument('--tolerance', type=float, help="Baisse d'exactitude tolérée (--select, par défaut 0.01)")
+    features_parser.add_argument('--importance', choices=['permutation', 'model'], default='permutation', help="Importance utilisée (--select)")
+    add_run_options(features_parser)
+
+    train_parser = commands.add_parser('train', help="Entraîner le modèle (commande par défaut)")
+    train_parser.add_argument('--profile', default='base', help="Profil de caractéristiques ('base', 'extended' ou JSON de features --select)")
+    train_parser.add_argument('--compare', action='store_true', help="Comparer plusieurs modèles au lieu d'entraîner le Gradient Boosting")
+    train_parser.add_argument('--tune', action='store_true', help="Rechercher les meilleurs hyperparamètres par validation croisée")
+    train_parser.add_argument('--models', nargs='+', choices=MODEL_NAMES, help="Modèles à comparer ou à régler (par défaut tous)")
+    train_parser.add_argument('--folds', type=int, default=5, help="Nombre de plis de validation croisée (--tune)")
+    train_parser.add_argument('--jobs', type=int, help="Nombre de processus (par défaut le nombre de cœurs)")
+    train_parser.add_argument('--incremental', action='store_true', help="Mettre à jour le modèle sauvegardé avec les nouveaux cycles seulement")
+    train_parser.add_argument('--shard-features', metavar='DOSSIER', help="Entraîner un modèle incrémental par lots sur des caractéristiques fragmentées")
+    train_parser.add_argument('--show-plots', action='store_true', help="Afficher les figures d'évaluation (bloquant) en plus de les enregistrer")
+    add_run_options(train_parser)
+
+    evaluate_parser = commands.add_parser('evaluate', help="Réévaluer le modèle sauvegardé sur les cycles de test")
+    evaluate_parser.add_argument('--model', default='models/gradient_boosting_model.pkl', help="Modèle scikit-learn sauvegardé")
+    evaluate_parser.add_argument('--scaler', default='models/scaler.pkl', help="Scaler sauvegardé")
+    evaluate_parser.add_argument('--show-plots', action='store_true', help="Afficher les figures (bloquant)")
+    add_run_options(evaluate_parser)
+
+    score_parser = commands.add_parser('score', help="Scorer des cycles bruts avec le modèle compilé")
+    score_parser.add_argument('pressure', help="Fichier PS2 des cycles à scorer")
+    score_parser.add_argument('flow', help="Fichier FS1 des cycles à scorer")
+    score_parser.add_argument('--model', default=DEFAULT_COMPILED_MODEL, help="Modèle compilé (.npz)")
+    score_parser.add_argument('--output', help="Fichier CSV de sortie (par défaut la sortie standard)")
+    score_parser.add_argument('--threshold', type=float, default=0.5, help="Seuil de décision")
+    return parser.parse_args(argv)
+
+def run(args):
+    """Exécute la sous-commande analysée par `parse_args`."""
+    if args.command == 'ingest' and args.shards:
+        ingest_shards(args.shards, args.plant, args.shard_cycles)
+    elif args.command == 'ingest':
+        ingest(args.jobs, args.cprofile, args.report)
+    elif args.command == 'features' and args.select:
+        select(args.budget_us, args.profile or 'extended', args.tolerance, args.importance,
+               args.output or DEFAULT_SELECTION, args.cprofile, args.report)
+    elif args.command == 'features' and args.shards:
+        shard_features(args.shards, args.output, args.profile or 'base', args.jobs, args.cprofile, args.report)
+    elif args.command == 'features':
+        features(args.profile or 'base', args.output, args.cprofile, args.report)
+    elif args.command == 'evaluate':
+        evaluate(args.model, args.scaler, args.show_plots, args.cprofile, args.report)
+    elif args.command == 'score':
+        score(args.pressure, args.flow, args.model, args.output, threshold=args.threshold)
+    elif args.shard_features:
+        train_shards(args.shard_features, args.cprofile, args.report)
+    elif args.incremental:
+        train_incremental(args.profile, args.cprofile, args.report)
+    elif args.compare:
+        compare(args.profile, args.models, args.jobs, args.cprofile, args.report)
+    elif args.tune:
+        tune(args.profile, args.models, args.jobs, args.folds, args.cprofile, args.report)
+    else:
+        main(args.profile, args.cprofile, args.report, args.show_plots)
 
 if __name__ == "__main__":
-    main()
+    run(parse_args())
@@ -0,0 +1,253 @@
+import numpy as np
+
+try:
+    from scipy.special import expit
+except ImportError:  # appareils embarqués sans scipy
+    def expit(x):
+        return 1.0 / (1.0 + np.exp(-x))
+
+# Nombre d'échantillons parcourus à la fois lors de la prédiction
+PREDICT_CHUNK_SIZE = 8192
+
+# Marqueur des feuilles dans les tableaux d'enfants
+_LEAF = -1
+
+_ARRAY_FIELDS = ('feature', 'threshold', 'left', 'right', 'value', 'roots')
+
+
+class CompiledTreeEnsemble:
+    """
+    Ensemble d'arbres aplati en tableaux NumPy contigus, sans dépendance à scikit-learn.
+    
+    Tous les nœuds de tous les arbres sont concaténés : indice de caractéristique,
+    seuil, enfants gauche/droit (indices globaux, -1 pour une feuille) et valeur
+    de feuille. La prédiction parcourt tous les arbres simultanément pour tout le
+    lot, en au plus `max_depth` étapes vectorisées.
+    
+    Les objets sont créés par `compile_tree_ensemble` ou `CompiledTreeEnsemble.load`.
+    """
+
+    def __init__(self, kind, feature, threshold, left, right, value, roots, classes,
+                 learning_rate=1.0, init_raw=0.0, max_depth=0, scaler_mean=None,
+                 scaler_scale=None, feature_names=None):
+        self.kind = kind
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes = classes
+        self.learning_rate = float(learning_rate)
+        self.init_raw = float(init_raw)
+        self.max_depth = int(max_depth)
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.feature_names = feature_names
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def _leaf_values(self, X):
+        """Valeur de la feuille atteinte dans chaque arbre, forme (n_samples, n_trees, n_values)."""
+        flat_X = X.ravel()
+        row_offsets = (np.arange(X.shape[0]) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            left = self.left.take(nodes)
+            active = left != _LEAF
+            go_left = flat_X.take(row_offsets + self.feature.take(nodes)) <= self.threshold.take(nodes)
+            nodes = np.where(active, np.where(go_left, left, self.right.take(nodes)), nodes)
+        return self.value[nodes]
+
+    def _prepare(self, X):
+        X = np.array(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self.scaler_mean is not None:
+            X -= self.scaler_mean
+            X /= self.scaler_scale
+        # Les arbres de scikit-learn comparent des entrées converties en float32
+        return X.astype(np.float32)
+
+    def predict_proba(self, X):
+        """
+        Probabilités des classes, identiques à celles du modèle scikit-learn d'origine.
+        
+        Args:
+            X (array-like): Caractéristiques (brutes si un scaler a été intégré,
+                standardisées sinon), une ligne par cycle
+        
+        Returns:
+            numpy.ndarray: Probabilités, forme (n_samples, 2)
+        """
+        X = self._prepare(X)
+        proba = np.empty((X.shape[0], 2), dtype=np.float64)
+        for start in range(0, X.shape[0], PREDICT_CHUNK_SIZE):
+            chunk = slice(start, start + PREDICT_CHUNK_SIZE)
+            leaves = self._leaf_values(X[chunk])
+            # Somme cumulée : accumulation arbre par arbre, dans le même ordre que
+            # scikit-learn (np.sum utiliserait une sommation par paires)
+            if self.kind == 'gradient_boosting':
+                terms = np.empty((leaves.shape[0], self.n_trees + 1))
+                terms[:, 0] = self.init_raw
+                np.multiply(self.learning_rate, leaves[:, :, 0], out=terms[:, 1:])
+                raw = np.cumsum(terms, axis=1)[:, -1]
+                proba[chunk, 1] = expit(raw)
+                proba[chunk, 0] = 1.0 - proba[chunk, 1]
+            else:
+                proba[chunk] = np.cumsum(leaves, axis=1)[:, -1] / self.n_trees
+        return proba
+
+    def predict(self, X):
+        """
+        Args:
+            X (array-like): Caractéristiques, une ligne par cycle
+        
+        Returns:
+            numpy.ndarray: Classe prédite pour chaque cycle
+        """
+        return self.classes[np.argmax(self.predict_proba(X), axis=1)]
+
+    def save(self, path):
+        """
+        Sauvegarde l'ensemble dans une archive .npz (sans pickle).
+        
+        Args:
+            path (str): Chemin de l'archive
+        """
+        arrays = {name: getattr(self, name) for name in _ARRAY_FIELDS}
+        optional = {
+            name: getattr(self, name)
+            for name in ('scaler_mean', 'scaler_scale')
+            if getattr(self, name) is not None
+        }
+        if self.feature_names is not None:
+            optional['feature_names'] = np.array(self.feature_names, dtype=str)
+        np.savez(
+            path,
+            kind=np.array(self.kind),
+            classes=self.classes,
+            scalars=np.array([self.learning_rate, self.init_raw, self.max_depth]),
+            **arrays,
+            **optional,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Charge une archive produite par `save`, sans désérialiser d'objet Python.
+        
+        Args:
+            path (str): Chemin de l'archive .npz
+        
+        Returns:
+            CompiledTreeEnsemble: Ensemble prêt à prédire
+        """
+        with np.load(path, allow_pickle=False) as archive:
+            learning_rate, init_raw, max_depth = archive['scalars']
+            return cls(
+                kind=str(archive['kind']),
+                classes=archive['classes'],
+                learning_rate=learning_rate,
+                init_raw=init_raw,
+                max_depth=max_depth,
+                scaler_mean=archive['scaler_mean'] if 'scaler_mean' in archive else None,
+                scaler_scale=archive['scaler_scale'] if 'scaler_scale' in archive else None,
+                feature_names=archive['feature_names'].tolist() if 'feature_names' in archive else None,
+                **{name: archive[name] for name in _ARRAY_FIELDS},
+            )
+
+
+def _flatten_trees(trees, leaf_values):
+    """
+    Concatène les arbres scikit-learn en tableaux de nœuds à indices globaux.
+    
+    Args:
+        trees (list): Objets sklearn.tree._tree.Tree
+        leaf_values (callable): Fonction tree -> valeurs des nœuds, forme (n_nodes, n_values)
+    
+    Returns:
+        dict: Tableaux feature, threshold, left, right, value, roots et profondeur maximale
+    """
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        is_leaf = tree.children_left == _LEAF
+        roots.append(offset)
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        lefts.append(np.where(is_leaf, _LEAF, tree.children_left + offset))
+        rights.append(np.where(is_leaf, _LEAF, tree.children_right + offset))
+        values.append(leaf_values(tree))
+        offset += tree.node_count
+    return {
+        'feature': np.concatenate(features).astype(np.intp),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'left': np.concatenate(lefts).astype(np.intp),
+        'right': np.concatenate(rights).astype(np.intp),
+        'value': np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+        'roots': np.array(roots, dtype=np.intp),
+        'max_depth': max(tree.max_depth for tree in trees),
+    }
+
+
+def _normalized_class_values(tree):
+    """Probabilités de classe par nœud, normalisées comme DecisionTreeClassifier.predict_proba."""
+    value = tree.value[:, 0, :]
+    normalizer = value.sum(axis=1, keepdims=True)
+    normalizer[normalizer == 0.0] = 1.0
+    return value / normalizer
+
+
+def compile_tree_ensemble(model, scaler=None):
+    """
+    Convertit un GradientBoostingClassifier ou un RandomForestClassifier binaire entraîné.
+    
+    Args:
+        model: Modèle renvoyé par train_gradient_boosting ou train_random_forest
+        scaler (StandardScaler, optional): Standardisation à intégrer, pour que le
+            prédicteur compilé accepte directement les caractéristiques brutes
+    
+    Returns:
+        CompiledTreeEnsemble: Prédicteur compilé
+    
+    Raises:
+        ValueError: Si le type de modèle ou le nombre de classes n'est pas pris en charge
+    """
+    if len(model.classes_) != 2:
+        raise ValueError("Seule la classification binaire est prise en charge.")
+
+    model_type = type(model).__name__
+    if model_type == 'GradientBoostingClassifier':
+        flat = _flatten_trees(
+            [estimator.tree_ for estimator in model.estimators_[:, 0]],
+            lambda tree: tree.value[:, 0, :1],
+        )
+        init_raw = model._raw_predict_init(np.zeros((1, model.n_features_in_), dtype=np.float32))[0, 0]
+        kind, learning_rate = 'gradient_boosting', model.learning_rate
+    elif model_type == 'RandomForestClassifier':
+        flat = _flatten_trees([estimator.tree_ for estimator in model.estimators_], _normalized_class_values)
+        kind, learning_rate, init_raw = 'random_forest', 1.0, 0.0
+    else:
+        raise ValueError(f"Type de modèle non pris en charge : {model_type}")
+
+    feature_names = None
+    scaler_mean = scaler_scale = None
+    if scaler is not None:
+        scaler_mean = np.asarray(scaler.mean_, dtype=np.float64)
+        scaler_scale = np.asarray(scaler.scale_, dtype=np.float64)
+        if hasattr(scaler, 'feature_names_in_'):
+            feature_names = list(scaler.feature_names_in_)
+
+    return CompiledTreeEnsemble(
+        kind=kind,
+        classes=np.asarray(model.classes_),
+        learning_rate=learning_rate,
+        init_raw=init_raw,
+        scaler_mean=scaler_mean,
+        scaler_scale=scaler_scale,
+        feature_names=feature_names,
+        **flat,
+    )
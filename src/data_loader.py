@@ -1,53 +1,568 @@
+import hashlib
+import io
+import json
 import os
-import pandas as pd
+import threading
+import warnings
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 # Obtenir le chemin absolu vers la racine du projet
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def get_data_path(filename):
+# Version du format du cache binaire (à incrémenter si la structure change)
+CACHE_FORMAT_VERSION = 1
+
+# Durée d'un cycle de production en secondes
+CYCLE_SECONDS = 60
+
+def _sensor(filename, rate_hz, unit, description):
+    return {
+        'file': filename,
+        'rate_hz': rate_hz,
+        'width': int(rate_hz * CYCLE_SECONDS),
+        'unit': unit,
+        'description': description,
+    }
+
+# Registre des capteurs du banc hydraulique : fichier, fréquence d'échantillonnage,
+# nombre de mesures par cycle, unité
+SENSORS = {
+    'PS1': _sensor("PS1.txt", 100, 'bar', "Pression"),
+    'PS2': _sensor("PS2.txt", 100, 'bar', "Pression"),
+    'PS3': _sensor("PS3.txt", 100, 'bar', "Pression"),
+    'PS4': _sensor("PS4.txt", 100, 'bar', "Pression"),
+    'PS5': _sensor("PS5.txt", 100, 'bar', "Pression"),
+    'PS6': _sensor("PS6.txt", 100, 'bar', "Pression"),
+    'EPS1': _sensor("EPS1.txt", 100, 'W', "Puissance moteur"),
+    'FS1': _sensor("FS1.txt", 10, 'l/min', "Débit"),
+    'FS2': _sensor("FS2.txt", 10, 'l/min', "Débit"),
+    'TS1': _sensor("TS1.txt", 1, '°C', "Température"),
+    'TS2': _sensor("TS2.txt", 1, '°C', "Température"),
+    'TS3': _sensor("TS3.txt", 1, '°C', "Température"),
+    'TS4': _sensor("TS4.txt", 1, '°C', "Température"),
+    'VS1': _sensor("VS1.txt", 1, 'mm/s', "Vibration"),
+    'CE': _sensor("CE.txt", 1, '%', "Efficacité de refroidissement (virtuel)"),
+    'CP': _sensor("CP.txt", 1, 'kW', "Puissance de refroidissement (virtuel)"),
+    'SE': _sensor("SE.txt", 1, '%', "Facteur d'efficacité (virtuel)"),
+}
+
+# Nombre de colonnes attendu par ligne pour chaque fichier connu
+EXPECTED_COLUMNS = {spec['file']: spec['width'] for spec in SENSORS.values()}
+EXPECTED_COLUMNS["profile.txt"] = 5
+
+# Taille cible des blocs lus par chaque processus lors de l'analyse parallèle
+PARSE_CHUNK_BYTES = 16 * 1024 * 1024
+
+def get_data_path(filename, data_dir=None):
     """
     Construit le chemin absolu vers un fichier dans le dossier data/.
     
     Args:
         filename (str): Nom du fichier à localiser
+        data_dir (str, optional): Dossier des données. Par défaut PROJECT_ROOT/data
         
     Returns:
         str: Chemin absolu vers le fichier
     """
-    return os.path.join(PROJECT_ROOT, "data", filename)
+    if data_dir is None:
+        data_dir = os.path.join(PROJECT_ROOT, "data")
+    return os.path.join(data_dir, filename)
+
+def get_cache_paths(path):
+    """
+    Renvoie les chemins du cache binaire associé à un fichier texte.
+    
+    Args:
+        path (str): Chemin du fichier texte source
+        
+    Returns:
+        tuple: (chemin du tableau .npy, chemin des métadonnées .json)
+    """
+    return path + ".npy", path + ".meta.json"
+
+def _file_hash(path, block_size=1 << 20):
+    """Calcule l'empreinte BLAKE2b du contenu d'un fichier."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _read_cache_meta(path, verify_hash=False):
+    """
+    Lit les métadonnées du cache et vérifie qu'elles correspondent à la source.
+    
+    Returns:
+        dict or None: Métadonnées si le cache est valide, None sinon
+    """
+    npy_path, meta_path = get_cache_paths(path)
+    if not (os.path.exists(npy_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    stat = os.stat(path)
+    if (meta.get('format_version') != CACHE_FORMAT_VERSION
+            or meta.get('source_size') != stat.st_size
+            or meta.get('source_mtime_ns') != stat.st_mtime_ns):
+        return None
+    if verify_hash and meta.get('source_hash') != _file_hash(path):
+        return None
+    return meta
+
+def _chunk_ranges(path, start, chunk_bytes):
+    """
+    Découpe un fichier en plages d'octets [début, fin) alignées sur les fins de ligne.
+    
+    Args:
+        path (str): Chemin du fichier
+        start (int): Position de départ (après l'en-tête éventuel)
+        chunk_bytes (int): Taille cible de chaque plage
+        
+    Returns:
+        list: Liste de tuples (début, fin)
+    """
+    size = os.path.getsize(path)
+    boundaries = [start]
+    with open(path, 'rb') as f:
+        position = start + chunk_bytes
+        while position < size:
+            f.seek(position)
+            f.readline()
+            boundary = f.tell()
+            if boundary >= size:
+                break
+            boundaries.append(boundary)
+            position = boundary + chunk_bytes
+    boundaries.append(size)
+    return [(a, b) for a, b in zip(boundaries[:-1], boundaries[1:]) if b > a]
+
+def _read_range(path, start, end):
+    """Lit les octets [start, end) d'un fichier."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return f.read(end - start)
+
+def _scan_chunk(task):
+    """
+    Compte les lignes non vides d'un bloc et vérifie leur nombre de colonnes.
+    
+    Args:
+        task (tuple): (chemin, début, fin, séparateur, colonnes attendues)
+        
+    Returns:
+        tuple: (lignes de données, lignes physiques, index local de la première
+            ligne invalide ou -1, nombre de colonnes de cette ligne)
+    """
+    path, start, end, sep, n_columns = task
+    raw = np.frombuffer(_read_range(path, start, end), dtype=np.uint8)
+    if raw.size == 0:
+        return 0, 0, -1, 0
+
+    newlines = np.flatnonzero(raw == ord('\n'))
+    line_ends = newlines
+    if raw[-1] != ord('\n'):
+        line_ends = np.append(newlines, raw.size)
+    line_starts = np.concatenate(([0], newlines[:len(line_ends) - 1] + 1))
+
+    # Les lignes vides (éventuellement terminées par \r) sont ignorées, comme pandas
+    lengths = line_ends - line_starts
+    last_chars = raw[np.maximum(line_ends - 1, 0)]
+    non_empty = (lengths > 1) | ((lengths == 1) & (last_chars != ord('\r')))
+
+    separators = np.flatnonzero(raw == ord(sep))
+    n_fields = (np.searchsorted(separators, line_ends)
+                - np.searchsorted(separators, line_starts) + 1)
+    invalid = np.flatnonzero(non_empty & (n_fields != n_columns))
+    if invalid.size:
+        return int(non_empty.sum()), len(line_ends), int(invalid[0]), int(n_fields[invalid[0]])
+    return int(non_empty.sum()), len(line_ends), -1, 0
+
+def _parse_chunk(task):
+    """
+    Analyse un bloc de lignes et l'écrit directement dans le tableau .npy de sortie.
+    
+    Args:
+        task (tuple): (chemin, début, fin, séparateur, chemin .npy, première ligne
+            de destination, nombre de lignes, type des valeurs)
+    """
+    path, start, end, sep, out_path, row_start, n_rows, dtype = task
+    if n_rows == 0:
+        return
+    # np.loadtxt (analyseur C) évite le coût par colonne de pandas sur 6000 colonnes
+    values = np.loadtxt(io.BytesIO(_read_range(path, start, end)), delimiter=sep, dtype=dtype, ndmin=2)
+    out = np.load(out_path, mmap_mode='r+')
+    out[row_start:row_start + n_rows] = values
+    out.flush()
+    del out
+
+def _header_columns(fields):
+    """
+    Noms de colonnes tirés de la première ligne, dédoublonnés comme pandas.read_csv.
+    
+    Args:
+        fields (list): Champs bruts (bytes) de la ligne d'en-tête
+    
+    Returns:
+        list: Noms de colonnes ('x', 'x.1', 'x.2'... pour les doublons)
+    """
+    header = [field.decode().strip() for field in fields]
+    names = set(header)
+    columns = []
+    counts = {}
+    for original in header:
+        name = original
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in names else counts.get(name, 0)
+        counts[name] = count + 1
+        columns.append(name)
+    return columns
+
+def parse_sensor_file(path, out_path, sep='\t', n_columns=None, dtype=np.float64,
+                      header=True, n_workers=None, chunk_bytes=PARSE_CHUNK_BYTES):
+    """
+    Analyse en parallèle un fichier texte de capteur vers un tableau .npy préalloué.
+    
+    Le fichier est découpé en plages d'octets alignées sur les lignes. Une première
+    passe compte les lignes et vérifie le nombre de colonnes de chacune ; la seconde
+    analyse chaque plage dans un pool de processus et écrit les valeurs directement
+    à leur position finale dans le fichier de sortie mappé en mémoire.
+    
+    Args:
+        path (str): Chemin du fichier texte source
+        out_path (str): Chemin du fichier .npy à écrire
+        sep (str, optional): Séparateur utilisé dans le fichier. Par défaut '\t'
+        n_columns (int, optional): Nombre de colonnes attendu par ligne. Par défaut
+            celui de EXPECTED_COLUMNS pour ce nom de fichier, sinon celui de la
+            première ligne
+        dtype (numpy.dtype, optional): Type des valeurs (float32 ou float64). Par défaut float64
+        header (bool, optional): La première ligne sert de noms de colonnes, comme
+            avec pandas.read_csv. Par défaut True
+        n_workers (int, optional): Nombre de processus. Par défaut le nombre de cœurs
+        chunk_bytes (int, optional): Taille cible des plages. Par défaut PARSE_CHUNK_BYTES
+        
+    Returns:
+        tuple: (tableau numpy.memmap en lecture seule, liste des noms de colonnes)
+        
+    Raises:
+        ValueError: Si une ligne n'a pas le nombre de colonnes attendu
+    """
+    if n_columns is None:
+        n_columns = EXPECTED_COLUMNS.get(os.path.basename(path))
+
+    with open(path, 'rb') as f:
+        first_line = f.readline()
+    first_fields = first_line.rstrip(b'\r\n').split(sep.encode())
+    if n_columns is None:
+        n_columns = len(first_fields)
+    if first_line.strip() and len(first_fields) != n_columns:
+        raise ValueError(
+            f"{path} : la ligne 1 contient {len(first_fields)} colonnes, {n_columns} attendues."
+        )
+
+    if header:
+        columns = _header_columns(first_fields)
+        data_start, line_offset = len(first_line), 1
+    else:
+        columns = [str(i) for i in range(n_columns)]
+        data_start, line_offset = 0, 0
+
+    ranges = _chunk_ranges(path, data_start, chunk_bytes)
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, len(ranges)))
+
+    scan_tasks = [(path, a, b, sep, n_columns) for a, b in ranges]
+    if n_workers == 1:
+        scans = [_scan_chunk(task) for task in scan_tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            scans = list(pool.map(_scan_chunk, scan_tasks))
+
+    for n_rows, n_lines, bad_line, bad_count in scans:
+        if bad_line >= 0:
+            raise ValueError(
+                f"{path} : la ligne {line_offset + bad_line + 1} contient {bad_count} "
+                f"colonnes, {n_columns} attendues."
+            )
+        line_offset += n_lines
+
+    row_counts = [scan[0] for scan in scans]
+    row_starts = np.concatenate(([0], np.cumsum(row_counts)[:-1])).astype(int)
+    out = np.lib.format.open_memmap(
+        out_path, mode='w+', dtype=dtype, shape=(int(sum(row_counts)), n_columns)
+    )
+    del out
+
+    parse_tasks = [
+        (path, a, b, sep, out_path, int(row_start), n_rows, dtype)
+        for (a, b), row_start, n_rows in zip(ranges, row_starts, row_counts)
+    ]
+    if n_workers == 1:
+        for task in parse_tasks:
+            _parse_chunk(task)
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            list(pool.map(_parse_chunk, parse_tasks))
+
+    return np.load(out_path, mmap_mode='r'), columns
+
+def build_cache(path, sep='\t', n_workers=None):
+    """
+    Analyse un fichier texte de capteur et écrit son cache binaire (.npy + .json).
+    
+    L'écriture passe par des fichiers temporaires renommés atomiquement, les
+    métadonnées en dernier : un cache interrompu n'est jamais considéré valide.
+    
+    Args:
+        path (str): Chemin du fichier texte source
+        sep (str, optional): Séparateur utilisé dans le fichier. Par défaut '\t'
+        n_workers (int, optional): Nombre de processus d'analyse. Par défaut le nombre de cœurs
+        
+    Returns:
+        dict: Métadonnées du cache écrit
+    """
+    npy_path, meta_path = get_cache_paths(path)
+    stat = os.stat(path)
+
+    tmp_npy = npy_path + ".tmp"
+    tmp_meta = meta_path + ".tmp"
+    try:
+        values, columns = parse_sensor_file(path, tmp_npy, sep=sep, n_workers=n_workers)
+        shape = values.shape
+        del values
+        os.replace(tmp_npy, npy_path)
+
+        meta = {
+            'format_version': CACHE_FORMAT_VERSION,
+            'source_size': stat.st_size,
+            'source_mtime_ns': stat.st_mtime_ns,
+            'source_hash': _file_hash(path),
+            'columns': columns,
+            'shape': list(shape),
+        }
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+    finally:
+        # Après une erreur (fichier mal formé, disque plein...), aucun temporaire ne reste
+        for tmp_path in (tmp_npy, tmp_meta):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return meta
+
+def ensure_cache(path, sep='\t', verify_hash=False, n_workers=None):
+    """
+    Construit le cache binaire d'un fichier de capteur s'il est absent ou périmé.
+    
+    Args:
+        path (str): Chemin du fichier texte source
+        sep (str, optional): Séparateur utilisé dans le fichier. Par défaut '\t'
+        verify_hash (bool, optional): Vérifier aussi l'empreinte du contenu. Par défaut False
+        n_workers (int, optional): Nombre de processus d'analyse. Par défaut le nombre de cœurs
+        
+    Returns:
+        tuple: (meta, status) métadonnées du cache et 'hit' ou 'built'
+    """
+    meta = _read_cache_meta(path, verify_hash=verify_hash)
+    if meta is not None:
+        return meta, 'hit'
+    return build_cache(path, sep, n_workers=n_workers), 'built'
+
+def load_sensor_file(path, sep='\t', use_cache=True, verify_hash=False, n_workers=None):
+    """
+    Charge un fichier de capteur, via le cache binaire mappé en mémoire si possible.
+    
+    Au premier chargement, le cache est construit à côté du fichier texte par
+    l'analyseur parallèle `parse_sensor_file` ; il est
+    invalidé dès que la taille ou la date de modification de la source change
+    (et son empreinte si `verify_hash` est activé).
+    
+    Args:
+        path (str): Chemin du fichier texte source
+        sep (str, optional): Séparateur utilisé dans le fichier. Par défaut '\t'
+        use_cache (bool, optional): Utiliser le cache binaire. Par défaut True
+        verify_hash (bool, optional): Vérifier aussi l'empreinte du contenu. Par défaut False
+        n_workers (int, optional): Nombre de processus pour construire le cache. Par
+            défaut le nombre de cœurs
+        
+    Returns:
+        pandas.DataFrame: Données avec une mesure par ligne (vue sur un memmap
+            en lecture seule lorsque le cache est utilisé)
+    """
+    import pandas as pd
+
+    if not use_cache:
+        return pd.read_csv(path, sep=sep, engine='python')
+
+    meta = _read_cache_meta(path, verify_hash=verify_hash)
+    if meta is None:
+        try:
+            meta = build_cache(path, sep, n_workers=n_workers)
+        except OSError as exc:
+            warnings.warn(f"Impossible d'écrire le cache pour {path} ({exc}), lecture du texte brut.")
+            return pd.read_csv(path, sep=sep, engine='python')
+
+    values = np.load(get_cache_paths(path)[0], mmap_mode='r')
+    return pd.DataFrame(values, columns=meta['columns'], copy=False)
+
+def load_sensor_matrix(path, sep='\t', use_cache=True, verify_hash=False, n_workers=None):
+    """
+    Charge un fichier de capteur sous forme de matrice NumPy, sans importer pandas.
+    
+    Même cache que `load_sensor_file` ; sans cache, le texte est lu directement
+    par NumPy (une ligne d'en-tête ignorée).
+    
+    Args:
+        path (str): Chemin du fichier texte source
+        sep (str, optional): Séparateur utilisé dans le fichier. Par défaut '\t'
+        use_cache (bool, optional): Utiliser (et construire si besoin) le cache binaire. Par défaut True
+        verify_hash (bool, optional): Vérifier aussi l'empreinte du contenu. Par défaut False
+        n_workers (int, optional): Nombre de processus pour construire le cache
+        
+    Returns:
+        numpy.ndarray: Une ligne par mesure (memmap en lecture seule avec le cache)
+    """
+    if not use_cache:
+        return np.loadtxt(path, delimiter=sep, skiprows=1, ndmin=2)
+
+    ensure_cache(path, sep, verify_hash=verify_hash, n_workers=n_workers)
+    return np.load(get_cache_paths(path)[0], mmap_mode='r')
+
+def get_sensor_spec(name):
+    """
+    Renvoie la description d'un capteur du registre.
+    
+    Args:
+        name (str): Nom du capteur (clé de SENSORS, par exemple 'PS2')
+        
+    Returns:
+        dict: 'file', 'rate_hz', 'width', 'unit' et 'description'
+        
+    Raises:
+        ValueError: Si le capteur est inconnu
+    """
+    if name not in SENSORS:
+        raise ValueError(f"Capteur inconnu : {name!r} (disponibles : {', '.join(SENSORS)})")
+    return SENSORS[name]
 
-def load_fs1(sep='\t'):
+def load_sensor(name, sep='\t', use_cache=True, data_dir=None):
+    """
+    Charge un capteur du registre sous forme de DataFrame.
+    
+    Args:
+        name (str): Nom du capteur (clé de SENSORS)
+        sep (str, optional): Séparateur utilisé dans le fichier. Par défaut '\t'
+        use_cache (bool, optional): Utiliser le cache binaire mappé en mémoire. Par défaut True
+        data_dir (str, optional): Dossier des données. Par défaut PROJECT_ROOT/data
+        
+    Returns:
+        pandas.DataFrame: Une ligne par cycle, SENSORS[name]['width'] colonnes
+    """
+    path = get_data_path(get_sensor_spec(name)['file'], data_dir)
+    return load_sensor_file(path, sep, use_cache=use_cache)
+
+class SensorSet(Mapping):
+    """
+    Accès paresseux aux capteurs d'un dossier de données.
+    
+    Un capteur n'est lu qu'au premier accès (`sensors['TS1']`), puis conservé ;
+    avec le cache, il s'agit d'un tableau mappé en mémoire dont seules les pages
+    utilisées sont chargées. Les accès concurrents depuis plusieurs threads sont sûrs,
+    et des capteurs différents peuvent être lus en parallèle.
+    
+    Exemple:
+        sensors = SensorSet()
+        pressure = sensors['PS2']   # seul PS2.txt est lu
+    
+    Args:
+        data_dir (str, optional): Dossier des données. Par défaut PROJECT_ROOT/data
+        sep (str, optional): Séparateur utilisé dans les fichiers. Par défaut '\t'
+        use_cache (bool, optional): Utiliser le cache binaire. Par défaut True
+        names (list, optional): Capteurs exposés. Par défaut ceux du registre dont
+            le fichier est présent dans `data_dir`
+    """
+
+    def __init__(self, data_dir=None, sep='\t', use_cache=True, names=None):
+        self.data_dir = data_dir
+        self.sep = sep
+        self.use_cache = use_cache
+        if names is None:
+            names = [name for name, spec in SENSORS.items()
+                     if os.path.exists(get_data_path(spec['file'], data_dir))]
+        for name in names:
+            get_sensor_spec(name)
+        self.names = list(names)
+        self._matrices = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        if name not in self.names:
+            raise KeyError(name)
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._matrices:
+                path = get_data_path(SENSORS[name]['file'], self.data_dir)
+                self._matrices[name] = load_sensor_matrix(path, self.sep, use_cache=self.use_cache)
+            return self._matrices[name]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def loaded(self):
+        """Capteurs déjà lus."""
+        return list(self._matrices)
+
+def load_fs1(sep='\t', use_cache=True, data_dir=None):
     """
     Charge les données de débit FS1 mesurées à 10 Hz.
     
     Args:
         sep (str, optional): Séparateur utilisé dans le fichier. Par défaut '\t'
+        use_cache (bool, optional): Utiliser le cache binaire mappé en mémoire. Par défaut True
+        data_dir (str, optional): Dossier des données. Par défaut PROJECT_ROOT/data
         
     Returns:
         pandas.DataFrame: Données de débit avec une mesure par ligne
     """
-    path = get_data_path("FS1.txt")
-    return pd.read_csv(path, sep=sep, engine='python')
+    return load_sensor('FS1', sep, use_cache=use_cache, data_dir=data_dir)
 
-def load_ps2(sep='\t'):
+def load_ps2(sep='\t', use_cache=True, data_dir=None):
     """
     Charge les données de pression PS2 mesurées à 100 Hz.
     
     Args:
         sep (str, optional): Séparateur utilisé dans le fichier. Par défaut '\t'
+        use_cache (bool, optional): Utiliser le cache binaire mappé en mémoire. Par défaut True
+        data_dir (str, optional): Dossier des données. Par défaut PROJECT_ROOT/data
         
     Returns:
         pandas.DataFrame: Données de pression avec une mesure par ligne
     """
-    path = get_data_path("PS2.txt")
-    return pd.read_csv(path, sep=sep, engine='python')
+    return load_sensor('PS2', sep, use_cache=use_cache, data_dir=data_dir)
 
-def load_profile(sep='\t'):
+def load_profile(sep='\t', data_dir=None):
     """
     Charge les données de profil résumant chaque cycle de production.
     
     Args:
         sep (str, optional): Séparateur utilisé dans le fichier. Par défaut '\t'
+        data_dir (str, optional): Dossier des données. Par défaut PROJECT_ROOT/data
         
     Returns:
         pandas.DataFrame: Données de profil avec les colonnes:
@@ -55,17 +570,22 @@ def load_profile(sep='\t'):
             - valve_opening: Pourcentage d'ouverture de la valve (100% = optimal)
             - colonne_3, colonne_4, colonne_5: Autres mesures du cycle
     """
-    path = get_data_path("profile.txt")
+    import pandas as pd
+
+    path = get_data_path("profile.txt", data_dir)
     df = pd.read_csv(path, sep=sep, engine='python')
     df.columns = ['colonne_1', 'valve_opening', 'colonne_3', 'colonne_4', 'colonne_5']
     return df
 
-def load_all_data(sep='\t'):
+def load_all_data(sep='\t', use_cache=True, data_dir=None):
     """
     Charge l'ensemble des données du système hydraulique.
     
     Args:
         sep (str, optional): Séparateur utilisé dans les fichiers. Par défaut '\t'
+        use_cache (bool, optional): Charger PS2/FS1 depuis le cache binaire (True)
+            ou analyser les fichiers texte bruts (False). Par défaut True
+        data_dir (str, optional): Dossier des données. Par défaut PROJECT_ROOT/data
         
     Returns:
         tuple: (fs1_df, ps2_df, profile_df)
@@ -73,6 +593,10 @@ def load_all_data(sep='\t'):
             - ps2_df: DataFrame des données de pression (100 Hz)
             - profile_df: DataFrame des informations par cycle
     """
-    return load_fs1(sep), load_ps2(sep), load_profile(sep)
+    return (
+        load_fs1(sep, use_cache=use_cache, data_dir=data_dir),
+        load_ps2(sep, use_cache=use_cache, data_dir=data_dir),
+        load_profile(sep, data_dir=data_dir),
+    )
 
 
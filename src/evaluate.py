@@ -1,31 +1,237 @@
-from sklearn.metrics import classification_report, confusion_matrix
-import seaborn as sns
-import matplotlib.pyplot as plt
+import json
+import os
 
-def evaluate_model(model, X_test, y_test):
+import numpy as np
+from sklearn.metrics import (
+    average_precision_score,
+    classification_report,
+    confusion_matrix,
+    precision_recall_curve,
+    roc_auc_score,
+    roc_curve,
+)
+
+# Seuils de décision évalués par défaut lors du balayage
+DEFAULT_THRESHOLDS = np.linspace(0.0, 1.0, 101)
+
+# Nombre maximal de points conservés par courbe ROC / précision-rappel
+MAX_CURVE_POINTS = 200
+
+
+def _to_list(values):
+    """Convertit un tableau en liste JSON (les valeurs non finies deviennent None)."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+def _decimate_curve(max_points, **curve):
+    """
+    Réduit une courbe à au plus max_points points régulièrement répartis.
+    
+    Les courbes ROC et précision-rappel sont monotones : les points extrêmes
+    sont conservés et l'allure de la courbe ne change pas.
+    
+    Returns:
+        dict: Listes JSON de même longueur, une par tableau de `curve`
+    """
+    n_points = len(next(iter(curve.values())))
+    if n_points > max_points:
+        keep = np.unique(np.linspace(0, n_points - 1, max_points).round().astype(np.intp))
+        curve = {name: np.asarray(values)[keep] for name, values in curve.items()}
+    return {name: _to_list(values) for name, values in curve.items()}
+
+
+def threshold_sweep(y_true, scores, thresholds=DEFAULT_THRESHOLDS):
+    """
+    Calcule précision, rappel, F1 et accuracy pour une série de seuils, en une passe vectorisée.
+    
+    Les scores de chaque classe sont triés une fois ; le nombre de cycles au-dessus
+    de chaque seuil s'obtient ensuite par recherche dichotomique, sans reparcourir
+    les données pour chaque seuil.
+    
+    Args:
+        y_true (array-like): Labels réels (0: non optimal, 1: optimal)
+        scores (array-like): Probabilité prédite de la classe 1
+        thresholds (array-like, optional): Seuils (prédiction 1 si score >= seuil)
+    
+    Returns:
+        dict: Listes 'threshold', 'precision', 'recall', 'f1', 'accuracy'
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    scores = np.asarray(scores, dtype=np.float64)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+
+    positives = np.sort(scores[y_true])
+    negatives = np.sort(scores[~y_true])
+    tp = len(positives) - np.searchsorted(positives, thresholds, side='left')
+    fp = len(negatives) - np.searchsorted(negatives, thresholds, side='left')
+    fn = len(positives) - tp
+    tn = len(negatives) - fp
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    accuracy = (tp + tn) / max(len(scores), 1)
+
+    return {
+        'threshold': _to_list(thresholds),
+        'precision': _to_list(precision),
+        'recall': _to_list(recall),
+        'f1': _to_list(f1),
+        'accuracy': _to_list(accuracy),
+    }
+
+
+def compute_metrics(y_test, y_pred, scores, thresholds=DEFAULT_THRESHOLDS, max_curve_points=MAX_CURVE_POINTS):
+    """
+    Calcule toutes les métriques d'évaluation à partir des prédictions déjà obtenues.
+    
+    Args:
+        y_test (array-like): Labels réels
+        y_pred (array-like): Classes prédites
+        scores (array-like): Probabilité prédite de la classe 1
+        thresholds (array-like, optional): Seuils du balayage
+        max_curve_points (int, optional): Points conservés par courbe. Par défaut 200
+    
+    Returns:
+        dict: Rapport de classification, matrice de confusion, courbes ROC et
+            précision-rappel (réduites à max_curve_points points ; les aires sont
+            calculées sur les courbes complètes) et balayage des seuils
+    """
+    y_test = np.asarray(y_test)
+    metrics = {
+        'n_samples': int(len(y_test)),
+        'classification_report': classification_report(y_test, y_pred, output_dict=True, zero_division=0),
+        'confusion_matrix': confusion_matrix(y_test, y_pred).tolist(),
+        'threshold_sweep': threshold_sweep(y_test, scores, thresholds),
+    }
+    if len(np.unique(y_test)) > 1:
+        fpr, tpr, roc_thresholds = roc_curve(y_test, scores)
+        precision, recall, pr_thresholds = precision_recall_curve(y_test, scores)
+        metrics.update({
+            'roc_auc': float(roc_auc_score(y_test, scores)),
+            'average_precision': float(average_precision_score(y_test, scores)),
+            'roc_curve': _decimate_curve(max_curve_points, fpr=fpr, tpr=tpr, thresholds=roc_thresholds),
+            # Le dernier point (rappel nul) n'a pas de seuil : None
+            'pr_curve': _decimate_curve(max_curve_points, precision=precision, recall=recall,
+                                        thresholds=np.append(pr_thresholds, np.nan)),
+        })
+    return metrics
+
+
+def _draw_confusion_matrix(ax, cm):
+    ax.imshow(cm, cmap='Blues')
+    threshold = cm.max() / 2.0
+    for (row, col), value in np.ndenumerate(cm):
+        ax.text(col, row, f"{value:d}", ha='center', va='center',
+                color='white' if value > threshold else 'black')
+    ax.set_xticks(range(cm.shape[1]))
+    ax.set_yticks(range(cm.shape[0]))
+    ax.set_xlabel('Prédit')
+    ax.set_ylabel('Réel')
+    ax.set_title('Matrice de confusion')
+
+
+def _draw_roc_curve(ax, metrics):
+    ax.plot(metrics['roc_curve']['fpr'], metrics['roc_curve']['tpr'],
+            label=f"AUC = {metrics['roc_auc']:.3f}")
+    ax.plot([0, 1], [0, 1], linestyle='--', color='grey')
+    ax.set_xlabel('Taux de faux positifs')
+    ax.set_ylabel('Taux de vrais positifs')
+    ax.set_title('Courbe ROC')
+    ax.legend(loc='lower right')
+
+
+def _draw_pr_curve(ax, metrics):
+    ax.plot(metrics['pr_curve']['recall'], metrics['pr_curve']['precision'],
+            label=f"AP = {metrics['average_precision']:.3f}")
+    ax.set_xlabel('Rappel')
+    ax.set_ylabel('Précision')
+    ax.set_title('Courbe précision-rappel')
+    ax.legend(loc='lower left')
+
+
+def plot_evaluation(metrics, output_dir=None, show=True):
+    """
+    Trace la matrice de confusion et, si disponibles, les courbes ROC et précision-rappel.
+    
+    Matplotlib n'est importé qu'ici. Sans affichage (show=False), les figures sont
+    construites directement sur le moteur de rendu non interactif, sans pyplot ni
+    interface graphique, et seulement écrites sur disque.
+    
+    Args:
+        metrics (dict): Résultat de `compute_metrics`
+        output_dir (str, optional): Dossier où enregistrer les figures (PNG)
+        show (bool, optional): Afficher les figures (bloquant). Par défaut True
+    
+    Returns:
+        list: Chemins des figures enregistrées
+    """
+    drawers = [('confusion_matrix', lambda ax: _draw_confusion_matrix(ax, np.asarray(metrics['confusion_matrix'])))]
+    if 'roc_curve' in metrics:
+        drawers.append(('roc_curve', lambda ax: _draw_roc_curve(ax, metrics)))
+        drawers.append(('precision_recall_curve', lambda ax: _draw_pr_curve(ax, metrics)))
+
+    if show:
+        import matplotlib.pyplot as plt
+        new_figure = lambda: plt.figure(figsize=(6, 5))
+    else:
+        from matplotlib.figure import Figure
+        new_figure = lambda: Figure(figsize=(6, 5))
+
+    paths = []
+    for name, draw in drawers:
+        fig = new_figure()
+        draw(fig.add_subplot())
+        fig.tight_layout()
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            path = os.path.join(output_dir, f"{name}.png")
+            fig.savefig(path, dpi=100)
+            paths.append(path)
+    if show:
+        plt.show()
+    return paths
+
+
+def evaluate_model(model, X_test, y_test, output_dir=None, show=True, thresholds=DEFAULT_THRESHOLDS):
     """
     Évalue les performances d'un modèle de classification des valves.
     
+    Le modèle n'est interrogé qu'une fois (predict_proba) ; classes prédites,
+    courbes et balayage des seuils sont dérivés de ces probabilités.
+    
     Args:
         model: Modèle entraîné à évaluer
         X_test (array-like): Features de test
         y_test (array-like): Labels de test (0: non optimal, 1: optimal)
+        output_dir (str, optional): Dossier où écrire metrics.json et les figures
+        show (bool, optional): Afficher les figures (bloquant). Par défaut True ;
+            False pour une évaluation sans interface graphique
+        thresholds (array-like, optional): Seuils du balayage
     
     Affiche:
         - Rapport de classification (précision, rappel, f1-score)
-        - Matrice de confusion visualisée avec seaborn
+        - Matrice de confusion et courbes ROC / précision-rappel si show=True
+    
+    Returns:
+        dict: Métriques calculées (voir `compute_metrics`)
     """
-    # Prédictions sur l'ensemble de test
-    y_pred = model.predict(X_test)
+    # Prédictions sur l'ensemble de test, en une seule passe
+    proba = model.predict_proba(X_test)
+    y_pred = model.classes_[np.argmax(proba, axis=1)]
+    scores = proba[:, 1]
+
+    metrics = compute_metrics(y_test, y_pred, scores, thresholds)
 
     # Affichage du rapport de classification
     print("Classification Report :")
-    print(classification_report(y_test, y_pred))
-
-    # Création et affichage de la matrice de confusion
-    cm = confusion_matrix(y_test, y_pred)
-    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
-    plt.xlabel('Prédit')
-    plt.ylabel('Réel')
-    plt.title('Matrice de confusion')
-    plt.show()
+    print(classification_report(y_test, y_pred, digits=2, zero_division=0))
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, "metrics.json"), 'w', encoding='utf-8') as f:
+            json.dump(metrics, f, indent=2)
+    if show or output_dir:
+        plot_evaluation(metrics, output_dir=output_dir, show=show)
+    return metrics
@@ -0,0 +1,187 @@
+import json
+import time
+
+import numpy as np
+from sklearn.inspection import permutation_importance
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from src.features import check_matrices, extract_features_matrix, get_feature_names
+from src.train_model import TRAINERS
+
+# Nombre de cycles utilisés pour mesurer le coût des caractéristiques
+DEFAULT_COST_CYCLES = 256
+
+# Baisse maximale tolérée de l'exactitude de validation par rapport au profil complet
+DEFAULT_TOLERANCE = 0.01
+
+
+def measure_cost(pressure_matrix, flow_matrix, names, repeats=3):
+    """
+    Mesure le temps de calcul par cycle d'un ensemble de caractéristiques.
+
+    Les intermédiaires partagés (moments, dérivées...) ne sont calculés qu'une fois
+    par ensemble : le coût d'un ensemble est en général inférieur à la somme des
+    coûts de ses caractéristiques.
+
+    Args:
+        pressure_matrix (array-like): Pressions, une ligne par cycle
+        flow_matrix (array-like): Débits, une ligne par cycle
+        names (list): Caractéristiques à calculer
+        repeats (int, optional): Nombre de mesures, dont on garde la meilleure
+
+    Returns:
+        float: Secondes par cycle
+    """
+    pressure_matrix, flow_matrix = check_matrices(pressure_matrix, flow_matrix)
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        extract_features_matrix(pressure_matrix, flow_matrix, profile=names)
+        best = min(best, time.perf_counter() - start)
+    return best / pressure_matrix.shape[0]
+
+
+def profile_feature_costs(pressure_matrix, flow_matrix, profile='extended', repeats=3):
+    """
+    Mesure le coût par cycle de chaque caractéristique calculée seule.
+
+    Args:
+        pressure_matrix (array-like): Pressions, une ligne par cycle
+        flow_matrix (array-like): Débits, une ligne par cycle
+        profile (str or list, optional): Profil de caractéristiques. Par défaut 'extended'
+        repeats (int, optional): Nombre de mesures par caractéristique, dont on garde la meilleure
+
+    Returns:
+        dict: Nom de la caractéristique -> secondes par cycle
+    """
+    return {name: measure_cost(pressure_matrix, flow_matrix, [name], repeats)
+            for name in get_feature_names(profile)}
+
+
+def _fit_and_score(model_name, X_train, y_train, X_val, y_val, importance, random_state):
+    """Entraîne le modèle sur les colonnes retenues ; renvoie l'exactitude et l'importance de chaque colonne."""
+    scaler = StandardScaler().fit(X_train)
+    X_train, X_val = scaler.transform(X_train), scaler.transform(X_val)
+    model = TRAINERS[model_name](X_train, y_train)
+    if importance == 'permutation':
+        importances = permutation_importance(model, X_val, y_val, n_repeats=5,
+                                             random_state=random_state).importances_mean
+    else:
+        importances = model.feature_importances_
+    return model.score(X_val, y_val), np.maximum(importances, 0.0)
+
+
+def select_features(pressure_matrix, flow_matrix, y, budget_s, profile='extended', tolerance=DEFAULT_TOLERANCE,
+                    model_name='gradient_boosting', importance='permutation', validation_size=0.25,
+                    n_cost_cycles=DEFAULT_COST_CYCLES, repeats=5, random_state=42):
+    """
+    Élague un profil de caractéristiques jusqu'à respecter un budget de calcul par cycle.
+
+    Part du profil complet et retire, une à une, la caractéristique la moins
+    rentable (importance de permutation, ou importance du modèle, divisée par son
+    coût mesuré seule), en réentraînant le modèle à chaque étape. Une
+    caractéristique dont le retrait ferait baisser l'exactitude de validation de
+    plus de `tolerance` par rapport au profil complet est conservée. La
+    validation est prise parmi les cycles fournis : ne passer que des cycles
+    d'entraînement, pour que les cycles de test restent inédits. Le coût du
+    profil restant est mesuré à chaque étape, intermédiaires partagés compris ;
+    l'élagage s'arrête dès que le budget est respecté ou que plus rien ne peut
+    être retiré.
+
+    Args:
+        pressure_matrix (array-like): Pressions des cycles d'entraînement, une ligne par cycle
+        flow_matrix (array-like): Débits des cycles d'entraînement, une ligne par cycle
+        y (array-like): Étiquettes (1: optimal, 0: non optimal)
+        budget_s (float): Temps de calcul maximal des caractéristiques, en secondes par cycle
+        profile (str or list, optional): Profil de départ. Par défaut 'extended'
+        tolerance (float, optional): Baisse tolérée de l'exactitude de validation
+        model_name (str, optional): Clé de TRAINERS. Par défaut 'gradient_boosting'
+        importance (str, optional): 'permutation' ou 'model' (feature_importances_,
+            ensembles d'arbres seulement). Par défaut 'permutation'
+        validation_size (float, optional): Part des cycles réservée à la validation
+        n_cost_cycles (int, optional): Nombre de cycles utilisés pour les mesures de coût
+        repeats (int, optional): Nombre de mesures de coût, dont on garde la meilleure
+        random_state (int, optional): Graine du découpage et des permutations
+
+    Returns:
+        dict: 'features' (profil retenu), 'cost_s' (coût par cycle), 'score',
+            'baseline_score', 'within_budget', 'excluded' (caractéristiques non
+            finies, écartées d'emblée), 'feature_costs' et 'history'
+            (une entrée par étape : caractéristique retirée, coût, exactitude)
+
+    Raises:
+        ValueError: Si l'importance demandée est inconnue
+    """
+    if importance not in ('permutation', 'model'):
+        raise ValueError(f"Importance inconnue : {importance!r} (disponibles : permutation, model)")
+    pressure_matrix, flow_matrix = check_matrices(pressure_matrix, flow_matrix)
+    names = get_feature_names(profile)
+    X = extract_features_matrix(pressure_matrix, flow_matrix, profile=names)
+    # Les caractéristiques non finies sur certains cycles ne peuvent pas être apprises
+    finite = np.isfinite(X).all(axis=0)
+    excluded = [name for name, keep in zip(names, finite) if not keep]
+    names = [name for name, keep in zip(names, finite) if keep]
+    X = X[:, finite]
+    X_train, X_val, y_train, y_val = train_test_split(
+        X, np.asarray(y), test_size=validation_size, random_state=random_state, stratify=y,
+    )
+    cost_pressure, cost_flow = pressure_matrix[:n_cost_cycles], flow_matrix[:n_cost_cycles]
+    feature_costs = profile_feature_costs(cost_pressure, cost_flow, names, repeats)
+
+    columns = list(range(len(names)))
+    protected = set()
+    score, importances = _fit_and_score(model_name, X_train, y_train, X_val, y_val, importance, random_state)
+    baseline_score = score
+    cost = measure_cost(cost_pressure, cost_flow, names, repeats)
+    history = [{'removed': None, 'cost_s': cost, 'score': score}]
+
+    while cost > budget_s and len(protected) < len(columns) - 1:
+        # Caractéristique la moins rentable ; à rentabilité égale, la plus coûteuse
+        worst = min((i for i in range(len(columns)) if columns[i] not in protected), key=lambda i: (
+            importances[i] / max(feature_costs[names[columns[i]]], 1e-12),
+            -feature_costs[names[columns[i]]],
+        ))
+        candidate = columns[:worst] + columns[worst + 1:]
+        candidate_score, candidate_importances = _fit_and_score(
+            model_name, X_train[:, candidate], y_train, X_val[:, candidate], y_val, importance, random_state,
+        )
+        if candidate_score < baseline_score - tolerance:
+            # Indispensable à l'exactitude : conservée, on essaie la suivante
+            protected.add(columns[worst])
+            continue
+        removed = names[columns[worst]]
+        columns, score, importances = candidate, candidate_score, candidate_importances
+        cost = measure_cost(cost_pressure, cost_flow, [names[i] for i in columns], repeats)
+        history.append({'removed': removed, 'cost_s': cost, 'score': score})
+
+    return {
+        'features': [names[i] for i in columns],
+        'cost_s': cost,
+        'score': score,
+        'baseline_score': baseline_score,
+        'within_budget': cost <= budget_s,
+        'excluded': excluded,
+        'feature_costs': feature_costs,
+        'history': history,
+    }
+
+
+def save_selection(selection, path):
+    """Écrit le résultat de `select_features` en JSON (relu par `load_selected_profile`)."""
+    with open(path, 'w') as f:
+        json.dump(selection, f, indent=2)
+
+
+def load_selected_profile(path):
+    """
+    Relit le profil retenu par `select_features` et écrit par `save_selection`.
+
+    Args:
+        path (str): Chemin du fichier JSON de sélection
+
+    Returns:
+        list: Profil de caractéristiques retenu par `select_features`
+    """
+    with open(path) as f:
+        return json.load(f)['features']
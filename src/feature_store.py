@@ -0,0 +1,241 @@
+import glob
+import hashlib
+import inspect
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src import features as features_module
+from src.features import extract_features_batch, get_feature_names
+
+# Obtenir le chemin absolu vers la racine du projet
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dossier par défaut du magasin de caractéristiques
+FEATURE_STORE_DIR = os.path.join(PROJECT_ROOT, ".cache", "features")
+
+# Taille maximale du magasin avant éviction des entrées les moins récemment utilisées
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Nombre de lignes hachées à la fois
+_HASH_BLOCK_ROWS = 1024
+
+
+def feature_fingerprint(profile='base'):
+    """
+    Calcule l'empreinte d'un jeu de caractéristiques.
+    
+    L'empreinte combine la liste ordonnée des caractéristiques et le code source
+    de src/features.py : toute modification de leur définition invalide le cache.
+    
+    Args:
+        profile (str or list, optional): Profil ou liste de caractéristiques. Par défaut 'base'
+    
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(get_feature_names(profile)).encode())
+    digest.update(inspect.getsource(features_module).encode())
+    return digest.hexdigest()
+
+
+def _hash_prefixes(pressure_matrix, flow_matrix, checkpoints):
+    """
+    Hache les données d'entrée en une passe, en relevant l'empreinte de plusieurs préfixes.
+    
+    Args:
+        pressure_matrix (numpy.ndarray): Pressions, une ligne par cycle
+        flow_matrix (numpy.ndarray): Débits, une ligne par cycle
+        checkpoints (iterable): Nombres de lignes pour lesquels relever l'empreinte
+    
+    Returns:
+        dict: Nombre de lignes -> empreinte hexadécimale des lignes [0, n)
+    """
+    n_cycles = pressure_matrix.shape[0]
+    checkpoints = sorted({n for n in checkpoints if 0 < n <= n_cycles})
+    pressure_digest = hashlib.blake2b(digest_size=16)
+    flow_digest = hashlib.blake2b(digest_size=16)
+
+    hashes = {}
+    position = 0
+    for checkpoint in checkpoints:
+        while position < checkpoint:
+            end = min(position + _HASH_BLOCK_ROWS, checkpoint)
+            pressure_digest.update(np.ascontiguousarray(pressure_matrix[position:end]).data)
+            flow_digest.update(np.ascontiguousarray(flow_matrix[position:end]).data)
+            position = end
+        combined = hashlib.blake2b(digest_size=16)
+        combined.update(f"{checkpoint}:{pressure_matrix.shape[1]}:{flow_matrix.shape[1]}".encode())
+        combined.update(pressure_digest.digest())
+        combined.update(flow_digest.digest())
+        hashes[checkpoint] = combined.hexdigest()
+    return hashes
+
+
+def _entry_paths(store_dir, fingerprint, data_hash):
+    """Renvoie les chemins (.npy, .json) d'une entrée du magasin."""
+    base = os.path.join(store_dir, f"{fingerprint[:16]}-{data_hash[:16]}")
+    return base + ".npy", base + ".json"
+
+
+def _list_entries(store_dir, fingerprint=None):
+    """Liste les métadonnées des entrées du magasin, éventuellement filtrées par empreinte."""
+    pattern = f"{fingerprint[:16]}-*.json" if fingerprint else "*.json"
+    entries = []
+    for meta_path in glob.glob(os.path.join(store_dir, pattern)):
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if fingerprint is None or meta.get('fingerprint') == fingerprint:
+            entries.append(meta)
+    return entries
+
+
+def _remove_entry(store_dir, meta):
+    """Supprime les fichiers d'une entrée du magasin."""
+    for path in _entry_paths(store_dir, meta['fingerprint'], meta['data_hash']):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _load_entry(store_dir, meta):
+    """Charge une entrée (tableau mappé en mémoire) et met à jour sa date d'accès."""
+    npy_path, meta_path = _entry_paths(store_dir, meta['fingerprint'], meta['data_hash'])
+    values = np.load(npy_path, mmap_mode='r')
+    os.utime(meta_path)
+    return pd.DataFrame(values, columns=meta['columns'], copy=False)
+
+
+def _save_entry(store_dir, fingerprint, data_hash, features_df):
+    """Écrit une entrée du magasin au format colonne (ordre Fortran), de façon atomique."""
+    npy_path, meta_path = _entry_paths(store_dir, fingerprint, data_hash)
+    values = np.asfortranarray(features_df.to_numpy(dtype=np.float64))
+
+    tmp_npy = npy_path + ".tmp"
+    with open(tmp_npy, 'wb') as f:
+        np.save(f, values)
+    os.replace(tmp_npy, npy_path)
+
+    meta = {
+        'fingerprint': fingerprint,
+        'data_hash': data_hash,
+        'n_rows': int(values.shape[0]),
+        'columns': list(features_df.columns),
+        'created': time.time(),
+    }
+    tmp_meta = meta_path + ".tmp"
+    with open(tmp_meta, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta, meta_path)
+    return meta
+
+
+def evict(store_dir=None, max_bytes=DEFAULT_MAX_BYTES, keep=()):
+    """
+    Supprime les entrées les moins récemment utilisées jusqu'à respecter la taille limite.
+    
+    Args:
+        store_dir (str, optional): Dossier du magasin. Par défaut FEATURE_STORE_DIR
+        max_bytes (int, optional): Taille maximale totale. Par défaut DEFAULT_MAX_BYTES
+        keep (iterable, optional): Empreintes de données à ne jamais supprimer
+    
+    Returns:
+        int: Nombre d'entrées supprimées
+    """
+    store_dir = store_dir or FEATURE_STORE_DIR
+    entries = []
+    for meta in _list_entries(store_dir):
+        paths = _entry_paths(store_dir, meta['fingerprint'], meta['data_hash'])
+        try:
+            size = sum(os.path.getsize(path) for path in paths)
+            last_access = os.path.getmtime(paths[1])
+        except OSError:
+            continue
+        entries.append((last_access, size, meta))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, meta in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        if meta['data_hash'] in keep:
+            continue
+        _remove_entry(store_dir, meta)
+        total -= size
+        removed += 1
+    return removed
+
+
+def load_or_compute_features(pressure_matrix, flow_matrix, profile='base', store_dir=None,
+                             max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Renvoie la matrice de caractéristiques depuis le magasin, ou la calcule et l'y enregistre.
+    
+    Les entrées sont adressées par le contenu : empreinte des matrices d'entrée et
+    empreinte du jeu de caractéristiques (`feature_fingerprint`). Si une entrée
+    existante correspond à un préfixe des données (nouveaux cycles ajoutés en fin
+    de PS2/FS1), seules les nouvelles lignes sont calculées.
+    
+    Args:
+        pressure_matrix (array-like): Pressions, une ligne par cycle (n_cycles x 6000)
+        flow_matrix (array-like): Débits, une ligne par cycle (n_cycles x 600)
+        profile (str or list, optional): Profil ou liste de caractéristiques. Par défaut 'base'
+        store_dir (str, optional): Dossier du magasin. Par défaut FEATURE_STORE_DIR
+        max_bytes (int, optional): Taille maximale du magasin. Par défaut DEFAULT_MAX_BYTES
+    
+    Returns:
+        tuple: (features_df, status)
+            - features_df: DataFrame des caractéristiques, une ligne par cycle
+            - status: 'hit' (cache complet), 'partial' (préfixe réutilisé) ou 'miss'
+              (y compris sans aucun cycle, rien n'étant alors enregistré)
+    """
+    store_dir = store_dir or FEATURE_STORE_DIR
+    os.makedirs(store_dir, exist_ok=True)
+    pressure_matrix = np.asarray(pressure_matrix, dtype=np.float64)
+    flow_matrix = np.asarray(flow_matrix, dtype=np.float64)
+    n_cycles = pressure_matrix.shape[0]
+    if n_cycles == 0:
+        # Rien à calculer ni à enregistrer
+        return pd.DataFrame(columns=get_feature_names(profile), dtype=np.float64), 'miss'
+
+    fingerprint = feature_fingerprint(profile)
+    candidates = [meta for meta in _list_entries(store_dir, fingerprint) if meta['n_rows'] <= n_cycles]
+    hashes = _hash_prefixes(
+        pressure_matrix, flow_matrix, [n_cycles] + [meta['n_rows'] for meta in candidates]
+    )
+    data_hash = hashes[n_cycles]
+
+    prefix = None
+    for meta in sorted(candidates, key=lambda m: m['n_rows'], reverse=True):
+        if hashes.get(meta['n_rows']) == meta['data_hash']:
+            prefix = meta
+            break
+
+    if prefix is not None and prefix['n_rows'] == n_cycles:
+        return _load_entry(store_dir, prefix), 'hit'
+
+    if prefix is not None:
+        cached = _load_entry(store_dir, prefix)
+        start = prefix['n_rows']
+        new_rows = extract_features_batch(pressure_matrix[start:], flow_matrix[start:], profile=profile)
+        features_df = pd.concat([cached, new_rows], ignore_index=True)
+        del cached
+        status = 'partial'
+    else:
+        features_df = extract_features_batch(pressure_matrix, flow_matrix, profile=profile)
+        status = 'miss'
+
+    _save_entry(store_dir, fingerprint, data_hash, features_df)
+    if prefix is not None:
+        # L'entrée étendue remplace celle du préfixe
+        _remove_entry(store_dir, prefix)
+    evict(store_dir, max_bytes, keep=(data_hash,))
+    return features_df, status
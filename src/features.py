@@ -1,17 +1,292 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-from scipy.stats import skew, kurtosis
-from scipy.signal import correlate
 
-def extract_features(pressure_segment, flow_segment):
+# Profils de caractéristiques disponibles : 'base' est le jeu historique à 7
+# caractéristiques, 'extended' le jeu complet à 36 caractéristiques.
+FEATURE_PROFILES = {
+    'base': (
+        'skew_pressure',
+        'kurtosis_pressure',
+        'autocorr_pressure',
+        'derivative_max_pressure',
+        'derivative_kurtosis_flow',
+        'integral_flow',
+        'skew_flow',
+    ),
+    'extended': (
+        'mean_pressure',
+        'max_pressure',
+        'min_pressure',
+        'std_pressure',
+        'median_pressure',
+        'skew_pressure',
+        'kurtosis_pressure',
+        'ptp_pressure',
+        'mad_pressure',
+        'rise_time_pressure',
+        'rms_pressure',
+        'zero_crossings_pressure',
+        'slope_pressure',
+        'autocorr_pressure',
+        'energy_pressure',
+        'derivative_max_pressure',
+        'mean_flow',
+        'max_flow',
+        'min_flow',
+        'std_flow',
+        'median_flow',
+        'skew_flow',
+        'kurtosis_flow',
+        'ptp_flow',
+        'mad_flow',
+        'rms_flow',
+        'zero_crossings_flow',
+        'slope_flow',
+        'integral_flow',
+        'peak_flow_rate',
+        'variance_flow',
+        'peak_to_mean_ratio_flow',
+        'cross_corr_flow_pressure',
+        'derivative_kurtosis_flow',
+        'entropy_flow',
+        'entropy_pressure',
+    ),
+}
+
+# Nombre de cycles traités à la fois par extract_features_batch, pour borner la
+# mémoire des intermédiaires (dérivées, signaux centrés)
+BATCH_CHUNK_SIZE = 2048
+
+
+class _SignalStats:
+    """
+    Intermédiaires partagés d'un signal (une ligne par cycle), calculés une seule fois.
+    
+    Chaque grandeur (dérivée, moyenne, moments centrés, somme des carrés...) est
+    évaluée à la première demande puis réutilisée par toutes les caractéristiques.
+    """
+
+    def __init__(self, values):
+        self.values = values
+        self.n = values.shape[1]
+        self._cache = {}
+
+    def _get(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def diff(self):
+        return self._get('diff', lambda: _SignalStats(np.diff(self.values, axis=1)))
+
+    @property
+    def mean(self):
+        return self._get('mean', lambda: self.values.mean(axis=1))
+
+    @property
+    def max(self):
+        return self._get('max', lambda: self.values.max(axis=1))
+
+    @property
+    def min(self):
+        return self._get('min', lambda: self.values.min(axis=1))
+
+    @property
+    def sum_squares(self):
+        return self._get('sum_squares', lambda: np.einsum('ij,ij->i', self.values, self.values))
+
+    @property
+    def centered(self):
+        return self._get('centered', lambda: self.values - self.mean[:, None])
+
+    @property
+    def moments(self):
+        """Moments centrés d'ordre 2, 3 et 4 (estimateurs biaisés, comme scipy.stats)."""
+        def compute():
+            centered = self.centered
+            squared = centered * centered
+            m2 = squared.mean(axis=1)
+            m3 = np.einsum('ij,ij->i', squared, centered) / self.n
+            m4 = np.einsum('ij,ij->i', squared, squared) / self.n
+            return m2, m3, m4
+        return self._get('moments', compute)
+
+    @property
+    def is_constant(self):
+        """Signaux quasi constants, pour lesquels scipy renvoie NaN en asymétrie/aplatissement."""
+        return self._get(
+            'is_constant',
+            lambda: self.moments[0] <= (np.finfo(np.float64).resolution * self.mean) ** 2,
+        )
+
+    @property
+    def skew(self):
+        m2, m3, _ = self.moments
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.is_constant, np.nan, m3 / m2 ** 1.5)
+
+    @property
+    def kurtosis(self):
+        m2, _, m4 = self.moments
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.is_constant, np.nan, m4 / m2 ** 2 - 3.0)
+
+    @property
+    def autocorr(self):
+        """Autocorrélation lag=1 : coefficient de Pearson entre x[:-1] et x[1:]."""
+        head = self.values[:, :-1]
+        tail = self.values[:, 1:]
+        head_centered = head - head.mean(axis=1, keepdims=True)
+        tail_centered = tail - tail.mean(axis=1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.einsum('ij,ij->i', head_centered, tail_centered) / np.sqrt(
+                np.einsum('ij,ij->i', head_centered, head_centered)
+                * np.einsum('ij,ij->i', tail_centered, tail_centered)
+            )
+
+    @property
+    def zero_crossings(self):
+        return np.count_nonzero(np.diff(np.sign(self.values), axis=1), axis=1)
+
+    @property
+    def entropy(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return -np.einsum('ij,ij->i', self.values, np.log(self.values + 1e-6))
+
+
+def _cross_correlation_max(flow, pressure):
+    """
+    Maximum de la corrélation croisée complète débit-pression, calculée par FFT.
+    
+    Équivalent à np.max(scipy.signal.correlate(flow, pressure)) pour chaque cycle,
+    avec une seule FFT réelle par signal sur tout le lot.
+    """
+    from scipy import fft
+
+    n_full = flow.shape[1] + pressure.shape[1] - 1
+    n_fft = fft.next_fast_len(n_full, real=True)
+    spectrum = (fft.rfft(flow, n_fft, axis=1, workers=-1)
+                * fft.rfft(pressure[:, ::-1], n_fft, axis=1, workers=-1))
+    return fft.irfft(spectrum, n_fft, axis=1, workers=-1)[:, :n_full].max(axis=1)
+
+
+# Définition de chaque caractéristique à partir des intermédiaires partagés
+# (p : pression PS2, f : débit FS1)
+_FEATURE_FUNCTIONS = {
+    'mean_pressure': lambda p, f: p.mean,
+    'max_pressure': lambda p, f: p.max,
+    'min_pressure': lambda p, f: p.min,
+    'std_pressure': lambda p, f: np.sqrt(p.moments[0]),
+    'median_pressure': lambda p, f: np.median(p.values, axis=1),
+    'skew_pressure': lambda p, f: p.skew,
+    'kurtosis_pressure': lambda p, f: p.kurtosis,
+    'ptp_pressure': lambda p, f: p.max - p.min,
+    'mad_pressure': lambda p, f: np.abs(p.diff.values).mean(axis=1),
+    'rise_time_pressure': lambda p, f: np.argmax(p.values, axis=1),
+    'rms_pressure': lambda p, f: np.sqrt(p.sum_squares / p.n),
+    'zero_crossings_pressure': lambda p, f: p.zero_crossings,
+    'slope_pressure': lambda p, f: (p.values[:, -1] - p.values[:, 0]) / p.n,
+    'autocorr_pressure': lambda p, f: p.autocorr,
+    'energy_pressure': lambda p, f: p.sum_squares,
+    'derivative_max_pressure': lambda p, f: p.diff.max,
+
+    'mean_flow': lambda p, f: f.mean,
+    'max_flow': lambda p, f: f.max,
+    'min_flow': lambda p, f: f.min,
+    'std_flow': lambda p, f: np.sqrt(f.moments[0]),
+    'median_flow': lambda p, f: np.median(f.values, axis=1),
+    'skew_flow': lambda p, f: f.skew,
+    'kurtosis_flow': lambda p, f: f.kurtosis,
+    'ptp_flow': lambda p, f: f.max - f.min,
+    'mad_flow': lambda p, f: np.abs(f.diff.values).mean(axis=1),
+    'rms_flow': lambda p, f: np.sqrt(f.sum_squares / f.n),
+    'zero_crossings_flow': lambda p, f: f.zero_crossings,
+    'slope_flow': lambda p, f: (f.values[:, -1] - f.values[:, 0]) / f.n,
+    'integral_flow': lambda p, f: np.trapz(f.values, axis=1),
+    'peak_flow_rate': lambda p, f: f.max / f.n,
+    'variance_flow': lambda p, f: f.moments[0],
+    'peak_to_mean_ratio_flow': lambda p, f: f.max / f.mean,
+    'cross_corr_flow_pressure': lambda p, f: _cross_correlation_max(f.values, p.values),
+    'derivative_kurtosis_flow': lambda p, f: f.diff.kurtosis,
+    'entropy_flow': lambda p, f: f.entropy,
+    'entropy_pressure': lambda p, f: p.entropy,
+}
+
+
+def get_feature_names(profile='base'):
+    """
+    Renvoie la liste ordonnée des caractéristiques d'un profil.
+    
+    Args:
+        profile (str or list): Nom d'un profil de FEATURE_PROFILES ou liste explicite
+            de noms de caractéristiques. Par défaut 'base'
+    
+    Returns:
+        list: Noms des caractéristiques, dans l'ordre des colonnes produites
+    
+    Raises:
+        ValueError: Si le profil ou une caractéristique est inconnu
+    """
+    if isinstance(profile, str):
+        if profile not in FEATURE_PROFILES:
+            raise ValueError(
+                f"Profil de caractéristiques inconnu : {profile!r} "
+                f"(disponibles : {', '.join(FEATURE_PROFILES)})"
+            )
+        return list(FEATURE_PROFILES[profile])
+
+    names = list(profile)
+    unknown = [name for name in names if name not in _FEATURE_FUNCTIONS]
+    if unknown:
+        raise ValueError(f"Caractéristiques inconnues : {', '.join(unknown)}")
+    return names
+
+
+def _compute_features(pressure_matrix, flow_matrix, names):
+    """Calcule les caractéristiques demandées en partageant les intermédiaires."""
+    pressure = _SignalStats(pressure_matrix)
+    flow = _SignalStats(flow_matrix)
+    return {name: _FEATURE_FUNCTIONS[name](pressure, flow) for name in names}
+
+
+def check_matrices(pressure_matrix, flow_matrix):
+    """
+    Convertit les matrices de pression et de débit en float64 et vérifie leurs dimensions.
+
+    Args:
+        pressure_matrix (array-like): Pressions, une ligne par cycle
+        flow_matrix (array-like): Débits, une ligne par cycle
+
+    Returns:
+        tuple: (pressure_matrix, flow_matrix) en numpy.ndarray float64
+
+    Raises:
+        ValueError: Si une matrice n'est pas en 2D ou si les nombres de cycles diffèrent
+    """
+    pressure_matrix = np.asarray(pressure_matrix, dtype=np.float64)
+    flow_matrix = np.asarray(flow_matrix, dtype=np.float64)
+    if pressure_matrix.ndim != 2 or flow_matrix.ndim != 2:
+        raise ValueError("Les matrices de pression et de débit doivent être en 2D.")
+    if pressure_matrix.shape[0] != flow_matrix.shape[0]:
+        raise ValueError("Les matrices de pression et de débit n'ont pas le même nombre de cycles.")
+    return pressure_matrix, flow_matrix
+
+
+def extract_features(pressure_segment, flow_segment, profile='base'):
     """
     Extrait les caractéristiques pertinentes des données de pression et de débit.
     
     Args:
         pressure_segment (array-like): Valeurs de pression pour un cycle (100 Hz)
         flow_segment (array-like): Valeurs de débit pour un cycle (10 Hz)
+        profile (str or list, optional): Profil de caractéristiques ('base',
+            'extended') ou liste explicite de noms. Par défaut 'base'
     
     Returns:
-        dict: Dictionnaire des caractéristiques calculées:
+        dict: Dictionnaire des caractéristiques calculées. Pour le profil 'base' :
             - skew_pressure: Asymétrie de la distribution des pressions
             - kurtosis_pressure: Aplatissement de la distribution des pressions
             - autocorr_pressure: Autocorrélation des pressions (lag=1)
@@ -20,23 +295,174 @@ def extract_features(pressure_segment, flow_segment):
             - integral_flow: Intégrale du débit sur le cycle
             - skew_flow: Asymétrie de la distribution du débit
     """
-    pressure_segment = np.array(pressure_segment)
-    flow_segment = np.array(flow_segment)
+    pressure_segment = np.asarray(pressure_segment, dtype=np.float64).reshape(1, -1)
+    flow_segment = np.asarray(flow_segment, dtype=np.float64).reshape(1, -1)
+
+    features = _compute_features(pressure_segment, flow_segment, get_feature_names(profile))
+    return {name: values[0] for name, values in features.items()}
+
+
+def extract_features_batch(pressure_matrix, flow_matrix, profile='base', chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Extrait les caractéristiques de tous les cycles en une seule passe vectorisée.
+
+    Équivalent à l'appel de `extract_features` sur chaque ligne, mais les
+    calculs sont effectués le long de l'axe 1 sur les matrices complètes, sans
+    boucle Python ni accès ligne par ligne. Les intermédiaires communs (dérivées,
+    moments, sommes des carrés) ne sont calculés qu'une fois par signal et la
+    corrélation croisée passe par la FFT.
+
+    Args:
+        pressure_matrix (array-like): Pressions, une ligne par cycle (n_cycles x 6000)
+        flow_matrix (array-like): Débits, une ligne par cycle (n_cycles x 600)
+        profile (str or list, optional): Profil de caractéristiques ('base',
+            'extended') ou liste explicite de noms. Par défaut 'base'
+        chunk_size (int, optional): Nombre de cycles traités à la fois. Par défaut BATCH_CHUNK_SIZE
+
+    Returns:
+        pandas.DataFrame: Une ligne par cycle, mêmes colonnes que `extract_features`
+
+    Raises:
+        ValueError: Si les deux matrices n'ont pas le même nombre de cycles
+    """
+    import pandas as pd
 
-    features = {
-        'skew_pressure': skew(pressure_segment),
-        'kurtosis_pressure': kurtosis(pressure_segment),
-        'autocorr_pressure': np.corrcoef(pressure_segment[:-1], pressure_segment[1:])[0, 1],
-        'derivative_max_pressure': np.max(np.diff(pressure_segment)),
+    pressure_matrix, flow_matrix = check_matrices(pressure_matrix, flow_matrix)
+    names = get_feature_names(profile)
+    n_cycles = pressure_matrix.shape[0]
+    if n_cycles <= chunk_size:
+        return pd.DataFrame(_compute_features(pressure_matrix, flow_matrix, names), columns=names)
 
-        'derivative_kurtosis_flow': kurtosis(np.diff(flow_segment)),
-        'integral_flow': np.trapz(flow_segment),
-        'skew_flow': skew(flow_segment),
-    }
+    chunks = [
+        pd.DataFrame(
+            _compute_features(pressure_matrix[start:start + chunk_size],
+                              flow_matrix[start:start + chunk_size], names),
+            columns=names,
+        )
+        for start in range(0, n_cycles, chunk_size)
+    ]
+    return pd.concat(chunks, ignore_index=True)
 
-    return features
 
+def extract_features_matrix(pressure_matrix, flow_matrix, profile='base', chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Variante de `extract_features_batch` renvoyant un tableau NumPy, sans pandas.
+
+    Destinée aux processus de scoring de courte durée, pour lesquels l'import de
+    pandas coûterait plus que le calcul lui-même.
+
+    Args:
+        pressure_matrix (array-like): Pressions, une ligne par cycle (n_cycles x 6000)
+        flow_matrix (array-like): Débits, une ligne par cycle (n_cycles x 600)
+        profile (str or list, optional): Profil de caractéristiques ('base',
+            'extended') ou liste explicite de noms. Par défaut 'base'
+        chunk_size (int, optional): Nombre de cycles traités à la fois. Par défaut BATCH_CHUNK_SIZE
 
+    Returns:
+        numpy.ndarray: Matrice float64 (n_cycles x n_caractéristiques), colonnes
+            dans l'ordre de `get_feature_names(profile)`
 
+    Raises:
+        ValueError: Si les deux matrices n'ont pas le même nombre de cycles
+    """
+    pressure_matrix, flow_matrix = check_matrices(pressure_matrix, flow_matrix)
+    names = get_feature_names(profile)
+    n_cycles = pressure_matrix.shape[0]
+    result = np.empty((n_cycles, len(names)), dtype=np.float64)
+    for start in range(0, n_cycles, chunk_size):
+        features = _compute_features(pressure_matrix[start:start + chunk_size],
+                                     flow_matrix[start:start + chunk_size], names)
+        for column, name in enumerate(names):
+            result[start:start + chunk_size, column] = features[name]
+    return result
+
+
+# Statistiques génériques calculables sur n'importe quel capteur du registre
+# (s : intermédiaires partagés du signal)
+SENSOR_STATISTICS = {
+    'mean': lambda s: s.mean,
+    'std': lambda s: np.sqrt(s.moments[0]),
+    'min': lambda s: s.min,
+    'max': lambda s: s.max,
+    'ptp': lambda s: s.max - s.min,
+    'rms': lambda s: np.sqrt(s.sum_squares / s.n),
+    'skew': lambda s: s.skew,
+    'kurtosis': lambda s: s.kurtosis,
+    'slope': lambda s: (s.values[:, -1] - s.values[:, 0]) / s.n,
+    'derivative_max': lambda s: s.diff.max,
+}
+
+
+def get_sensor_feature_names(sensor_features):
+    """
+    Renvoie les noms des caractéristiques multi-capteurs, dans l'ordre des colonnes.
+    
+    Args:
+        sensor_features (dict): Capteur -> liste de statistiques de SENSOR_STATISTICS
+            (None pour toutes), par exemple {'TS1': ['mean', 'slope'], 'VS1': None}
+    
+    Returns:
+        list: Noms de la forme '<statistique>_<capteur>' (par exemple 'mean_TS1')
+    
+    Raises:
+        ValueError: Si une statistique est inconnue
+    """
+    names = []
+    for sensor, statistics in sensor_features.items():
+        statistics = list(SENSOR_STATISTICS) if statistics is None else list(statistics)
+        unknown = [name for name in statistics if name not in SENSOR_STATISTICS]
+        if unknown:
+            raise ValueError(f"Statistiques inconnues : {', '.join(unknown)}")
+        names.extend(f"{statistic}_{sensor}" for statistic in statistics)
+    return names
+
+
+def _extract_sensor_statistics(matrix, statistics, chunk_size):
+    """Calcule les statistiques d'un capteur par lots de cycles ; renvoie (n_cycles x n_statistiques)."""
+    matrix = np.asarray(matrix)
+    result = np.empty((matrix.shape[0], len(statistics)), dtype=np.float64)
+    for start in range(0, matrix.shape[0], chunk_size):
+        signal = _SignalStats(np.asarray(matrix[start:start + chunk_size], dtype=np.float64))
+        for column, statistic in enumerate(statistics):
+            result[start:start + chunk_size, column] = SENSOR_STATISTICS[statistic](signal)
+    return result
+
+
+def extract_multi_sensor_features(sensors, sensor_features, n_workers=None, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Extrait des statistiques sur plusieurs capteurs, un capteur par thread.
+    
+    Seuls les capteurs cités dans `sensor_features` sont lus depuis `sensors`
+    (par exemple un `data_loader.SensorSet`, qui ne charge un capteur qu'au
+    premier accès). Les threads partagent les tableaux mappés en mémoire sans
+    copie, et les calculs NumPy libèrent le GIL.
+    
+    Args:
+        sensors (Mapping): Capteur -> matrice (une ligne par cycle)
+        sensor_features (dict): Capteur -> liste de statistiques (None pour toutes)
+        n_workers (int, optional): Nombre de threads. Par défaut le nombre de cœurs
+        chunk_size (int, optional): Nombre de cycles traités à la fois. Par défaut BATCH_CHUNK_SIZE
+    
+    Returns:
+        pandas.DataFrame: Une ligne par cycle, colonnes de `get_sensor_feature_names`
+    
+    Raises:
+        ValueError: Si une statistique est inconnue ou si les capteurs n'ont pas
+            le même nombre de cycles
+    """
+    import pandas as pd
 
+    names = get_sensor_feature_names(sensor_features)
+    tasks = [
+        (sensor, list(SENSOR_STATISTICS) if statistics is None else list(statistics))
+        for sensor, statistics in sensor_features.items()
+    ]
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(tasks)))
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        blocks = list(pool.map(
+            lambda task: _extract_sensor_statistics(sensors[task[0]], task[1], chunk_size), tasks
+        ))
 
+    if len({len(block) for block in blocks}) > 1:
+        raise ValueError("Les capteurs n'ont pas le même nombre de cycles.")
+    return pd.DataFrame(np.hstack(blocks), columns=names)
@@ -0,0 +1,447 @@
+import argparse
+import asyncio
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from src.serving import (
+    DEFAULT_MODEL_PATH,
+    DEFAULT_SCALER_PATH,
+    FLOW_SAMPLES,
+    PRESSURE_SAMPLES,
+    LatencyTracker,
+    ValveScorer,
+)
+
+# Trame capteur : identifiant de valve, numéro de cycle, capteur, position du premier
+# échantillon dans le cycle, nombre d'échantillons ; suivis des valeurs float64 little-endian
+FRAME_HEADER = struct.Struct('<IIBHH')
+
+# Résultat renvoyé pour chaque cycle complet ou trame rejetée : valve, cycle, statut,
+# probabilité de valve optimale (NaN si le statut n'est pas STATUS_OK)
+RESULT = struct.Struct('<IIBd')
+
+# Statuts des résultats
+STATUS_OK = 0
+STATUS_SCORING_FAILED = 1
+STATUS_INVALID_FRAME = 2
+
+# File d'attente des connexions entrantes (des milliers de valves se connectent à la fois)
+LISTEN_BACKLOG = 4096
+
+# Codes capteur des trames et nombre d'échantillons attendus par cycle
+SENSOR_PRESSURE = 0
+SENSOR_FLOW = 1
+_SENSOR_SAMPLES = {SENSOR_PRESSURE: PRESSURE_SAMPLES, SENSOR_FLOW: FLOW_SAMPLES}
+
+
+def encode_frame(valve_id, cycle, sensor, offset, values):
+    """
+    Encode une trame capteur au format du protocole de la passerelle.
+
+    Args:
+        valve_id (int): Identifiant de la valve
+        cycle (int): Numéro du cycle
+        sensor (int): SENSOR_PRESSURE ou SENSOR_FLOW
+        offset (int): Position du premier échantillon dans le cycle
+        values (array-like): Échantillons
+
+    Returns:
+        bytes: Trame prête à être envoyée
+    """
+    values = np.asarray(values, dtype='<f8')
+    return FRAME_HEADER.pack(valve_id, cycle, sensor, offset, values.size) + values.tobytes()
+
+
+class _PartialCycle:
+    """Tampons d'un cycle en cours d'assemblage pour une valve."""
+
+    __slots__ = ('cycle', 'pressure', 'flow', 'covered', 'received', 'owner')
+
+    def __init__(self, cycle, owner):
+        self.cycle = cycle
+        self.pressure = np.empty(PRESSURE_SAMPLES, dtype=np.float64)
+        self.flow = np.empty(FLOW_SAMPLES, dtype=np.float64)
+        # Échantillons effectivement reçus, par capteur
+        self.covered = {SENSOR_PRESSURE: np.zeros(PRESSURE_SAMPLES, dtype=bool),
+                        SENSOR_FLOW: np.zeros(FLOW_SAMPLES, dtype=bool)}
+        self.received = 0
+        self.owner = owner
+
+
+class CycleAssembler:
+    """
+    Reconstitue les cycles complets à partir des trames, par valve.
+
+    Une trame d'un nouveau cycle abandonne le cycle incomplet précédent de la
+    même valve (compté dans `dropped`). Un cycle est complet lorsque chacune de
+    ses 6000 pressions et 600 débits a été reçue : une trame retransmise ou
+    chevauchant une trame déjà reçue remplace les échantillons concernés sans
+    les compter deux fois (comptée dans `overlapping`).
+    """
+
+    def __init__(self):
+        self._cycles = {}
+        self.dropped = 0
+        self.overlapping = 0
+
+    def __len__(self):
+        return len(self._cycles)
+
+    def add(self, valve_id, cycle, sensor, offset, values, owner=None):
+        """
+        Ajoute une trame.
+
+        Args:
+            valve_id (int): Identifiant de la valve
+            cycle (int): Numéro du cycle
+            sensor (int): SENSOR_PRESSURE ou SENSOR_FLOW
+            offset (int): Position du premier échantillon dans le cycle
+            values (array-like): Échantillons
+            owner (optional): Connexion ayant livré la trame (voir `evict`)
+
+        Returns:
+            tuple or None: (valve_id, cycle, pressure, flow) si la trame complète le cycle
+
+        Raises:
+            ValueError: Si le capteur est inconnu ou si la trame dépasse la fin du cycle
+        """
+        if sensor not in _SENSOR_SAMPLES:
+            raise ValueError(f"Capteur inconnu dans la trame : {sensor}")
+        if offset + len(values) > _SENSOR_SAMPLES[sensor]:
+            raise ValueError(
+                f"Trame hors du cycle : {offset} + {len(values)} > {_SENSOR_SAMPLES[sensor]} échantillons."
+            )
+
+        partial = self._cycles.get(valve_id)
+        if partial is None or partial.cycle != cycle:
+            if partial is not None:
+                self.dropped += 1
+            partial = self._cycles[valve_id] = _PartialCycle(cycle, owner)
+        partial.owner = owner
+
+        target = partial.pressure if sensor == SENSOR_PRESSURE else partial.flow
+        target[offset:offset + len(values)] = values
+        covered = partial.covered[sensor][offset:offset + len(values)]
+        already = int(np.count_nonzero(covered))
+        if already:
+            self.overlapping += 1
+        covered[:] = True
+        partial.received += len(values) - already
+        if partial.received < PRESSURE_SAMPLES + FLOW_SAMPLES:
+            return None
+        del self._cycles[valve_id]
+        return valve_id, cycle, partial.pressure, partial.flow
+
+    def evict(self, valve_ids, owner):
+        """
+        Abandonne les cycles incomplets de valves dont la connexion s'est fermée.
+
+        Seuls les cycles dont la dernière trame vient de `owner` sont abandonnés
+        (comptés dans `dropped`) : une valve reconnectée ailleurs garde son cycle.
+
+        Args:
+            valve_ids (iterable): Valves ayant envoyé des trames sur la connexion
+            owner: Connexion fermée
+        """
+        for valve_id in valve_ids:
+            partial = self._cycles.get(valve_id)
+            if partial is not None and partial.owner is owner:
+                del self._cycles[valve_id]
+                self.dropped += 1
+
+
+# Scorer des processus du pool (chargé une fois par processus par _init_worker)
+_worker_scorer = None
+
+
+def _init_worker(model_path, scaler_path):
+    global _worker_scorer
+    _worker_scorer = ValveScorer.load(model_path, scaler_path)
+
+
+def _score_in_worker(pressure_matrix, flow_matrix):
+    return _worker_scorer.predict_proba(pressure_matrix, flow_matrix)
+
+
+class IngestionGateway:
+    """
+    Passerelle asyncio recevant les trames capteur de nombreuses valves sur TCP.
+
+    Chaque connexion (une par valve ou une par automate multiplexant plusieurs
+    valves) envoie des trames FRAME_HEADER. Les cycles complets sont placés dans
+    une file bornée, regroupés en lots et évalués dans un pool de threads ou de
+    processus ; le résultat (RESULT) est renvoyé sur la connexion ayant livré la
+    dernière trame du cycle. Un émetteur garde donc sa connexion ouverte jusqu'à
+    réception des résultats attendus.
+
+    Une trame invalide (capteur inconnu, échantillons hors du cycle) est
+    rejetée avec un résultat STATUS_INVALID_FRAME sans fermer la connexion,
+    qui peut multiplexer d'autres valves. Si l'évaluation d'un lot échoue, ses
+    cycles sont réévalués un par un et seuls ceux qui échouent encore reçoivent
+    STATUS_SCORING_FAILED. Les cycles incomplets d'une connexion fermée sont
+    abandonnés.
+
+    Contre-pression : au plus `n_workers` lots sont en cours dans le pool. Quand
+    la file de cycles est pleine, les connexions cessent de lire leur socket
+    jusqu'à ce qu'une place se libère, et le contrôle de flux TCP ralentit les
+    émetteurs au lieu de laisser la mémoire croître.
+
+    Args:
+        scorer (ValveScorer, optional): Scorer utilisé par un pool de threads
+        max_pending_cycles (int, optional): Taille de la file de cycles complets. Par défaut 1024
+        max_batch_size (int, optional): Nombre maximal de cycles par lot. Par défaut 256
+        n_workers (int, optional): Lots évalués simultanément. Par défaut le nombre de cœurs
+        executor (concurrent.futures.Executor, optional): Pool à utiliser à la place
+            du pool de threads ; doit alors évaluer les lots avec `score_function`
+        score_function (callable, optional): Fonction (pressions, débits) -> probabilités
+            exécutée dans `executor`. Par défaut scorer.predict_proba
+    """
+
+    def __init__(self, scorer=None, max_pending_cycles=1024, max_batch_size=256, n_workers=None,
+                 executor=None, score_function=None):
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.max_batch_size = max_batch_size
+        self.max_pending_cycles = max_pending_cycles
+        self.score_function = score_function or scorer.predict_proba
+        self.executor = executor or ThreadPoolExecutor(max_workers=self.n_workers,
+                                                       thread_name_prefix="gateway-scoring")
+        self.assembler = CycleAssembler()
+        self.tracker = LatencyTracker()
+        self.counters = {'connections': 0, 'frames': 0, 'cycles': 0, 'backpressure_waits': 0,
+                         'max_pending': 0, 'errors': 0}
+        self._queue = None
+        self._dispatchers = []
+        self._connections = {}
+        self._server = None
+
+    @property
+    def port(self):
+        """Port TCP effectivement ouvert (utile avec port=0)."""
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host='127.0.0.1', port=9000):
+        """Ouvre le port d'écoute et démarre les tâches d'évaluation."""
+        self._queue = asyncio.Queue(maxsize=self.max_pending_cycles)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.n_workers)]
+        self._server = await asyncio.start_server(self._handle_connection, host, port, backlog=LISTEN_BACKLOG)
+        return self
+
+    async def close(self):
+        """Ferme le port, évalue les cycles déjà en file puis arrête le pool."""
+        self._server.close()
+        await self._server.wait_closed()
+        await self._queue.join()
+        # Fermer les connexions restantes : leurs lectures se terminent sur fin de flux
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self.executor.shutdown(wait=True)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Compteurs (trames, cycles, attentes de contre-pression, file
+                maximale), cycles incomplets en cours, abandonnés, trames
+                chevauchantes et latences de bout en bout
+        """
+        return {
+            **self.counters,
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+            'partial_cycles': len(self.assembler),
+            'dropped_cycles': self.assembler.dropped,
+            'overlapping_frames': self.assembler.overlapping,
+            'latency': self.tracker.summary(),
+        }
+
+    async def _handle_connection(self, reader, writer):
+        self.counters['connections'] += 1
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        valve_ids = set()
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(FRAME_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                valve_id, cycle, sensor, offset, count = FRAME_HEADER.unpack(header)
+                values = np.frombuffer(await reader.readexactly(count * 8), dtype='<f8')
+                self.counters['frames'] += 1
+
+                try:
+                    completed = self.assembler.add(valve_id, cycle, sensor, offset, values, owner=writer)
+                except ValueError:
+                    # La trame a été lue entièrement : le flux reste synchronisé
+                    self.counters['errors'] += 1
+                    writer.write(RESULT.pack(valve_id, cycle, STATUS_INVALID_FRAME, np.nan))
+                    continue
+                valve_ids.add(valve_id)
+                if completed is None:
+                    continue
+                if self._queue.full():
+                    self.counters['backpressure_waits'] += 1
+                await self._queue.put((*completed, writer, time.perf_counter()))
+                self.counters['max_pending'] = max(self.counters['max_pending'], self._queue.qsize())
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.counters['errors'] += 1
+        finally:
+            del self._connections[task]
+            self.assembler.evict(valve_ids, writer)
+            writer.close()
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                probabilities = await loop.run_in_executor(
+                    self.executor, self.score_function,
+                    np.stack([item[2] for item in batch]), np.stack([item[3] for item in batch]),
+                )
+                statuses = [STATUS_OK] * len(batch)
+            except Exception:
+                probabilities, statuses = await self._score_each(batch)
+
+            now = time.perf_counter()
+            for (valve_id, cycle, _, _, writer, _), status, probability in zip(batch, statuses, probabilities):
+                if not writer.is_closing():
+                    writer.write(RESULT.pack(valve_id, cycle, status, float(probability)))
+            self.counters['cycles'] += len(batch)
+            self.tracker.record_batch([now - item[5] for item in batch], len(batch))
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _score_each(self, batch):
+        """Évalue les cycles d'un lot séparément, pour isoler ceux qui échouent."""
+        loop = asyncio.get_running_loop()
+        probabilities, statuses = [], []
+        for _, _, pressure, flow, _, _ in batch:
+            try:
+                probability = await loop.run_in_executor(
+                    self.executor, self.score_function, pressure[np.newaxis], flow[np.newaxis],
+                )
+            except Exception:
+                self.counters['errors'] += 1
+                probabilities.append(np.nan)
+                statuses.append(STATUS_SCORING_FAILED)
+                continue
+            probabilities.append(probability[0])
+            statuses.append(STATUS_OK)
+        return probabilities, statuses
+
+
+async def simulate_plc(host, port, n_valves, n_cycles=1, n_connections=None, frame_samples=600, seed=0):
+    """
+    Automate simulé : envoie les cycles synthétiques de plusieurs valves en parallèle.
+
+    Remplace localement la passerelle des automates. Les valves sont réparties
+    sur `n_connections` connexions ; sur chacune, les trames des valves sont
+    entrelacées comme le ferait un automate multiplexant ses capteurs.
+
+    Args:
+        host (str): Adresse de la passerelle
+        port (int): Port de la passerelle
+        n_valves (int): Nombre de valves simulées
+        n_cycles (int, optional): Cycles envoyés par valve. Par défaut 1
+        n_connections (int, optional): Nombre de connexions. Par défaut une par valve
+        frame_samples (int, optional): Échantillons de pression par trame. Par défaut 600
+        seed (int, optional): Graine du générateur synthétique
+
+    Returns:
+        dict: (valve_id, cycle) -> probabilité renvoyée par la passerelle, None si
+            le cycle n'a pas pu être évalué
+    """
+    from src.synthetic import generate_cycles
+
+    n_connections = min(n_connections or n_valves, n_valves)
+    pressure, flow, _ = generate_cycles(n_valves, seed=seed)
+    # Même nombre de trames pour les deux capteurs, pour qu'elles restent alignées dans le temps
+    n_frames = -(-PRESSURE_SAMPLES // frame_samples)
+    flow_samples = -(-FLOW_SAMPLES // n_frames)
+    results = {}
+
+    async def run_connection(valve_ids):
+        reader, writer = await asyncio.open_connection(host, port)
+
+        async def read_results():
+            for _ in range(len(valve_ids) * n_cycles):
+                valve_id, cycle, status, probability = RESULT.unpack(await reader.readexactly(RESULT.size))
+                results[(valve_id, cycle)] = probability if status == STATUS_OK else None
+
+        reading = asyncio.create_task(read_results())
+        for cycle in range(n_cycles):
+            for frame in range(n_frames):
+                p_offset, f_offset = frame * frame_samples, frame * flow_samples
+                for valve_id in valve_ids:
+                    writer.write(encode_frame(valve_id, cycle, SENSOR_PRESSURE, p_offset,
+                                              pressure[valve_id, p_offset:p_offset + frame_samples]))
+                    if f_offset < FLOW_SAMPLES:
+                        writer.write(encode_frame(valve_id, cycle, SENSOR_FLOW, f_offset,
+                                                  flow[valve_id, f_offset:f_offset + flow_samples]))
+                await writer.drain()
+        await reading
+        writer.close()
+        await writer.wait_closed()
+
+    groups = [list(range(n_valves))[i::n_connections] for i in range(n_connections)]
+    await asyncio.gather(*(run_connection(group) for group in groups))
+    return results
+
+
+async def _serve(args):
+    if args.processes:
+        executor = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                       initargs=(args.model, args.scaler))
+        gateway = IngestionGateway(max_pending_cycles=args.max_pending, max_batch_size=args.max_batch_size,
+                                   n_workers=args.workers, executor=executor, score_function=_score_in_worker)
+    else:
+        gateway = IngestionGateway(ValveScorer.load(args.model, args.scaler), max_pending_cycles=args.max_pending,
+                                   max_batch_size=args.max_batch_size, n_workers=args.workers)
+    await gateway.start(args.host, args.port)
+    print(f"Passerelle d'ingestion à l'écoute sur {args.host}:{gateway.port}")
+    try:
+        if args.simulate:
+            start = time.perf_counter()
+            results = await simulate_plc(args.host, gateway.port, args.simulate, n_cycles=args.cycles,
+                                         n_connections=args.connections)
+            elapsed = time.perf_counter() - start
+            print(f"{len(results)} cycles de {args.simulate} valves en {elapsed:.2f} s "
+                  f"({len(results) / elapsed:.0f} cycles/s)")
+        else:
+            await asyncio.Event().wait()
+    finally:
+        await gateway.close()
+        print(f"Statistiques : {gateway.stats()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Passerelle d'ingestion des trames capteur des valves.")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help="Chemin du modèle entraîné")
+    parser.add_argument('--scaler', default=DEFAULT_SCALER_PATH, help="Chemin du scaler")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--workers', type=int, help="Lots évalués simultanément (par défaut le nombre de cœurs)")
+    parser.add_argument('--processes', action='store_true', help="Évaluer dans un pool de processus plutôt que de threads")
+    parser.add_argument('--max-pending', type=int, default=1024, help="Cycles complets en attente avant contre-pression")
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--simulate', type=int, metavar='N', help="Lancer un automate simulé de N valves puis s'arrêter")
+    parser.add_argument('--cycles', type=int, default=1, help="Cycles par valve simulée")
+    parser.add_argument('--connections', type=int, help="Connexions de l'automate simulé (par défaut une par valve)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
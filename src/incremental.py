@@ -0,0 +1,210 @@
+import copy
+import time
+
+import numpy as np
+from sklearn.base import clone
+
+# Étapes (ou arbres) ajoutées à un ensemble par mise à jour
+DEFAULT_NEW_STAGES = 20
+
+# Taille maximale d'un ensemble avant un réentraînement complet à sa taille de base
+MAX_ESTIMATORS = 500
+
+# Baisse maximale tolérée du score de validation (exactitude) après une mise à jour
+DEFAULT_TOLERANCE = 0.02
+
+# Décalage maximal de la moyenne d'une caractéristique sur les nouveaux cycles,
+# en écarts-types du scaler, au-delà duquel on considère qu'il y a dérive
+DRIFT_THRESHOLD = 1.0
+
+
+def feature_drift(scaler, X_new):
+    """
+    Mesure le décalage des nouveaux cycles par rapport aux statistiques du scaler.
+
+    Args:
+        scaler (StandardScaler): Scaler ajusté sur les cycles déjà appris
+        X_new (array-like): Caractéristiques brutes des nouveaux cycles
+
+    Returns:
+        float: Plus grand écart |moyenne des nouveaux cycles - moyenne du scaler|,
+            exprimé en écarts-types du scaler
+    """
+    X_new = np.asarray(X_new, dtype=np.float64)
+    return float(np.max(np.abs(X_new.mean(axis=0) - scaler.mean_) / scaler.scale_))
+
+
+def _rescale_trees(trees, old_scaler, new_scaler):
+    """Réexprime les seuils des arbres dans l'espace du nouveau scaler (en place)."""
+    for tree in trees:
+        nodes = tree.tree_
+        split = nodes.feature >= 0
+        feature = nodes.feature[split]
+        raw = nodes.threshold[split] * old_scaler.scale_[feature] + old_scaler.mean_[feature]
+        nodes.threshold[split] = (raw - new_scaler.mean_[feature]) / new_scaler.scale_[feature]
+
+
+def _rescale_linear(model, old_scaler, new_scaler):
+    """Réexprime les coefficients d'un modèle linéaire dans l'espace du nouveau scaler (en place)."""
+    weights = model.coef_ / old_scaler.scale_
+    model.intercept_ = model.intercept_ + weights @ (new_scaler.mean_ - old_scaler.mean_)
+    model.coef_ = weights * new_scaler.scale_
+
+
+def rescale_model(model, old_scaler, new_scaler):
+    """
+    Adapte un modèle entraîné à un scaler mis à jour, sans changer ses prédictions.
+
+    Les seuils des arbres et les coefficients des modèles linéaires sont des
+    fonctions affines des caractéristiques standardisées : ils sont réexprimés
+    exactement dans l'espace du nouveau scaler.
+
+    Args:
+        model: Modèle entraîné (ensemble d'arbres ou modèle linéaire), modifié en place
+        old_scaler (StandardScaler): Scaler utilisé pour l'entraînement
+        new_scaler (StandardScaler): Scaler mis à jour
+
+    Returns:
+        bool: False si le modèle n'a pas de paramètres réexprimables
+    """
+    if hasattr(model, 'estimators_'):
+        _rescale_trees(np.ravel(model.estimators_), old_scaler, new_scaler)
+    elif hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        _rescale_linear(model, old_scaler, new_scaler)
+    else:
+        return False
+    return True
+
+
+def _update_in_place(model, scaler, X_new, y_new, n_new_stages, max_estimators):
+    """
+    Met à jour une copie du modèle et du scaler sur les nouveaux cycles.
+
+    Returns:
+        tuple: (model, scaler, raison) ; raison n'est pas None si la mise à jour
+            incrémentale est impossible
+    """
+    warm_start = 'warm_start' in model.get_params() and hasattr(model, 'estimators_')
+    if not warm_start and not hasattr(model, 'partial_fit'):
+        return model, scaler, 'modèle non incrémental'
+    if warm_start and model.n_estimators + n_new_stages > max_estimators:
+        return model, scaler, "taille maximale de l'ensemble atteinte"
+
+    model = copy.deepcopy(model)
+    if warm_start and not hasattr(model, 'base_n_estimators_'):
+        # Taille d'origine, rétablie par un réentraînement complet
+        model.base_n_estimators_ = model.n_estimators
+    new_scaler = copy.deepcopy(scaler).partial_fit(X_new)
+    if rescale_model(model, scaler, new_scaler):
+        scaler = new_scaler
+    X_scaled = scaler.transform(X_new)
+    try:
+        if warm_start:
+            model.set_params(warm_start=True, n_estimators=model.n_estimators + n_new_stages)
+            model.fit(X_scaled, y_new)
+        else:
+            model.partial_fit(X_scaled, y_new)
+    except ValueError as error:
+        # Par exemple un lot ne contenant qu'une seule classe
+        return model, scaler, f'mise à jour impossible ({error})'
+    return model, scaler, None
+
+
+def full_retrain(model, X, y, base_n_estimators=None):
+    """
+    Réentraîne un modèle de même type et de mêmes hyperparamètres sur toutes les données.
+
+    Args:
+        model: Modèle servant de gabarit (non modifié)
+        X (array-like): Caractéristiques brutes de tous les cycles d'entraînement
+        y (array-like): Étiquettes correspondantes
+        base_n_estimators (int, optional): Taille de l'ensemble réentraîné. Par défaut
+            la taille du modèle avant ses mises à jour incrémentales (les étapes
+            ajoutées sont abandonnées)
+
+    Returns:
+        tuple: (model, scaler)
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    params = model.get_params()
+    if 'n_estimators' in params:
+        base_n_estimators = base_n_estimators or getattr(model, 'base_n_estimators_', params['n_estimators'])
+    model = clone(model)
+    if 'warm_start' in params:
+        model.set_params(warm_start=False)
+    if 'n_estimators' in params:
+        model.set_params(n_estimators=base_n_estimators)
+    scaler = StandardScaler()
+    model.fit(scaler.fit_transform(X), y)
+    return model, scaler
+
+
+def update_model(model, scaler, X_new, y_new, X_val, y_val, X_full=None, y_full=None,
+                 n_new_stages=DEFAULT_NEW_STAGES, tolerance=DEFAULT_TOLERANCE,
+                 drift_threshold=DRIFT_THRESHOLD, max_estimators=MAX_ESTIMATORS,
+                 base_n_estimators=None):
+    """
+    Met à jour un modèle entraîné avec des cycles nouvellement étiquetés.
+
+    Les ensembles d'arbres (Gradient Boosting, Random Forest) reçoivent
+    `n_new_stages` étapes supplémentaires ajustées sur les nouveaux cycles
+    (warm start) ; les modèles dotés de `partial_fit` poursuivent leur
+    apprentissage. Les statistiques du scaler sont mises à jour par
+    `partial_fit` et le modèle réexprimé dans le nouvel espace. Le modèle et le
+    scaler d'origine ne sont pas modifiés.
+
+    Le modèle est réentraîné entièrement sur (X_full, y_full) si les nouveaux
+    cycles dérivent trop des statistiques apprises, si le score de validation
+    baisse de plus de `tolerance`, ou si la mise à jour incrémentale est
+    impossible. Sans données complètes, le modèle d'origine est conservé.
+
+    Args:
+        model: Modèle entraîné sur les caractéristiques standardisées par `scaler`
+        scaler (StandardScaler): Scaler de l'entraînement
+        X_new (array-like): Caractéristiques brutes des nouveaux cycles
+        y_new (array-like): Étiquettes des nouveaux cycles
+        X_val (array-like): Caractéristiques brutes des cycles de validation
+        y_val (array-like): Étiquettes des cycles de validation
+        X_full (array-like, optional): Caractéristiques brutes de tous les cycles
+            d'entraînement (anciens et nouveaux), pour le réentraînement complet
+        y_full (array-like, optional): Étiquettes correspondantes
+        n_new_stages (int, optional): Étapes ajoutées aux ensembles. Par défaut 20
+        tolerance (float, optional): Baisse tolérée de l'exactitude de validation
+        drift_threshold (float, optional): Dérive maximale (voir `feature_drift`)
+        max_estimators (int, optional): Taille maximale d'un ensemble
+        base_n_estimators (int, optional): Taille d'un ensemble réentraîné entièrement.
+            Par défaut sa taille avant les mises à jour incrémentales
+
+    Returns:
+        tuple: (model, scaler, info) ; info contient le mode retenu ('incremental',
+            'full' ou 'unchanged'), la raison d'un éventuel réentraînement, la
+            dérive, les scores de validation avant et après, et la durée
+    """
+    start = time.perf_counter()
+    score_before = model.score(scaler.transform(X_val), y_val)
+    drift = feature_drift(scaler, X_new)
+    info = {'drift': drift, 'score_before': score_before, 'reason': None}
+
+    if drift > drift_threshold:
+        reason = 'dérive des caractéristiques'
+    else:
+        updated, updated_scaler, reason = _update_in_place(
+            model, scaler, X_new, y_new, n_new_stages, max_estimators
+        )
+        if reason is None:
+            score_after = updated.score(updated_scaler.transform(X_val), y_val)
+            if score_after >= score_before - tolerance:
+                info.update(mode='incremental', score_after=score_after,
+                            time_s=time.perf_counter() - start)
+                return updated, updated_scaler, info
+            reason = 'dégradation en validation'
+
+    info['reason'] = reason
+    if X_full is None:
+        info.update(mode='unchanged', score_after=score_before, time_s=time.perf_counter() - start)
+        return model, scaler, info
+    model, scaler = full_retrain(model, X_full, y_full, base_n_estimators)
+    info.update(mode='full', score_after=model.score(scaler.transform(X_val), y_val),
+                time_s=time.perf_counter() - start)
+    return model, scaler, info
@@ -0,0 +1,197 @@
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Nombre de fonctions conservées dans le résumé cProfile du rapport
+PROFILE_TOP_FUNCTIONS = 25
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus courant, en Mo (None si indisponible)."""
+    status = _read_proc_status('VmHWM')
+    if status is not None:
+        return status
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en kilo-octets sous Linux
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def current_rss_mb():
+    """Mémoire résidente actuelle du processus, en Mo (None si indisponible)."""
+    return _read_proc_status('VmRSS')
+
+
+def _read_proc_status(field):
+    """Lit un champ mémoire de /proc/self/status (Linux), en Mo."""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """
+    Remet le pic de mémoire résidente au niveau actuel (Linux uniquement).
+    
+    Returns:
+        bool: True si le pic a pu être réinitialisé, sinon le pic mesuré
+            ensuite reste celui de tout le processus
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class RunReport:
+    """
+    Rapport d'exécution : temps, CPU, mémoire et volume traité par étape.
+    
+    Chaque étape est délimitée par le gestionnaire de contexte `stage` ou le
+    décorateur `timed`. Une étape peut en plus être profilée avec cProfile.
+    
+    Exemple:
+        report = RunReport('train', profile_stage='features')
+        with report.stage('features') as info:
+            X = extract_features_batch(pressure, flow)
+            info['rows'] = len(X)
+        report.save('reports/run.json')
+    
+    Args:
+        name (str, optional): Nom de l'exécution. Par défaut 'run'
+        profile_stage (str, optional): Étape à profiler avec cProfile
+        profile_dir (str, optional): Dossier où écrire le fichier .prof. Par défaut 'reports'
+    """
+
+    def __init__(self, name='run', profile_stage=None, profile_dir='reports'):
+        self.name = name
+        self.profile_stage = profile_stage
+        self.profile_dir = profile_dir
+        self.started = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Mesure une étape du pipeline.
+        
+        Args:
+            name (str): Nom de l'étape
+            rows (int, optional): Nombre de lignes traitées, si connu d'avance
+        
+        Yields:
+            dict: Informations de l'étape ; renseigner info['rows'] si le nombre de
+                lignes n'est connu qu'à la fin
+        """
+        info = {'name': name, 'rows': rows}
+        peak_is_stage_local = _reset_peak_rss()
+        rss_before = current_rss_mb()
+        profiler = cProfile.Profile() if name == self.profile_stage else None
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield info
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall = time.perf_counter() - wall_start
+            info.update({
+                'wall_s': wall,
+                'cpu_s': time.process_time() - cpu_start,
+                'rss_before_mb': rss_before,
+                'rss_after_mb': current_rss_mb(),
+                'peak_rss_mb': peak_rss_mb(),
+                'peak_rss_scope': 'stage' if peak_is_stage_local else 'process',
+            })
+            if info['rows']:
+                info['rows_per_s'] = info['rows'] / wall if wall > 0 else None
+            if profiler is not None:
+                info['profile'] = self._save_profile(name, profiler)
+            self.stages.append(info)
+
+    def timed(self, name=None, rows=None):
+        """
+        Décorateur mesurant chaque appel de la fonction comme une étape.
+        
+        Args:
+            name (str, optional): Nom de l'étape. Par défaut le nom de la fonction
+            rows (callable, optional): Fonction résultat -> nombre de lignes traitées
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__name__) as info:
+                    result = func(*args, **kwargs)
+                    if rows is not None:
+                        info['rows'] = rows(result)
+                return result
+            return wrapper
+        return decorator
+
+    def _save_profile(self, name, profiler):
+        """Écrit le profil complet (.prof) et renvoie le résumé des fonctions les plus coûteuses."""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{self.name}_{name}_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+        profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+        return {'path': path, 'top': summary.getvalue()}
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Rapport complet (métadonnées, étapes et totaux)
+        """
+        return {
+            'name': self.name,
+            'started': self.started,
+            'total_wall_s': sum(stage['wall_s'] for stage in self.stages),
+            'total_cpu_s': sum(stage['cpu_s'] for stage in self.stages),
+            'peak_rss_mb': max((stage['peak_rss_mb'] or 0 for stage in self.stages), default=None),
+            'stages': self.stages,
+        }
+
+    def summary(self):
+        """
+        Returns:
+            str: Tableau texte d'une ligne par étape
+        """
+        lines = [f"{'Étape':<14}{'Temps (s)':>11}{'CPU (s)':>10}{'Pic RSS (Mo)':>14}{'Lignes':>10}"]
+        for stage in self.stages:
+            peak = f"{stage['peak_rss_mb']:.0f}" if stage['peak_rss_mb'] is not None else '-'
+            rows = stage['rows'] if stage['rows'] is not None else '-'
+            lines.append(f"{stage['name']:<14}{stage['wall_s']:>11.3f}{stage['cpu_s']:>10.3f}{peak:>14}{rows:>10}")
+        return '\n'.join(lines)
+
+    def save(self, path):
+        """
+        Écrit le rapport au format JSON.
+        
+        Args:
+            path (str): Chemin du fichier JSON
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
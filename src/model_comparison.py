@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+
+from src.instrumentation import current_rss_mb, peak_rss_mb
+from src.train_model import TRAINERS
+
+
+def _run_trainer(task):
+    """
+    Entraîne et évalue un modèle dans un processus dédié.
+    
+    Les matrices sont relues en mémoire mappée depuis le dossier de travail :
+    aucun processus n'en reçoit de copie sérialisée. Le pic de mémoire est
+    mesuré au-delà de la mémoire résidente du processus à son démarrage, qui
+    inclut celle héritée du parent lors du fork.
+    
+    Args:
+        task (tuple): (nom du modèle, dossier de travail)
+    
+    Returns:
+        dict: Mesures de temps, de mémoire et de performance du modèle
+    """
+    name, work_dir = task
+    start = time.perf_counter()
+    baseline_rss = current_rss_mb()
+    X_train = np.load(os.path.join(work_dir, "X_train.npy"), mmap_mode='r')
+    y_train = np.load(os.path.join(work_dir, "y_train.npy"))
+    X_test = np.load(os.path.join(work_dir, "X_test.npy"), mmap_mode='r')
+    y_test = np.load(os.path.join(work_dir, "y_test.npy"))
+
+    fit_start = time.perf_counter()
+    model = TRAINERS[name](X_train, y_train)
+    fit_time = time.perf_counter() - fit_start
+
+    predict_start = time.perf_counter()
+    proba = model.predict_proba(X_test)[:, 1]
+    predict_time = time.perf_counter() - predict_start
+    y_pred = model.classes_[(proba >= 0.5).astype(int)]
+
+    joblib.dump(model, os.path.join(work_dir, f"{name}.pkl"))
+    return {
+        'model': name,
+        'accuracy': accuracy_score(y_test, y_pred),
+        'f1': f1_score(y_test, y_pred),
+        'roc_auc': roc_auc_score(y_test, proba) if len(np.unique(y_test)) > 1 else np.nan,
+        'fit_time_s': fit_time,
+        'predict_rows_per_s': len(X_test) / predict_time if predict_time > 0 else np.inf,
+        'wall_time_s': time.perf_counter() - start,
+        'peak_rss_mb': _peak_above(baseline_rss),
+    }
+
+
+def _peak_above(baseline_rss):
+    """Pic de mémoire résidente au-delà de `baseline_rss`, en Mo (None si indisponible)."""
+    peak = peak_rss_mb()
+    if peak is None or baseline_rss is None:
+        return None
+    return max(peak - baseline_rss, 0.0)
+
+
+def compare_models(X_train, y_train, X_test, y_test, model_names=None, n_jobs=None,
+                   output_dir="models", metric='f1'):
+    """
+    Entraîne plusieurs modèles en parallèle sur les mêmes données et compare leurs performances.
+    
+    Chaque modèle est entraîné dans un processus neuf ; le pic de mémoire
+    rapporté exclut la mémoire du processus au démarrage (dont celle héritée du
+    parent) et reflète donc le coût propre au modèle. Le tableau comparatif est écrit dans
+    `output_dir/model_comparison.csv` et le meilleur modèle selon `metric` dans
+    `output_dir/best_model.pkl`.
+    
+    Args:
+        X_train (array-like): Features d'entraînement standardisées
+        y_train (array-like): Labels d'entraînement (0: non optimal, 1: optimal)
+        X_test (array-like): Features de test standardisées
+        y_test (array-like): Labels de test
+        model_names (list, optional): Modèles à comparer (clés de TRAINERS). Par défaut tous
+        n_jobs (int, optional): Nombre de processus. Par défaut le nombre de cœurs
+        output_dir (str, optional): Dossier de sortie. Par défaut "models"
+        metric (str, optional): Métrique de sélection du meilleur modèle
+            ('accuracy', 'f1' ou 'roc_auc'). Par défaut 'f1'
+    
+    Returns:
+        pandas.DataFrame: Tableau comparatif trié du meilleur au moins bon modèle
+    
+    Raises:
+        ValueError: Si un modèle demandé est inconnu
+    """
+    model_names = list(model_names or TRAINERS)
+    unknown = [name for name in model_names if name not in TRAINERS]
+    if unknown:
+        raise ValueError(
+            f"Modèles inconnus : {', '.join(unknown)} (disponibles : {', '.join(TRAINERS)})"
+        )
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(model_names)))
+    os.makedirs(output_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=output_dir) as work_dir:
+        np.save(os.path.join(work_dir, "X_train.npy"), np.asarray(X_train, dtype=np.float64))
+        np.save(os.path.join(work_dir, "y_train.npy"), np.asarray(y_train))
+        np.save(os.path.join(work_dir, "X_test.npy"), np.asarray(X_test, dtype=np.float64))
+        np.save(os.path.join(work_dir, "y_test.npy"), np.asarray(y_test))
+
+        tasks = [(name, work_dir) for name in model_names]
+        with multiprocessing.get_context().Pool(processes=n_jobs, maxtasksperchild=1) as pool:
+            records = list(pool.imap_unordered(_run_trainer, tasks))
+
+        results = pd.DataFrame(records).sort_values(metric, ascending=False, ignore_index=True)
+        best = results.loc[0, 'model']
+        shutil.copyfile(os.path.join(work_dir, f"{best}.pkl"), os.path.join(output_dir, "best_model.pkl"))
+
+    results.to_csv(os.path.join(output_dir, "model_comparison.csv"), index=False)
+    return results
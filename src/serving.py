@@ -0,0 +1,386 @@
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+import numpy as np
+
+from src.data_loader import EXPECTED_COLUMNS
+from src.features import extract_features_batch
+
+# Obtenir le chemin absolu vers la racine du projet
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODEL_PATH = os.path.join(PROJECT_ROOT, "models", "gradient_boosting_model.pkl")
+DEFAULT_SCALER_PATH = os.path.join(PROJECT_ROOT, "models", "scaler.pkl")
+
+# Nombre d'échantillons attendus par cycle
+PRESSURE_SAMPLES = EXPECTED_COLUMNS["PS2.txt"]
+FLOW_SAMPLES = EXPECTED_COLUMNS["FS1.txt"]
+
+
+class ValveScorer:
+    """
+    Modèle et standardisation chargés une fois, appliqués à des lots de cycles bruts.
+    
+    Args:
+        model: Classifieur entraîné exposant predict_proba
+        scaler: StandardScaler ajusté sur les caractéristiques d'entraînement
+        feature_profile (str or list, optional): Caractéristiques à extraire. Par
+            défaut celles vues par le scaler à l'entraînement (feature_names_in_),
+            sinon le profil 'base'
+    """
+
+    def __init__(self, model, scaler, feature_profile=None):
+        self.model = model
+        self.scaler = scaler
+        if feature_profile is None:
+            feature_names = getattr(scaler, 'feature_names_in_', None)
+            feature_profile = list(feature_names) if feature_names is not None else 'base'
+        self.feature_profile = feature_profile
+
+    @classmethod
+    def load(cls, model_path=DEFAULT_MODEL_PATH, scaler_path=DEFAULT_SCALER_PATH):
+        """
+        Charge le modèle et le scaler sauvegardés par main.py.
+        
+        Args:
+            model_path (str, optional): Chemin du modèle. Par défaut DEFAULT_MODEL_PATH
+            scaler_path (str, optional): Chemin du scaler. Par défaut DEFAULT_SCALER_PATH
+        
+        Returns:
+            ValveScorer: Scorer prêt à l'emploi
+        """
+        return cls(joblib.load(model_path), joblib.load(scaler_path))
+
+    def predict_proba(self, pressure_matrix, flow_matrix):
+        """
+        Calcule la probabilité de valve optimale pour un lot de cycles.
+        
+        Args:
+            pressure_matrix (array-like): Pressions, une ligne par cycle
+            flow_matrix (array-like): Débits, une ligne par cycle
+        
+        Returns:
+            numpy.ndarray: Probabilité de la classe 1 (optimale) pour chaque cycle
+        """
+        features = extract_features_batch(pressure_matrix, flow_matrix, profile=self.feature_profile)
+        return self.model.predict_proba(self.scaler.transform(features))[:, 1]
+
+
+class LatencyTracker:
+    """
+    Conserve les dernières latences observées et en calcule les percentiles.
+    
+    Args:
+        max_samples (int, optional): Nombre de mesures conservées. Par défaut 10000
+    """
+
+    def __init__(self, max_samples=10000):
+        self._latencies = deque(maxlen=max_samples)
+        self._batch_sizes = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self.total_requests = 0
+
+    def record_batch(self, latencies, batch_size):
+        with self._lock:
+            self._latencies.extend(latencies)
+            self._batch_sizes.append(batch_size)
+            self.total_requests += len(latencies)
+
+    def summary(self):
+        """
+        Returns:
+            dict: Nombre de requêtes, latences p50/p99/max (ms) et taille moyenne des lots
+        """
+        with self._lock:
+            latencies = np.array(self._latencies, dtype=np.float64) * 1000.0
+            batch_sizes = np.array(self._batch_sizes, dtype=np.float64)
+            total = self.total_requests
+        if latencies.size == 0:
+            return {'requests': total, 'p50_ms': None, 'p99_ms': None, 'max_ms': None, 'mean_batch_size': None}
+        p50, p99 = np.percentile(latencies, [50, 99])
+        return {
+            'requests': total,
+            'p50_ms': float(p50),
+            'p99_ms': float(p99),
+            'max_ms': float(latencies.max()),
+            'mean_batch_size': float(batch_sizes.mean()),
+        }
+
+
+class MicroBatcher:
+    """
+    Regroupe les requêtes concurrentes en un seul appel vectorisé au scorer.
+    
+    Un thread dédié attend une première requête, puis accumule les suivantes
+    jusqu'à `max_batch_size` cycles ou `max_wait_ms` millisecondes, et évalue le
+    lot entier en un appel à `predict_proba`. Si ce lot échoue, ses requêtes sont
+    réévaluées une à une : seule la requête fautive reçoit l'exception.
+    
+    Args:
+        scorer: Objet exposant predict_proba(pressure_matrix, flow_matrix)
+        max_batch_size (int, optional): Nombre maximal de cycles par lot. Par défaut 256
+        max_wait_ms (float, optional): Attente maximale pour compléter un lot. Par défaut 2
+        tracker (LatencyTracker, optional): Collecteur de latences
+    """
+
+    def __init__(self, scorer, max_batch_size=256, max_wait_ms=2.0, tracker=None):
+        self.scorer = scorer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.tracker = tracker or LatencyTracker()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, pressure_matrix, flow_matrix):
+        """
+        Soumet un ou plusieurs cycles.
+        
+        Args:
+            pressure_matrix (numpy.ndarray): Pressions, une ligne par cycle
+            flow_matrix (numpy.ndarray): Débits, une ligne par cycle
+        
+        Returns:
+            concurrent.futures.Future: Probabilités de la classe 1 pour ces cycles
+        """
+        future = Future()
+        self._queue.put((np.atleast_2d(pressure_matrix), np.atleast_2d(flow_matrix), future, time.perf_counter()))
+        return future
+
+    def close(self):
+        """Arrête le thread de traitement après les requêtes en attente."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        batch = [first]
+        n_cycles = first[0].shape[0]
+        deadline = time.perf_counter() + self.max_wait
+        while n_cycles < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+            n_cycles += item[0].shape[0]
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            try:
+                probabilities = self.scorer.predict_proba(
+                    np.concatenate([item[0] for item in batch]),
+                    np.concatenate([item[1] for item in batch]),
+                )
+            except Exception:
+                self._score_each(batch)
+                continue
+
+            now = time.perf_counter()
+            offset = 0
+            for pressure, _, future, _ in batch:
+                future.set_result(probabilities[offset:offset + pressure.shape[0]])
+                offset += pressure.shape[0]
+            self.tracker.record_batch([now - item[3] for item in batch], offset)
+
+    def _score_each(self, batch):
+        """Évalue les requêtes d'un lot séparément, pour isoler celle qui échoue."""
+        latencies = []
+        n_cycles = 0
+        for pressure, flow, future, submitted in batch:
+            try:
+                probabilities = self.scorer.predict_proba(pressure, flow)
+            except Exception as exc:
+                future.set_exception(exc)
+                continue
+            future.set_result(probabilities)
+            latencies.append(time.perf_counter() - submitted)
+            n_cycles += pressure.shape[0]
+        if latencies:
+            self.tracker.record_batch(latencies, n_cycles)
+
+
+def _parse_cycles(body, content_type):
+    """
+    Décode le corps d'une requête de prédiction.
+    
+    Formats acceptés :
+        - application/json : {"pressure": [...], "flow": [...]} (un cycle ou une liste de cycles)
+        - application/octet-stream : float64 little-endian, pour chaque cycle
+          les 6000 pressions suivies des 600 débits
+    
+    Returns:
+        tuple: (pressure_matrix, flow_matrix)
+    
+    Raises:
+        ValueError: Si le corps est mal formé ou si les tailles ne correspondent pas
+    """
+    if content_type.startswith('application/octet-stream'):
+        width = PRESSURE_SAMPLES + FLOW_SAMPLES
+        values = np.frombuffer(body, dtype='<f8')
+        if values.size == 0 or values.size % width:
+            raise ValueError(f"Le corps binaire doit contenir des cycles de {width} valeurs float64.")
+        cycles = values.reshape(-1, width)
+        pressure, flow = cycles[:, :PRESSURE_SAMPLES], cycles[:, PRESSURE_SAMPLES:]
+    else:
+        payload = json.loads(body)
+        pressure = np.atleast_2d(np.asarray(payload['pressure'], dtype=np.float64))
+        flow = np.atleast_2d(np.asarray(payload['flow'], dtype=np.float64))
+
+    if pressure.shape[1] != PRESSURE_SAMPLES or flow.shape[1] != FLOW_SAMPLES:
+        raise ValueError(
+            f"Chaque cycle doit contenir {PRESSURE_SAMPLES} pressions et {FLOW_SAMPLES} débits."
+        )
+    if pressure.shape[0] != flow.shape[0]:
+        raise ValueError("Les nombres de cycles de pression et de débit diffèrent.")
+    return pressure, flow
+
+
+class _ScoringHandler(BaseHTTPRequestHandler):
+    """Gestionnaire HTTP : POST /predict, GET /stats et GET /health."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send_json(200, self.server.batcher.tracker.summary())
+        elif self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': 'not found'})
+            return
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        try:
+            pressure, flow = _parse_cycles(body, self.headers.get('Content-Type', 'application/json'))
+        except (ValueError, KeyError, TypeError) as exc:
+            self._send_json(400, {'error': str(exc)})
+            return
+
+        try:
+            probabilities = self.server.batcher.submit(pressure, flow).result()
+        except Exception as exc:
+            self._send_json(500, {'error': f"Échec du scoring : {exc}"})
+            return
+        self._send_json(200, {
+            'probabilities': probabilities.tolist(),
+            'predictions': (probabilities >= 0.5).astype(int).tolist(),
+        })
+
+    def address_string(self):
+        # Les sockets Unix n'ont pas d'adresse client (tuple hôte, port)
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _UnixHTTPServer(ThreadingHTTPServer):
+    """Serveur HTTP multi-thread écoutant sur une socket Unix."""
+
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+
+def create_server(batcher, host='127.0.0.1', port=8000, unix_socket=None, verbose=False):
+    """
+    Crée le serveur HTTP de scoring (sans le démarrer).
+    
+    Args:
+        batcher (MicroBatcher): Regroupeur de requêtes
+        host (str, optional): Adresse d'écoute TCP. Par défaut '127.0.0.1'
+        port (int, optional): Port TCP (0 = choisi par le système). Par défaut 8000
+        unix_socket (str, optional): Chemin d'une socket Unix, à la place de TCP
+        verbose (bool, optional): Journaliser chaque requête. Par défaut False
+    
+    Returns:
+        http.server.ThreadingHTTPServer: Serveur prêt à appeler serve_forever()
+    """
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = _UnixHTTPServer(unix_socket, _ScoringHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), _ScoringHandler)
+    server.daemon_threads = True
+    server.batcher = batcher
+    server.verbose = verbose
+    return server
+
+
+def serve(model_path=DEFAULT_MODEL_PATH, scaler_path=DEFAULT_SCALER_PATH, host='127.0.0.1', port=8000,
+          unix_socket=None, max_batch_size=256, max_wait_ms=2.0, verbose=False):
+    """
+    Charge le modèle et le scaler puis sert les prédictions jusqu'à interruption.
+    
+    Affiche les latences p50/p99 à l'arrêt ; elles sont aussi disponibles en
+    continu sur GET /stats.
+    """
+    scorer = ValveScorer.load(model_path, scaler_path)
+    batcher = MicroBatcher(scorer, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    server = create_server(batcher, host, port, unix_socket, verbose)
+    address = unix_socket or f"http://{host}:{server.server_port}"
+    print(f"Service de scoring à l'écoute sur {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+        print(f"Latences : {batcher.tracker.summary()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Service de scoring des cycles de valve.")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help="Chemin du modèle entraîné")
+    parser.add_argument('--scaler', default=DEFAULT_SCALER_PATH, help="Chemin du scaler")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--unix-socket', help="Écouter sur une socket Unix plutôt qu'en TCP")
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(argv)
+    serve(args.model, args.scaler, args.host, args.port, args.unix_socket,
+          args.max_batch_size, args.max_wait_ms, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
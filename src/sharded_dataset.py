@@ -0,0 +1,377 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.data_loader import get_data_path, load_sensor_matrix
+from src.feature_store import feature_fingerprint
+from src.features import BATCH_CHUNK_SIZE, extract_features_matrix, get_feature_names
+
+# Nombre de cycles par fragment lors de l'import d'un jeu de données texte
+DEFAULT_SHARD_CYCLES = 50000
+
+# Nombre de lignes de caractéristiques renvoyées à la fois pour l'entraînement
+TRAIN_CHUNK_ROWS = 65536
+
+# Fichiers d'un fragment ; meta.json est écrit en dernier et marque un fragment complet
+_SHARD_ARRAYS = ('pressure', 'flow', 'valve_opening')
+
+
+def _write_json_atomic(path, payload):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _next_shard_id(plant_dir):
+    """Nom 'part-<numéro>' suivant le plus grand numéro existant (jamais celui d'un fragment vivant)."""
+    indices = [int(name[len('part-'):]) for name in os.listdir(plant_dir)
+               if name.startswith('part-') and name[len('part-'):].isdigit()]
+    return f"part-{max(indices, default=-1) + 1:05d}"
+
+
+def write_shard(root, plant, pressure, flow, valve_opening, shard_id=None, start=None, end=None, source=None):
+    """
+    Écrit un fragment du jeu de données : les cycles d'une usine sur une période.
+
+    Le fragment est un dossier `root/<plant>/<shard_id>/` contenant un tableau
+    .npy par signal (lisible en mémoire mappée) et meta.json. Il est écrit dans
+    un dossier temporaire renommé à la fin : un fragment interrompu n'est jamais lu.
+
+    Args:
+        root (str): Racine du jeu de données fragmenté
+        plant (str): Identifiant de l'usine
+        pressure (array-like): Pressions PS2, une ligne par cycle (n_cycles x 6000)
+        flow (array-like): Débits FS1, une ligne par cycle (n_cycles x 600)
+        valve_opening (array-like): Ouverture de la valve (%) de chaque cycle
+        shard_id (str, optional): Nom du fragment. Par défaut 'part-<numéro suivant>',
+            après le plus grand numéro existant
+        start (str, optional): Début de la période couverte (date ISO 8601)
+        end (str, optional): Fin de la période couverte (date ISO 8601)
+        source (dict, optional): Origine des cycles, enregistrée dans meta.json
+
+    Returns:
+        str: Chemin du dossier du fragment
+
+    Raises:
+        ValueError: Si les signaux n'ont pas le même nombre de cycles
+    """
+    arrays = {
+        'pressure': np.asarray(pressure, dtype=np.float64),
+        'flow': np.asarray(flow, dtype=np.float64),
+        'valve_opening': np.asarray(valve_opening, dtype=np.float64),
+    }
+    n_cycles = len(arrays['valve_opening'])
+    if any(len(values) != n_cycles for values in arrays.values()):
+        raise ValueError("Les signaux du fragment n'ont pas le même nombre de cycles.")
+
+    plant_dir = os.path.join(root, plant)
+    os.makedirs(plant_dir, exist_ok=True)
+    if shard_id is None:
+        shard_id = _next_shard_id(plant_dir)
+    shard_dir = os.path.join(plant_dir, shard_id)
+    tmp_dir = shard_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    for name, values in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), values)
+    _write_json_atomic(os.path.join(tmp_dir, "meta.json"), {
+        'plant': plant,
+        'shard_id': shard_id,
+        'n_cycles': n_cycles,
+        'start': start,
+        'end': end,
+        'source': source,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'version': uuid.uuid4().hex,
+    })
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    os.replace(tmp_dir, shard_dir)
+    return shard_dir
+
+
+def list_shards(root, plants=None, start=None, end=None):
+    """
+    Liste les fragments complets, éventuellement filtrés par usine et par période.
+
+    Args:
+        root (str): Racine du jeu de données fragmenté
+        plants (list, optional): Usines à retenir. Par défaut toutes
+        start (str, optional): Ne garder que les fragments finissant après cette date
+        end (str, optional): Ne garder que les fragments commençant avant cette date
+
+    Returns:
+        list: Métadonnées des fragments (avec leur chemin 'path'), triées par usine
+            puis par nom
+    """
+    shards = []
+    for meta_path in sorted(glob.glob(os.path.join(root, '*', '*', 'meta.json'))):
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if plants is not None and meta['plant'] not in plants:
+            continue
+        if start is not None and meta['end'] is not None and meta['end'] < start:
+            continue
+        if end is not None and meta['start'] is not None and meta['start'] > end:
+            continue
+        meta['path'] = os.path.dirname(meta_path)
+        shards.append(meta)
+    return shards
+
+
+def load_shard(shard):
+    """
+    Ouvre les signaux d'un fragment en mémoire mappée (aucune donnée n'est lue d'avance).
+
+    Args:
+        shard (dict or str): Métadonnées de `list_shards` ou chemin du fragment
+
+    Returns:
+        tuple: (pressure, flow, valve_opening) en lecture seule
+    """
+    path = shard['path'] if isinstance(shard, dict) else shard
+    return tuple(np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in _SHARD_ARRAYS)
+
+
+def iter_shards(root, plants=None, start=None, end=None):
+    """
+    Parcourt les fragments un par un.
+
+    Yields:
+        tuple: (métadonnées, pressure, flow, valve_opening), signaux en mémoire mappée
+    """
+    for shard in list_shards(root, plants, start, end):
+        yield (shard, *load_shard(shard))
+
+
+def _source_signature(paths):
+    """Identifie des fichiers source par leur chemin absolu, leur taille et leur date de modification."""
+    signature = {}
+    for name, path in paths.items():
+        stat = os.stat(path)
+        signature[name] = {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    return signature
+
+
+def import_text_dataset(root, plant, data_dir=None, shard_cycles=DEFAULT_SHARD_CYCLES, sep='\t'):
+    """
+    Convertit les fichiers PS2.txt, FS1.txt et profile.txt d'un dossier en fragments.
+
+    Les signaux sont lus via le cache binaire mappé en mémoire et recopiés
+    fragment par fragment : la mémoire utilisée est bornée par `shard_cycles`.
+
+    L'import est idempotent : chaque fragment est identifié par ses fichiers
+    source et sa plage de cycles. Une nouvelle exécution ne réécrit que les
+    fragments dont la source a changé (par exemple le dernier, après l'ajout de
+    cycles) et supprime ceux de la même source qui ne correspondent plus à
+    aucune plage.
+
+    Args:
+        root (str): Racine du jeu de données fragmenté
+        plant (str): Identifiant de l'usine
+        data_dir (str, optional): Dossier des fichiers texte. Par défaut PROJECT_ROOT/data
+        shard_cycles (int, optional): Nombre de cycles par fragment
+        sep (str, optional): Séparateur des fichiers texte. Par défaut '\t'
+
+    Returns:
+        list: Chemins des fragments de la source, écrits ou déjà à jour
+    """
+    paths = {name: get_data_path(f"{name}.txt", data_dir) for name in ('PS2', 'FS1', 'profile')}
+    files = _source_signature(paths)
+    key = hashlib.blake2b(json.dumps([files[name]['path'] for name in paths]).encode(), digest_size=4).hexdigest()
+    existing = {shard['shard_id']: shard for shard in list_shards(root, plants=[plant])
+                if (shard.get('source') or {}).get('key') == key}
+
+    pressure = load_sensor_matrix(paths['PS2'], sep)
+    flow = load_sensor_matrix(paths['FS1'], sep)
+    valve_opening = np.loadtxt(paths['profile'], delimiter=sep, skiprows=1, usecols=1, ndmin=1)
+    n_cycles = min(len(pressure), len(flow), len(valve_opening))
+
+    written = []
+    for start in range(0, n_cycles, shard_cycles):
+        end = min(start + shard_cycles, n_cycles)
+        shard_id = f"import-{key}-{start:09d}"
+        source = {'key': key, 'files': files, 'cycles': [start, end]}
+        shard = existing.pop(shard_id, None)
+        if shard is not None and shard['source'] == source:
+            written.append(shard['path'])
+            continue
+        written.append(write_shard(root, plant, pressure[start:end], flow[start:end], valve_opening[start:end],
+                                   shard_id=shard_id, source=source))
+    # Plages qui n'existent plus (taille de fragment modifiée, fichiers raccourcis)
+    for shard in existing.values():
+        shutil.rmtree(shard['path'], ignore_errors=True)
+    return written
+
+
+def _feature_paths(feature_dir, shard):
+    base = os.path.join(feature_dir, shard['plant'], shard['shard_id'])
+    return base + ".features.npy", base + ".labels.npy", base + ".json"
+
+
+def _extract_shard(task):
+    """
+    Calcule les caractéristiques d'un fragment dans un processus du pool.
+
+    Les signaux sont relus en mémoire mappée et traités par lots de `chunk_size`
+    cycles ; le résultat est écrit directement dans un .npy mappé en mémoire.
+
+    Args:
+        task (tuple): (métadonnées du fragment, dossier de sortie, profil, empreinte, taille des lots)
+
+    Returns:
+        tuple: (identifiant 'usine/fragment', nombre de cycles)
+    """
+    shard, feature_dir, profile, fingerprint, chunk_size = task
+    features_path, labels_path, meta_path = _feature_paths(feature_dir, shard)
+    os.makedirs(os.path.dirname(features_path), exist_ok=True)
+    pressure, flow, valve_opening = load_shard(shard)
+    names = get_feature_names(profile)
+
+    tmp_path = features_path + ".tmp.npy"
+    out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float64, shape=(len(pressure), len(names)))
+    for start in range(0, len(pressure), chunk_size):
+        out[start:start + chunk_size] = extract_features_matrix(
+            pressure[start:start + chunk_size], flow[start:start + chunk_size], profile
+        )
+    out.flush()
+    del out
+    os.replace(tmp_path, features_path)
+    np.save(labels_path, (np.asarray(valve_opening) == 100).astype(np.int64))
+    _write_json_atomic(meta_path, {
+        'plant': shard['plant'],
+        'shard_id': shard['shard_id'],
+        'n_cycles': shard['n_cycles'],
+        'shard_version': shard['version'],
+        'shard_path': os.path.abspath(shard['path']),
+        'fingerprint': fingerprint,
+        'columns': names,
+    })
+    return f"{shard['plant']}/{shard['shard_id']}", shard['n_cycles']
+
+
+def _is_up_to_date(feature_dir, shard, fingerprint):
+    meta_path = _feature_paths(feature_dir, shard)[2]
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    return (meta['fingerprint'] == fingerprint and meta['n_cycles'] == shard['n_cycles']
+            and meta['shard_version'] == shard['version'])
+
+
+def extract_shard_features(root, feature_dir, profile='base', plants=None, start=None, end=None,
+                           n_workers=None, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Calcule les caractéristiques de chaque fragment en parallèle, au fil de l'eau.
+
+    Chaque fragment est traité par un processus du pool et ses caractéristiques
+    sont écrites dès qu'elles sont prêtes (`feature_dir/<usine>/<fragment>.features.npy`).
+    Les fragments déjà traités avec le même jeu de caractéristiques sont ignorés :
+    une nouvelle exécution ne calcule que les nouveaux fragments. Le pic de
+    mémoire dépend du nombre de processus et de `chunk_size`, pas de la taille
+    totale du jeu de données.
+
+    Args:
+        root (str): Racine du jeu de données fragmenté
+        feature_dir (str): Dossier de sortie des caractéristiques
+        profile (str or list, optional): Profil de caractéristiques. Par défaut 'base'
+        plants, start, end: Filtres de `list_shards`
+        n_workers (int, optional): Nombre de processus. Par défaut le nombre de cœurs
+        chunk_size (int, optional): Nombre de cycles traités à la fois par processus
+
+    Returns:
+        dict: {'computed': [...], 'skipped': [...]} identifiants 'usine/fragment'
+    """
+    fingerprint = feature_fingerprint(profile)
+    shards = list_shards(root, plants, start, end)
+    pending = [shard for shard in shards if not _is_up_to_date(feature_dir, shard, fingerprint)]
+    skipped = [f"{shard['plant']}/{shard['shard_id']}" for shard in shards if shard not in pending]
+
+    tasks = [(shard, feature_dir, profile, fingerprint, chunk_size) for shard in pending]
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(tasks) or 1))
+    if n_workers == 1:
+        computed = [_extract_shard(task)[0] for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            computed = [shard_name for shard_name, _ in pool.map(_extract_shard, tasks)]
+    return {'computed': computed, 'skipped': skipped}
+
+
+def _shard_is_live(meta):
+    """Vérifie que le fragment dont proviennent des caractéristiques existe encore, dans la même version."""
+    shard_meta_path = os.path.join(meta['shard_path'], "meta.json")
+    if not os.path.exists(shard_meta_path):
+        return False
+    with open(shard_meta_path, encoding='utf-8') as f:
+        return json.load(f)['version'] == meta['shard_version']
+
+
+def iter_feature_chunks(feature_dir, chunk_rows=TRAIN_CHUNK_ROWS, plants=None):
+    """
+    Relit les caractéristiques calculées par lots, pour un entraînement hors mémoire.
+
+    Les caractéristiques d'un fragment supprimé, ou réécrit depuis leur calcul,
+    sont ignorées.
+
+    Args:
+        feature_dir (str): Dossier écrit par `extract_shard_features`
+        chunk_rows (int, optional): Nombre maximal de lignes par lot
+        plants (list, optional): Usines à retenir. Par défaut toutes
+
+    Yields:
+        tuple: (X, y) tableaux NumPy d'au plus `chunk_rows` lignes
+    """
+    for meta_path in sorted(glob.glob(os.path.join(feature_dir, '*', '*.json'))):
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if plants is not None and meta['plant'] not in plants:
+            continue
+        if not _shard_is_live(meta):
+            continue
+        base = meta_path[:-len(".json")]
+        X = np.load(base + ".features.npy", mmap_mode='r')
+        y = np.load(base + ".labels.npy", mmap_mode='r')
+        for start in range(0, len(X), chunk_rows):
+            yield np.array(X[start:start + chunk_rows]), np.array(y[start:start + chunk_rows])
+
+
+def train_on_feature_chunks(feature_dir, model=None, chunk_rows=TRAIN_CHUNK_ROWS, n_epochs=1, plants=None):
+    """
+    Entraîne un modèle incrémental sur les caractéristiques lues par lots.
+
+    Une première passe ajuste le scaler (`partial_fit`), les suivantes le modèle ;
+    seul un lot est en mémoire à la fois.
+
+    Args:
+        feature_dir (str): Dossier écrit par `extract_shard_features`
+        model (optional): Estimateur scikit-learn doté de `partial_fit`. Par défaut
+            une régression logistique par descente de gradient stochastique
+        chunk_rows (int, optional): Nombre maximal de lignes par lot
+        n_epochs (int, optional): Nombre de passes sur les données. Par défaut 1
+        plants (list, optional): Usines à retenir. Par défaut toutes
+
+    Returns:
+        tuple: (model, scaler)
+    """
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    model = model if model is not None else SGDClassifier(loss='log_loss', random_state=42)
+    scaler = StandardScaler()
+    for X, _ in iter_feature_chunks(feature_dir, chunk_rows, plants):
+        scaler.partial_fit(X)
+
+    classes = np.array([0, 1])
+    for _ in range(n_epochs):
+        for X, y in iter_feature_chunks(feature_dir, chunk_rows, plants):
+            model.partial_fit(scaler.transform(X), y, classes=classes)
+    return model, scaler
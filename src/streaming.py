@@ -0,0 +1,203 @@
+import math
+
+import numpy as np
+
+from src.features import FEATURE_PROFILES
+
+# Précision relative utilisée pour détecter un signal constant, comme scipy.stats
+_RESOLUTION = np.finfo(np.float64).resolution
+
+
+class _RunningMoments:
+    """
+    Moyenne et moments centrés d'ordre 2 à 4 mis à jour échantillon par échantillon.
+    
+    Utilise les formules de mise à jour de Welford/Pébay, numériquement stables,
+    pour un coût et une mémoire constants par échantillon.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+    def update(self, value):
+        n1 = self.n
+        self.n += 1
+        n = self.n
+        delta = value - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        self.mean += delta_n
+        self.m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * self.m2 - 4 * delta_n * self.m3
+        self.m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self.m2
+        self.m2 += term1
+
+    def _is_constant(self):
+        return self.n == 0 or self.m2 / self.n <= (_RESOLUTION * self.mean) ** 2
+
+    def skew(self):
+        """Asymétrie (estimateur biaisé, comme scipy.stats.skew)."""
+        if self._is_constant():
+            return np.nan
+        return math.sqrt(self.n) * self.m3 / self.m2 ** 1.5
+
+    def kurtosis(self):
+        """Aplatissement de Fisher (estimateur biaisé, comme scipy.stats.kurtosis)."""
+        if self._is_constant():
+            return np.nan
+        return self.n * self.m4 / (self.m2 * self.m2) - 3.0
+
+
+class _RunningLagCorrelation:
+    """
+    Corrélation de Pearson entre x[:-1] et x[1:] mise à jour à chaque nouvel échantillon.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_head = 0.0
+        self.mean_tail = 0.0
+        self.m2_head = 0.0
+        self.m2_tail = 0.0
+        self.comoment = 0.0
+
+    def update(self, previous, current):
+        self.n += 1
+        delta_head = previous - self.mean_head
+        self.mean_head += delta_head / self.n
+        delta_tail = current - self.mean_tail
+        self.mean_tail += delta_tail / self.n
+        self.comoment += delta_head * (current - self.mean_tail)
+        self.m2_head += delta_head * (previous - self.mean_head)
+        self.m2_tail += delta_tail * (current - self.mean_tail)
+
+    def value(self):
+        denominator = math.sqrt(self.m2_head * self.m2_tail)
+        if self.n < 2 or denominator == 0.0:
+            return np.nan
+        return self.comoment / denominator
+
+
+class StreamingFeatureExtractor:
+    """
+    Calcul incrémental des caractéristiques du profil 'base' pendant un cycle.
+    
+    Les échantillons de pression (PS2, 100 Hz) et de débit (FS1, 10 Hz) sont
+    fournis un par un ; chaque mise à jour est en O(1) en temps et en mémoire.
+    Les caractéristiques provisoires sont disponibles à tout moment via
+    `features()`, et `close_cycle()` renvoie les valeurs finales, identiques
+    (à la précision flottante près) à celles de `extract_features` sur le cycle
+    complet, avant de réinitialiser l'état pour le cycle suivant.
+    
+    Exemple:
+        extractor = StreamingFeatureExtractor()
+        for value in pressure_samples:
+            extractor.update_pressure(value)
+        for value in flow_samples:
+            extractor.update_flow(value)
+        features = extractor.close_cycle()
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Réinitialise l'état pour un nouveau cycle."""
+        self._pressure = _RunningMoments()
+        self._pressure_lag = _RunningLagCorrelation()
+        self._pressure_previous = None
+        self._pressure_derivative_max = -np.inf
+
+        self._flow = _RunningMoments()
+        self._flow_derivative = _RunningMoments()
+        self._flow_previous = None
+        self._flow_integral = 0.0
+
+    @property
+    def n_pressure(self):
+        """Nombre d'échantillons de pression reçus dans le cycle courant."""
+        return self._pressure.n
+
+    @property
+    def n_flow(self):
+        """Nombre d'échantillons de débit reçus dans le cycle courant."""
+        return self._flow.n
+
+    def update_pressure(self, value):
+        """
+        Ajoute un échantillon de pression.
+        
+        Args:
+            value (float): Mesure PS2
+        """
+        value = float(value)
+        self._pressure.update(value)
+        if self._pressure_previous is not None:
+            self._pressure_lag.update(self._pressure_previous, value)
+            derivative = value - self._pressure_previous
+            if derivative > self._pressure_derivative_max:
+                self._pressure_derivative_max = derivative
+        self._pressure_previous = value
+
+    def update_flow(self, value):
+        """
+        Ajoute un échantillon de débit.
+        
+        Args:
+            value (float): Mesure FS1
+        """
+        value = float(value)
+        self._flow.update(value)
+        if self._flow_previous is not None:
+            self._flow_derivative.update(value - self._flow_previous)
+            self._flow_integral += (self._flow_previous + value) / 2.0
+        self._flow_previous = value
+
+    def extend(self, pressure_values=(), flow_values=()):
+        """
+        Ajoute une séquence d'échantillons de pression et/ou de débit.
+        
+        Args:
+            pressure_values (iterable, optional): Mesures PS2 dans l'ordre d'arrivée
+            flow_values (iterable, optional): Mesures FS1 dans l'ordre d'arrivée
+        """
+        for value in pressure_values:
+            self.update_pressure(value)
+        for value in flow_values:
+            self.update_flow(value)
+
+    def features(self):
+        """
+        Renvoie les caractéristiques provisoires du cycle en cours.
+        
+        Returns:
+            dict: Mêmes clés que `extract_features` (profil 'base') ; NaN tant
+                qu'une caractéristique n'est pas définie (trop peu d'échantillons)
+        """
+        derivative_max = self._pressure_derivative_max
+        features = {
+            'skew_pressure': self._pressure.skew(),
+            'kurtosis_pressure': self._pressure.kurtosis(),
+            'autocorr_pressure': self._pressure_lag.value(),
+            'derivative_max_pressure': derivative_max if np.isfinite(derivative_max) else np.nan,
+
+            'derivative_kurtosis_flow': self._flow_derivative.kurtosis(),
+            'integral_flow': self._flow_integral,
+            'skew_flow': self._flow.skew(),
+        }
+        return {name: features[name] for name in FEATURE_PROFILES['base']}
+
+    def close_cycle(self):
+        """
+        Termine le cycle courant et réinitialise l'état.
+        
+        Returns:
+            dict: Caractéristiques finales du cycle
+        """
+        features = self.features()
+        self.reset()
+        return features
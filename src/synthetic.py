@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+
+# Taille des signaux d'un cycle de 60 s
+PRESSURE_SAMPLES = 6000  # PS2, 100 Hz
+FLOW_SAMPLES = 600  # FS1, 10 Hz
+
+# Ouvertures de valve du jeu de données d'origine (100 % = optimal)
+VALVE_OPENINGS = (100, 90, 80, 73)
+
+
+def generate_cycles(n_cycles, seed=0, optimal_ratio=0.5):
+    """
+    Génère des cycles PS2/FS1 synthétiques dont la forme dépend de l'ouverture de la valve.
+    
+    Une valve moins ouverte ralentit la montée en pression et réduit le débit,
+    ce qui rend les classes séparables par les caractéristiques du projet.
+    
+    Args:
+        n_cycles (int): Nombre de cycles à générer
+        seed (int, optional): Graine aléatoire. Par défaut 0
+        optimal_ratio (float, optional): Proportion de cycles optimaux. Par défaut 0.5
+    
+    Returns:
+        tuple: (pressure, flow, valve_opening)
+            - pressure: tableau (n_cycles, 6000)
+            - flow: tableau (n_cycles, 600)
+            - valve_opening: ouverture de la valve de chaque cycle (n_cycles,)
+    """
+    rng = np.random.default_rng(seed)
+    optimal = rng.random(n_cycles) < optimal_ratio
+    valve_opening = np.where(optimal, 100, rng.choice(VALVE_OPENINGS[1:], size=n_cycles))
+    opening = (valve_opening / 100.0)[:, None]
+
+    t_pressure = np.linspace(0.0, 60.0, PRESSURE_SAMPLES)[None, :]
+    t_flow = np.linspace(0.0, 60.0, FLOW_SAMPLES)[None, :]
+    rise = (0.5 + 4.0 * (1.0 - opening)) * rng.lognormal(0.0, 0.8, size=(n_cycles, 1))
+    level = rng.normal(150.0, 3.0, size=(n_cycles, 1))
+
+    pressure = level * (1.0 - np.exp(-t_pressure / rise)) * (1.0 + 0.1 * np.sin(t_pressure / 3.0))
+    pressure += rng.normal(0.0, 0.4, size=(n_cycles, PRESSURE_SAMPLES))
+    gain = rng.normal(8.0, 0.8, size=(n_cycles, 1))
+    flow = gain * opening * (1.0 - np.exp(-t_flow / (2.0 * rise))) + 0.3 * np.cos(t_flow / 5.0)
+    flow += rng.normal(0.0, 0.05, size=(n_cycles, FLOW_SAMPLES))
+    return pressure, flow, valve_opening
+
+
+def iter_cycle_chunks(n_cycles, chunk_size=10000, seed=0):
+    """
+    Génère des cycles synthétiques par blocs, pour les volumes qui ne tiennent pas en mémoire.
+    
+    Args:
+        n_cycles (int): Nombre total de cycles
+        chunk_size (int, optional): Nombre de cycles par bloc. Par défaut 10000
+        seed (int, optional): Graine aléatoire. Par défaut 0
+    
+    Yields:
+        tuple: (pressure, flow, valve_opening) pour chaque bloc
+    """
+    for index, start in enumerate(range(0, n_cycles, chunk_size)):
+        yield generate_cycles(min(chunk_size, n_cycles - start), seed=seed + index)
+
+
+def write_dataset(data_dir, n_cycles, seed=0):
+    """
+    Écrit un jeu de données synthétique au format des fichiers d'origine.
+    
+    Les fichiers PS2.txt, FS1.txt et profile.txt sont séparés par des tabulations,
+    une ligne par cycle.
+    
+    Args:
+        data_dir (str): Dossier de destination
+        n_cycles (int): Nombre de cycles
+        seed (int, optional): Graine aléatoire. Par défaut 0
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    pressure, flow, valve_opening = generate_cycles(n_cycles, seed=seed)
+    np.savetxt(os.path.join(data_dir, "PS2.txt"), pressure, delimiter='\t', fmt='%.2f')
+    np.savetxt(os.path.join(data_dir, "FS1.txt"), flow, delimiter='\t', fmt='%.3f')
+    profile = np.column_stack([
+        np.full(n_cycles, 3),
+        valve_opening,
+        np.zeros(n_cycles, dtype=int),
+        np.full(n_cycles, 130),
+        np.ones(n_cycles, dtype=int),
+    ])
+    np.savetxt(os.path.join(data_dir, "profile.txt"), profile, delimiter='\t', fmt='%d')
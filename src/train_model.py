@@ -3,52 +3,83 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.svm import SVC
 from sklearn.neighbors import KNeighborsClassifier
 
-def train_random_forest(X_train, y_train):
+# Classe et hyperparamètres par défaut de chaque modèle
+MODEL_DEFAULTS = {
+    'random_forest': (RandomForestClassifier, {'random_state': 42}),
+    'logistic_regression': (LogisticRegression, {'max_iter': 1000, 'random_state': 42}),
+    'svm': (SVC, {'probability': True, 'random_state': 42}),
+    'knn': (KNeighborsClassifier, {'n_neighbors': 5}),
+    'gradient_boosting': (GradientBoostingClassifier, {'random_state': 42}),
+}
+
+def build_model(name, **params):
+    """
+    Construit un modèle non entraîné avec les hyperparamètres par défaut du projet.
+    
+    Args:
+        name (str): Nom du modèle (clé de MODEL_DEFAULTS)
+        **params: Hyperparamètres remplaçant ceux par défaut
+        
+    Returns:
+        Estimateur scikit-learn non entraîné
+        
+    Raises:
+        ValueError: Si le modèle est inconnu
+    """
+    if name not in MODEL_DEFAULTS:
+        raise ValueError(f"Modèle inconnu : {name} (disponibles : {', '.join(MODEL_DEFAULTS)})")
+    model_class, defaults = MODEL_DEFAULTS[name]
+    return model_class(**{**defaults, **params})
+
+def train_random_forest(X_train, y_train, **params):
     """
     Entraîne un modèle Random Forest pour la classification des valves.
     
     Args:
         X_train (array-like): Features d'entraînement
         y_train (array-like): Labels d'entraînement (0: non optimal, 1: optimal)
+        **params: Hyperparamètres remplaçant ceux par défaut
         
     Returns:
         RandomForestClassifier: Modèle entraîné
     """
-    model = RandomForestClassifier(random_state=42)
+    model = build_model('random_forest', **params)
     model.fit(X_train, y_train)
     return model
 
-def train_logistic_regression(X_train, y_train):
+def train_logistic_regression(X_train, y_train, **params):
     """
     Entraîne un modèle de régression logistique pour la classification des valves.
     
     Args:
         X_train (array-like): Features d'entraînement
         y_train (array-like): Labels d'entraînement (0: non optimal, 1: optimal)
+        **params: Hyperparamètres remplaçant ceux par défaut
         
     Returns:
         LogisticRegression: Modèle entraîné
     """
-    model = LogisticRegression(max_iter=1000, random_state=42)
+    model = build_model('logistic_regression', **params)
     model.fit(X_train, y_train)
     return model
 
-def train_svm(X_train, y_train):
+def train_svm(X_train, y_train, **params):
     """
     Entraîne un modèle SVM pour la classification des valves.
     
     Args:
         X_train (array-like): Features d'entraînement
         y_train (array-like): Labels d'entraînement (0: non optimal, 1: optimal)
+        **params: Hyperparamètres remplaçant ceux par défaut
         
     Returns:
         SVC: Modèle entraîné avec probabilités activées
     """
-    model = SVC(probability=True, random_state=42)
+    model = build_model('svm', **params)
     model.fit(X_train, y_train)
     return model
 
-def train_knn(X_train, y_train, n_neighbors=5):
+def train_knn(X_train, y_train, n_neighbors=5, **params):
     """
     Entraîne un modèle k-NN pour la classification des valves.
     
@@ -56,25 +87,36 @@ def train_knn(X_train, y_train, n_neighbors=5):
         X_train (array-like): Features d'entraînement
         y_train (array-like): Labels d'entraînement (0: non optimal, 1: optimal)
         n_neighbors (int, optional): Nombre de voisins à considérer. Par défaut 5
+        **params: Autres hyperparamètres
         
     Returns:
         KNeighborsClassifier: Modèle entraîné
     """
-    model = KNeighborsClassifier(n_neighbors=n_neighbors)
+    model = build_model('knn', n_neighbors=n_neighbors, **params)
     model.fit(X_train, y_train)
     return model
 
-def train_gradient_boosting(X_train, y_train):
+def train_gradient_boosting(X_train, y_train, **params):
     """
     Entraîne un modèle Gradient Boosting pour la classification des valves.
     
     Args:
         X_train (array-like): Features d'entraînement
         y_train (array-like): Labels d'entraînement (0: non optimal, 1: optimal)
+        **params: Hyperparamètres remplaçant ceux par défaut
         
     Returns:
         GradientBoostingClassifier: Modèle entraîné
     """
-    model = GradientBoostingClassifier(random_state=42)
+    model = build_model('gradient_boosting', **params)
     model.fit(X_train, y_train)
     return model
+
+# Entraîneurs disponibles, par nom
+TRAINERS = {
+    'random_forest': train_random_forest,
+    'logistic_regression': train_logistic_regression,
+    'svm': train_svm,
+    'knn': train_knn,
+    'gradient_boosting': train_gradient_boosting,
+}
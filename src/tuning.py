@@ -0,0 +1,144 @@
+import json
+import os
+import time
+
+import numpy as np
+from scipy.stats import loguniform, randint, uniform
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, StratifiedKFold
+
+from src.train_model import MODEL_DEFAULTS, build_model
+
+# Espaces de recherche par modèle. Pour les ensembles d'arbres, la ressource
+# allouée par la recherche par divisions successives est le nombre d'arbres
+# (n_estimators) ; pour les autres modèles, le nombre d'échantillons.
+PARAM_SPACES = {
+    'random_forest': {
+        'max_depth': [None, 8, 16, 32],
+        'min_samples_leaf': randint(1, 10),
+        'max_features': ['sqrt', 'log2', None],
+    },
+    'logistic_regression': {
+        'C': loguniform(1e-3, 1e3),
+    },
+    'svm': {
+        'C': loguniform(1e-2, 1e3),
+        'gamma': loguniform(1e-4, 1e1),
+    },
+    'knn': {
+        'n_neighbors': randint(1, 40),
+        'weights': ['uniform', 'distance'],
+    },
+    'gradient_boosting': {
+        'learning_rate': loguniform(1e-2, 0.5),
+        'max_depth': randint(2, 7),
+        'subsample': uniform(0.5, 0.5),
+        'min_samples_leaf': randint(1, 20),
+    },
+}
+
+# Ressource et bornes utilisées par la recherche pour chaque modèle
+RESOURCES = {
+    'random_forest': ('n_estimators', 10, 400),
+    'gradient_boosting': ('n_estimators', 10, 400),
+}
+
+# Nombre minimal d'échantillons par pli à la première itération (ressource n_samples)
+MIN_SAMPLES_PER_SPLIT = 50
+
+
+def tune_model(name, X, y, n_splits=5, n_candidates='exhaust', factor=3, scoring='f1',
+               n_jobs=-1, random_state=42):
+    """
+    Recherche les hyperparamètres d'un modèle par validation croisée stratifiée.
+    
+    Utilise une recherche aléatoire par divisions successives (successive halving) :
+    toutes les configurations sont évaluées avec peu de ressources, puis seule la
+    meilleure fraction 1/factor passe à l'itération suivante avec factor fois plus
+    de ressources. Les plis sont évalués en parallèle ; joblib partage la matrice
+    de caractéristiques entre processus par mappage mémoire au lieu de la copier.
+    
+    Args:
+        name (str): Nom du modèle (clé de PARAM_SPACES)
+        X (array-like): Features standardisées
+        y (array-like): Labels (0: non optimal, 1: optimal)
+        n_splits (int, optional): Nombre de plis. Par défaut 5
+        n_candidates (int or 'exhaust', optional): Configurations tirées à la
+            première itération. Par défaut 'exhaust'
+        factor (int, optional): Facteur d'élagage entre itérations. Par défaut 3
+        scoring (str, optional): Métrique de sélection. Par défaut 'f1'
+        n_jobs (int, optional): Nombre de processus (-1 = tous les cœurs). Par défaut -1
+        random_state (int, optional): Graine aléatoire. Par défaut 42
+    
+    Returns:
+        dict: Meilleurs hyperparamètres, score de validation croisée, nombre de
+            configurations évaluées par itération et durée
+    
+    Raises:
+        ValueError: Si le modèle est inconnu
+    """
+    if name not in PARAM_SPACES:
+        raise ValueError(f"Modèle inconnu : {name} (disponibles : {', '.join(PARAM_SPACES)})")
+
+    # Une seule conversion : les plis ne sont ensuite que des indices dans cette matrice
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.asarray(y)
+
+    if name in RESOURCES:
+        resource, min_resources, max_resources = RESOURCES[name]
+    else:
+        # Assez d'échantillons dès la première itération pour que chaque pli
+        # d'entraînement reste exploitable (ex. k-NN avec beaucoup de voisins)
+        resource, max_resources = 'n_samples', 'auto'
+        min_resources = min(len(X), max(len(X) // factor ** 3, n_splits * MIN_SAMPLES_PER_SPLIT))
+    search = HalvingRandomSearchCV(
+        build_model(name),
+        PARAM_SPACES[name],
+        n_candidates=n_candidates,
+        factor=factor,
+        resource=resource,
+        min_resources=min_resources,
+        max_resources=max_resources,
+        cv=StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state),
+        scoring=scoring,
+        n_jobs=n_jobs,
+        random_state=random_state,
+        refit=False,
+    )
+
+    start = time.perf_counter()
+    search.fit(X, y)
+    best_params = dict(search.best_params_)
+    return {
+        'params': {key: value.item() if isinstance(value, np.generic) else value
+                   for key, value in best_params.items()},
+        'cv_score': float(search.best_score_),
+        'scoring': scoring,
+        'candidates_per_iteration': [int(n) for n in search.n_candidates_],
+        'resources_per_iteration': [int(n) for n in search.n_resources_],
+        'time_s': time.perf_counter() - start,
+    }
+
+
+def tune_models(X, y, model_names=None, output_path=os.path.join("models", "best_params.json"), **kwargs):
+    """
+    Recherche les meilleurs hyperparamètres de plusieurs modèles et les enregistre en JSON.
+    
+    Args:
+        X (array-like): Features standardisées
+        y (array-like): Labels (0: non optimal, 1: optimal)
+        model_names (list, optional): Modèles à régler. Par défaut tous
+        output_path (str, optional): Fichier JSON de sortie. Par défaut models/best_params.json
+        **kwargs: Options transmises à `tune_model`
+    
+    Returns:
+        dict: Résultat de `tune_model` pour chaque modèle
+    """
+    model_names = list(model_names or MODEL_DEFAULTS)
+    results = {name: tune_model(name, X, y, **kwargs) for name in model_names}
+
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return results
@@ -1,7 +1,4 @@
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
-import pandas as pd
 
 def afficher_statistiques(nom, df):
     """
@@ -39,6 +36,29 @@ def select_cycles(df_profile, n_cycles=3):
     non_optimal_indices = df_profile[df_profile['valve_opening'] != 100].index[:n_cycles]
     return optimal_indices.tolist() + non_optimal_indices.tolist()
 
+def extract_cycles(df_profile, df_pressure, df_flow, selected_indices=None):
+    """
+    Extrait les signaux des cycles sélectionnés par indexation vectorisée.
+    
+    Args:
+        df_profile (pandas.DataFrame): DataFrame des informations par cycle
+        df_pressure (pandas.DataFrame): DataFrame des données de pression
+        df_flow (pandas.DataFrame): DataFrame des données de débit
+        selected_indices (array-like, optional): Indices des cycles (étiquettes de
+            df_profile, positions dans les signaux). Par défaut tous les cycles
+        
+    Returns:
+        tuple: (pressure_matrix, flow_matrix, optimal)
+            - pressure_matrix: Pressions, une ligne par cycle
+            - flow_matrix: Débits, une ligne par cycle
+            - optimal: Booléens, True si la valve est optimale
+    """
+    if selected_indices is None:
+        selected_indices = df_profile.index
+    selected_indices = np.asarray(selected_indices)
+    optimal = df_profile['valve_opening'].loc[selected_indices].to_numpy() == 100
+    return df_pressure.to_numpy()[selected_indices], df_flow.to_numpy()[selected_indices], optimal
+
 # Extraction des segments
 def extract_segments(df_profile, df_pressure, df_flow, selected_indices):
     """
@@ -56,19 +76,10 @@ def extract_segments(df_profile, df_pressure, df_flow, selected_indices):
             - flow_segments: Liste des segments de débit
             - labels: Liste des labels ('Optimale' ou 'Non optimale')
     """
-    pressure_segments = []
-    flow_segments = []
-    labels = []
-
-    for idx in selected_indices:
-        # Accéder directement aux lignes sans nom de colonnes
-        pressure_values = df_pressure.iloc[idx].values  # Accède à la ligne par index, convertie en tableau numpy
-        flow_values = df_flow.iloc[idx].values  # Accède à la ligne par index, convertie en tableau numpy
-        label = 'Optimale' if df_profile.loc[idx, 'valve_opening'] == 100 else 'Non optimale'
-
-        pressure_segments.append(pressure_values)
-        flow_segments.append(flow_values)
-        labels.append(label)
+    pressure_matrix, flow_matrix, optimal = extract_cycles(df_profile, df_pressure, df_flow, selected_indices)
+    pressure_segments = list(pressure_matrix)
+    flow_segments = list(flow_matrix)
+    labels = ['Optimale' if is_optimal else 'Non optimale' for is_optimal in optimal]
 
     return pressure_segments, flow_segments, labels
 
@@ -89,6 +100,8 @@ def plot_data(pressure_segments, flow_segments, labels):
         - Débits des cycles optimaux
         - Débits des cycles non-optimaux
     """
+    import matplotlib.pyplot as plt
+
     # Créer une figure avec 2 lignes et 2 colonnes
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
     
@@ -169,6 +182,9 @@ def plot_feature_distribution(df_features, target_variable, feature_columns):
         - Distribution (KDE plot) pour chaque classe
         - Légende indiquant les classes
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     # Définir les couleurs pour les classes 0 et 1
     color_map = {0: 'tab:blue', 1: 'tab:orange'}
 
@@ -189,3 +205,186 @@ def plot_feature_distribution(df_features, target_variable, feature_columns):
         plt.tight_layout()
         plt.show()
 
+
+def lttb(values, n_out):
+    """
+    Sous-échantillonne des signaux en préservant leur forme (Largest-Triangle-Three-Buckets).
+    
+    Les points intérieurs sont répartis en n_out - 2 paquets ; dans chaque paquet,
+    on garde le point formant le plus grand triangle avec le point retenu
+    précédemment et la moyenne du paquet suivant. Pics et creux sont conservés.
+    Le calcul est vectorisé sur les cycles (une boucle par paquet).
+    
+    Args:
+        values (array-like): Signaux, une ligne par cycle (ou un seul signal en 1D)
+        n_out (int): Nombre de points conservés par signal
+        
+    Returns:
+        tuple: (indices, decimated), deux tableaux (n_cycles x n_out) : positions
+            des points conservés et leurs valeurs
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    n_rows, n = values.shape
+    if n_out >= n or n_out < 3:
+        indices = np.broadcast_to(np.arange(n), values.shape).copy()
+        return indices, values.copy()
+
+    # Bornes des paquets intérieurs ; le dernier point forme à lui seul le paquet final
+    edges = np.append(np.linspace(1, n - 1, n_out - 1).astype(np.intp), n)
+    rows = np.arange(n_rows)
+    indices = np.empty((n_rows, n_out), dtype=np.intp)
+    indices[:, 0] = 0
+    indices[:, -1] = n - 1
+    previous = np.zeros(n_rows, dtype=np.intp)
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_start, next_stop = edges[bucket + 1], edges[bucket + 2]
+        mean_x = (next_start + next_stop - 1) / 2
+        mean_y = values[:, next_start:next_stop].mean(axis=1)
+        x_a = previous.astype(np.float64)
+        y_a = values[rows, previous]
+        x = np.arange(start, stop)
+        area = np.abs((x_a - mean_x)[:, None] * (values[:, start:stop] - y_a[:, None])
+                      - (x_a[:, None] - x) * (mean_y - y_a)[:, None])
+        previous = start + np.argmax(area, axis=1)
+        indices[:, bucket + 1] = previous
+    return indices, values[rows[:, None], indices]
+
+def minmax_envelope(values, n_bins):
+    """
+    Réduit des signaux à leur enveloppe minimum/maximum par intervalle.
+    
+    Args:
+        values (array-like): Signaux, une ligne par cycle
+        n_bins (int): Nombre d'intervalles de temps
+        
+    Returns:
+        tuple: (centers, lower, upper, mean)
+            - centers: Position (en échantillons) du centre de chaque intervalle
+            - lower, upper, mean: Minimum, maximum et moyenne de chaque cycle sur
+              chaque intervalle (n_cycles x n_bins)
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    n = values.shape[1]
+    edges = np.unique(np.linspace(0, n, min(n_bins, n) + 1).astype(np.intp))
+    starts = edges[:-1]
+    lower = np.minimum.reduceat(values, starts, axis=1)
+    upper = np.maximum.reduceat(values, starts, axis=1)
+    mean = np.add.reduceat(values, starts, axis=1) / np.diff(edges)
+    return (starts + edges[1:] - 1) / 2, lower, upper, mean
+
+def _plot_lines(ax, values, color, n_points):
+    """Trace chaque cycle après décimation LTTB, en une seule collection de lignes."""
+    from matplotlib.collections import LineCollection
+
+    if len(values) == 0:
+        return
+    indices, decimated = lttb(values, n_points)
+    ax.add_collection(LineCollection(np.stack([indices, decimated], axis=-1), colors=color, alpha=0.7))
+    ax.autoscale_view()
+
+def _plot_bands(ax, envelope, mask, color, percentiles):
+    """Trace les bandes de centiles d'un groupe : centiles bas sur les minimums, hauts sur les maximums."""
+    centers, lower, upper, mean = envelope
+    pairs = [(low, high) for low, high in zip(percentiles, percentiles[::-1]) if low < high]
+    lows = np.percentile(lower[mask], [low for low, _ in pairs], axis=0)
+    highs = np.percentile(upper[mask], [high for _, high in pairs], axis=0)
+    for (low, high), band_low, band_high in zip(pairs, lows, highs):
+        ax.fill_between(centers, band_low, band_high, color=color, alpha=0.2, linewidth=0,
+                        label=f"P{low:g}-P{high:g}")
+    ax.plot(centers, np.median(mean[mask], axis=0), color=color, label="Médiane")
+    ax.legend(loc='upper right')
+
+def plot_cycles(pressure_matrix, flow_matrix, optimal, max_lines=50, n_points=500,
+                percentiles=(5, 25, 75, 95), show=True):
+    """
+    Visualise des milliers de cycles, optimaux et non optimaux séparés.
+    
+    Jusqu'à max_lines cycles par groupe, chaque signal est tracé après décimation
+    LTTB (une seule collection de lignes) ; au-delà, le groupe est résumé par des
+    bandes de centiles calculées sur les enveloppes min/max de chaque cycle, ce
+    qui conserve les pics. Le coût de rendu ne dépend plus du nombre de cycles.
+    
+    Args:
+        pressure_matrix (array-like): Pressions, une ligne par cycle
+        flow_matrix (array-like): Débits, une ligne par cycle
+        optimal (array-like): Booléens, True si la valve est optimale
+        max_lines (int, optional): Nombre de cycles au-delà duquel un groupe est
+            tracé en bandes. Par défaut 50
+        n_points (int, optional): Nombre de points par courbe. Par défaut 500
+        percentiles (tuple, optional): Centiles des bandes, par paires symétriques
+        show (bool, optional): Afficher la figure. Par défaut True
+        
+    Returns:
+        matplotlib.figure.Figure: Figure à 4 sous-graphiques, disposés comme `plot_data`
+    """
+    import matplotlib.pyplot as plt
+
+    optimal = np.asarray(optimal, dtype=bool)
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    for row, (matrix, quantity) in enumerate([(pressure_matrix, "Pression (PS2)"), (flow_matrix, "Débit (FS1)")]):
+        matrix = np.asarray(matrix)
+        envelope = None
+        for column, (mask, title, color) in enumerate([
+            (optimal, "Cycles Optimaux", 'blue'),
+            (~optimal, "Cycles Non Optimaux", 'red'),
+        ]):
+            ax = axes[row, column]
+            if np.count_nonzero(mask) <= max_lines:
+                _plot_lines(ax, matrix[mask], color, n_points)
+            else:
+                # Enveloppes calculées une fois pour tous les cycles, puis réparties par groupe
+                envelope = envelope or minmax_envelope(matrix, n_points)
+                _plot_bands(ax, envelope, mask, color, percentiles)
+            ax.set_title(f"{quantity.split()[0]}s - {title} ({np.count_nonzero(mask)})")
+            ax.set_xlabel("Temps")
+            ax.set_ylabel(quantity)
+            ax.grid(True)
+    fig.tight_layout()
+    if show:
+        plt.show()
+    return fig
+
+def plot_feature_histograms(df_features, target_variable, feature_columns, bins=50, n_cols=3, show=True):
+    """
+    Visualise la distribution des caractéristiques selon la variable cible, par histogrammes.
+    
+    Alternative rapide à `plot_feature_distribution` pour de grands volumes : un
+    histogramme normalisé par classe, sur des intervalles communs, au lieu d'une
+    estimation par noyau. Toutes les caractéristiques sont réunies dans une figure.
+    
+    Args:
+        df_features (pandas.DataFrame): DataFrame contenant les caractéristiques
+        target_variable (str): Nom de la colonne cible
+        feature_columns (list): Liste des colonnes de caractéristiques à visualiser
+        bins (int, optional): Nombre d'intervalles. Par défaut 50
+        n_cols (int, optional): Nombre de sous-graphiques par ligne. Par défaut 3
+        show (bool, optional): Afficher la figure. Par défaut True
+        
+    Returns:
+        matplotlib.figure.Figure: Un sous-graphique par caractéristique
+    """
+    import matplotlib.pyplot as plt
+
+    color_map = {0: 'tab:blue', 1: 'tab:orange'}
+    class_labels = {0: 'Classe 0 (Non optimale)', 1: 'Classe 1 (Optimale)'}
+    target = df_features[target_variable].to_numpy()
+    n_rows = -(-len(feature_columns) // n_cols)
+    fig, axes = plt.subplots(n_rows, n_cols, figsize=(5 * n_cols, 4 * n_rows), squeeze=False)
+
+    for ax, feature in zip(axes.flat, feature_columns):
+        values = df_features[feature].to_numpy(dtype=np.float64)
+        finite = np.isfinite(values)
+        edges = np.histogram_bin_edges(values[finite], bins=bins)
+        for label in (0, 1):
+            counts, _ = np.histogram(values[finite & (target == label)], bins=edges, density=True)
+            ax.stairs(counts, edges, fill=True, alpha=0.5, color=color_map[label], label=class_labels[label])
+        ax.set_title(f'Distribution de {feature}')
+        ax.legend(title=target_variable)
+    for ax in axes.flat[len(feature_columns):]:
+        ax.set_visible(False)
+
+    fig.tight_layout()
+    if show:
+        plt.show()
+    return fig
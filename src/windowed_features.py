@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from sklearn.preprocessing import StandardScaler
+
+from src.features import BATCH_CHUNK_SIZE, check_matrices, extract_features_matrix, get_feature_names
+from src.train_model import TRAINERS
+
+# Fréquences d'échantillonnage des capteurs
+PRESSURE_RATE_HZ = 100
+FLOW_RATE_HZ = 10
+
+# Fenêtres par défaut : 10 s, avancées de 5 s (recouvrement de moitié)
+DEFAULT_WINDOW_S = 10.0
+DEFAULT_STEP_S = 5.0
+
+# Colonnes décrivant la position de chaque fenêtre
+WINDOW_COLUMNS = ['cycle', 'window', 'start_s', 'end_s']
+
+
+def _to_samples(seconds, rate):
+    """Convertit une durée en nombre entier d'échantillons à la fréquence donnée."""
+    samples = seconds * rate
+    if samples < 1 or not np.isclose(samples, round(samples)):
+        raise ValueError(
+            f"{seconds} s ne correspond pas à un nombre entier d'échantillons à {rate} Hz."
+        )
+    return int(round(samples))
+
+
+def window_views(matrix, window, step):
+    """
+    Découpe chaque ligne d'une matrice en fenêtres glissantes, sans copie.
+
+    Args:
+        matrix (numpy.ndarray): Une ligne par cycle
+        window (int): Longueur d'une fenêtre en échantillons
+        step (int): Pas entre deux fenêtres en échantillons
+
+    Returns:
+        numpy.ndarray: Vue en lecture seule (n_cycles x n_fenêtres x window)
+            partageant la mémoire de `matrix`
+    """
+    return sliding_window_view(matrix, window, axis=1)[:, ::step]
+
+
+def extract_window_features(pressure_matrix, flow_matrix, window_s=DEFAULT_WINDOW_S, step_s=DEFAULT_STEP_S,
+                            profile='base', chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Extrait les caractéristiques sur des fenêtres glissantes alignées dans le temps.
+
+    Chaque cycle PS2 (100 Hz) et FS1 (10 Hz) est découpé en fenêtres de même
+    durée par des vues à pas (aucune copie du signal). Les caractéristiques sont
+    calculées fenêtre par fenêtre pour tous les cycles d'un lot à la fois : la
+    mémoire de travail ne dépend que de la taille des fenêtres et du lot, pas du
+    recouvrement. Les matrices peuvent ne couvrir qu'un début de cycle ; seules
+    les fenêtres complètes sont alors produites.
+
+    Args:
+        pressure_matrix (array-like): Pressions, une ligne par cycle (100 Hz)
+        flow_matrix (array-like): Débits, une ligne par cycle (10 Hz)
+        window_s (float, optional): Durée d'une fenêtre en secondes. Par défaut 10
+        step_s (float, optional): Pas entre deux fenêtres en secondes. Par défaut 5
+        profile (str or list, optional): Profil de caractéristiques. Par défaut 'base'
+        chunk_size (int, optional): Nombre de cycles traités à la fois
+
+    Returns:
+        pandas.DataFrame: Une ligne par (cycle, fenêtre), ordonnées par cycle puis
+            par fenêtre, avec les colonnes WINDOW_COLUMNS suivies des caractéristiques
+
+    Raises:
+        ValueError: Si les durées ne tombent pas sur des échantillons entiers, ou si
+            les signaux sont plus courts qu'une fenêtre
+    """
+    pressure_matrix, flow_matrix = check_matrices(pressure_matrix, flow_matrix)
+    names = get_feature_names(profile)
+    pressure_window = _to_samples(window_s, PRESSURE_RATE_HZ)
+    flow_window = _to_samples(window_s, FLOW_RATE_HZ)
+    pressure_step = _to_samples(step_s, PRESSURE_RATE_HZ)
+    flow_step = _to_samples(step_s, FLOW_RATE_HZ)
+
+    duration = min(pressure_matrix.shape[1] / PRESSURE_RATE_HZ, flow_matrix.shape[1] / FLOW_RATE_HZ)
+    if duration < window_s:
+        raise ValueError(f"Les signaux ({duration:g} s) sont plus courts qu'une fenêtre ({window_s:g} s).")
+    n_windows = int((duration - window_s) // step_s) + 1
+
+    pressure_windows = window_views(pressure_matrix, pressure_window, pressure_step)[:, :n_windows]
+    flow_windows = window_views(flow_matrix, flow_window, flow_step)[:, :n_windows]
+
+    n_cycles = pressure_matrix.shape[0]
+    values = np.empty((n_cycles, n_windows, len(names)), dtype=np.float64)
+    for window in range(n_windows):
+        values[:, window] = extract_features_matrix(pressure_windows[:, window], flow_windows[:, window],
+                                                    profile=names, chunk_size=chunk_size)
+
+    starts = np.arange(n_windows) * step_s
+    result = pd.DataFrame({
+        'cycle': np.repeat(np.arange(n_cycles), n_windows),
+        'window': np.tile(np.arange(n_windows), n_cycles),
+        'start_s': np.tile(starts, n_cycles),
+        'end_s': np.tile(starts + window_s, n_cycles),
+    })
+    return pd.concat([result, pd.DataFrame(values.reshape(-1, len(names)), columns=names)], axis=1)
+
+
+def _model_inputs(window_features):
+    """Caractéristiques d'une fenêtre et sa position dans le cycle (fin de fenêtre)."""
+    feature_columns = [column for column in window_features.columns if column not in WINDOW_COLUMNS]
+    return window_features[feature_columns + ['end_s']]
+
+
+def train_window_model(window_features, y, model_name='gradient_boosting', **params):
+    """
+    Entraîne un modèle sur les fenêtres, chacune portant l'étiquette de son cycle.
+
+    La fin de la fenêtre fait partie des entrées : le modèle apprend à juger un
+    cycle à partir de ce qui en a été observé jusque-là.
+
+    Args:
+        window_features (pandas.DataFrame): Résultat de `extract_window_features`
+        y (array-like): Étiquette de chaque cycle (1: optimal, 0: non optimal)
+        model_name (str, optional): Clé de TRAINERS. Par défaut 'gradient_boosting'
+        **params: Hyperparamètres transmis à la fonction d'entraînement
+
+    Returns:
+        tuple: (model, scaler)
+    """
+    y_windows = np.asarray(y)[window_features['cycle'].to_numpy()]
+    scaler = StandardScaler()
+    X = scaler.fit_transform(_model_inputs(window_features))
+    return TRAINERS[model_name](X, y_windows, **params), scaler
+
+
+def score_windows(model, scaler, window_features):
+    """
+    Returns:
+        numpy.ndarray: Probabilité que la valve soit optimale, une par fenêtre
+    """
+    return model.predict_proba(scaler.transform(_model_inputs(window_features)))[:, 1]
+
+
+def first_alarm(window_features, proba_optimal, threshold=0.5):
+    """
+    Instant de la première alerte de chaque cycle.
+
+    Args:
+        window_features (pandas.DataFrame): Résultat de `extract_window_features`
+        proba_optimal (array-like): Résultat de `score_windows`
+        threshold (float, optional): Probabilité de valve non optimale déclenchant
+            l'alerte. Par défaut 0.5
+
+    Returns:
+        pandas.Series: Fin (en secondes) de la première fenêtre en alerte, par
+            cycle ; NaN si le cycle n'a déclenché aucune alerte
+    """
+    alarms = window_features.loc[1.0 - np.asarray(proba_optimal) >= threshold, ['cycle', 'end_s']]
+    first = alarms.groupby('cycle')['end_s'].min()
+    return first.reindex(np.unique(window_features['cycle']))
@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def sensor_matrices():
+    """Matrices PS2 (100 Hz) et FS1 (10 Hz) synthétiques pour quelques cycles."""
+    rng = np.random.default_rng(0)
+    n_cycles = 12
+    t_pressure = np.linspace(0, 60, 6000)
+    t_flow = np.linspace(0, 60, 600)
+    amplitude = rng.uniform(0.5, 2.0, size=(n_cycles, 1))
+    pressure = 110 + 20 * amplitude * np.sin(t_pressure / 6) + rng.normal(0, 0.5, (n_cycles, 6000))
+    flow = 8 + amplitude * np.cos(t_flow / 4) + rng.normal(0, 0.1, (n_cycles, 600))
+    return pressure, flow
@@ -0,0 +1,29 @@
+from benchmarks.run_benchmarks import find_regressions, run_benchmarks
+
+
+def test_run_benchmarks_small_dataset():
+    report = run_benchmarks(n_cycles=60, profiles=('base',), include_load=False, include_models=False)
+
+    results = report['results']
+    assert set(results) == {'features_single_base', 'features_dataset_base'}
+    assert results['features_dataset_base']['cycles_per_s'] > 0
+    assert results['features_single_base']['p99_ms'] >= results['features_single_base']['p50_ms']
+
+
+def test_find_regressions_respects_metric_direction():
+    baseline = {'results': {'bench': {'fit_s': 1.0, 'cycles_per_s': 100.0, 'cycles': 10}}}
+    faster = {'results': {'bench': {'fit_s': 0.5, 'cycles_per_s': 200.0, 'cycles': 10}}}
+    slower = {'results': {'bench': {'fit_s': 1.5, 'cycles_per_s': 50.0, 'cycles': 10}}}
+
+    assert find_regressions(faster, baseline) == []
+    assert {r['metric'] for r in find_regressions(slower, baseline)} == {'fit_s', 'cycles_per_s'}
+    assert find_regressions(slower, baseline, tolerance=1.0) == []
+
+
+def test_capped_benchmarks_are_recorded(capsys):
+    report = run_benchmarks(n_cycles=40, profiles=(), include_load=False, max_train_cycles=30)
+
+    assert report['results']['train_knn']['cycles'] == 30
+    assert report['results']['train_knn']['requested_cycles'] == 40
+    assert 'train_knn' in report['meta']['capped']
+    assert 'plafond' in capsys.readouterr().err
@@ -0,0 +1,101 @@
+import json
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+import main
+from src.compiled_model import compile_tree_ensemble
+from src.features import extract_features_batch, extract_features_matrix
+from src.train_model import TRAINERS, train_gradient_boosting
+
+# Budget de temps d'import de main.py (le chargement de scikit-learn, pandas et
+# matplotlib au démarrage coûtait plus d'une seconde)
+IMPORT_BUDGET_S = 0.5
+
+HEAVY_MODULES = ('pandas', 'sklearn', 'joblib', 'matplotlib', 'seaborn')
+
+
+def _run_python(code, cwd):
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_cli_import_stays_within_budget(request):
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import main\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    result = _run_python(code, request.config.rootpath)
+    assert result['heavy'] == []
+    assert result['elapsed'] < IMPORT_BUDGET_S
+
+
+def test_score_command_uses_only_numpy(request, tmp_path, sensor_matrices):
+    pressure, flow = sensor_matrices
+    X = extract_features_batch(pressure, flow)
+    y = np.arange(len(X)) % 2
+    scaler = StandardScaler().fit(X)
+    model = train_gradient_boosting(scaler.transform(X), y)
+    compile_tree_ensemble(model, scaler).save(tmp_path / "model.npz")
+    for name, values in (("PS2.txt", pressure), ("FS1.txt", flow)):
+        # Première ligne ignorée comme en-tête, à l'image de load_sensor_file
+        np.savetxt(tmp_path / name, np.vstack([values[:1], values]), delimiter='\t')
+
+    code = (
+        "import json, sys\n"
+        "import main\n"
+        f"main.score({str(tmp_path / 'PS2.txt')!r}, {str(tmp_path / 'FS1.txt')!r}, "
+        f"{str(tmp_path / 'model.npz')!r}, {str(tmp_path / 'scores.csv')!r})\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    assert _run_python(code, request.config.rootpath) == []
+
+    scores = pd.read_csv(tmp_path / "scores.csv")
+    np.testing.assert_allclose(scores['proba_optimal'], model.predict_proba(scaler.transform(X))[:, 1], atol=1e-6)
+
+
+def test_extract_features_matrix_matches_batch(sensor_matrices):
+    pressure, flow = sensor_matrices
+    expected = extract_features_batch(pressure, flow, profile='extended')
+    np.testing.assert_allclose(extract_features_matrix(pressure, flow, profile='extended', chunk_size=5),
+                               expected.to_numpy(dtype=np.float64))
+
+
+def test_options_without_subcommand_default_to_train():
+    args = main.parse_args(['--compare', '--models', 'knn'])
+    assert (args.command, args.compare, args.models) == ('train', True, ['knn'])
+    assert main.parse_args([]).command == 'train'
+    assert main.parse_args(['score', 'p.txt', 'f.txt']).model == main.DEFAULT_COMPILED_MODEL
+
+
+def test_model_names_match_trainers():
+    assert main.MODEL_NAMES == tuple(TRAINERS)
+
+
+def test_profile_can_be_a_selection_file(tmp_path):
+    path = tmp_path / "selected.json"
+    path.write_text(json.dumps({'features': ['mean_flow', 'skew_pressure']}))
+    assert main.resolve_profile(str(path)) == ['mean_flow', 'skew_pressure']
+    assert main.resolve_profile('extended') == 'extended'
+    args = main.parse_args(['features', '--select', '--budget-us', '50'])
+    assert (args.select, args.budget_us, args.profile) == (True, 50.0, None)
+
+
+def test_incremental_state_keeps_the_same_test_cycles(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'INCREMENTAL_STATE', str(tmp_path / "state.json"))
+    X = pd.DataFrame({'value': np.arange(2300.0)})
+    y = pd.Series(np.arange(2300) % 2)
+    _, _, _, y_test = main.split_data(X.iloc[:2205], y.iloc[:2205])
+    main.save_incremental_state(2205, y_test.index)
+
+    X_train, X_test, _, _ = main.split_known(X, y, main.load_incremental_state())
+
+    assert sorted(X_test.index) == sorted(y_test.index)
+    assert len(X_train) == 2000 and X_train.index.max() < 2205
+    assert not set(X_train.index) & set(X_test.index)
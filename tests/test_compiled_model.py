@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from src.compiled_model import CompiledTreeEnsemble, compile_tree_ensemble
+from src.train_model import train_gradient_boosting, train_random_forest
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(4)
+    X = rng.normal(size=(300, 7)) * [1, 10, 100, 0.1, 1, 5, 2] + [0, 50, 0, 0, 3, 0, 1]
+    y = (X[:, 0] + 0.05 * X[:, 1] + rng.normal(0, 0.5, 300) > 2.5).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize("trainer", [train_gradient_boosting, train_random_forest])
+def test_compiled_predictions_match_sklearn(tmp_path, dataset, trainer):
+    X, y = dataset
+    scaler = StandardScaler().fit(X)
+    model = trainer(scaler.transform(X), y)
+    expected = model.predict_proba(scaler.transform(X))
+
+    compiled = compile_tree_ensemble(model, scaler)
+    compiled.save(tmp_path / "model.npz")
+    loaded = CompiledTreeEnsemble.load(tmp_path / "model.npz")
+
+    np.testing.assert_array_equal(compiled.predict_proba(X), expected)
+    np.testing.assert_array_equal(loaded.predict_proba(X), expected)
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(scaler.transform(X)))
+
+
+def test_unsupported_model_is_rejected(dataset):
+    from src.train_model import train_knn
+    X, y = dataset
+    with pytest.raises(ValueError):
+        compile_tree_ensemble(train_knn(X, y))
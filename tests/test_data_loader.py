@@ -0,0 +1,135 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from src.data_loader import (
+    SENSORS,
+    SensorSet,
+    get_cache_paths,
+    load_all_data,
+    load_sensor,
+    load_sensor_file,
+    parse_sensor_file,
+)
+
+
+def _write_sensor_file(path, values):
+    np.savetxt(path, values, delimiter='\t', fmt='%.3f')
+
+
+def test_cached_load_matches_raw(tmp_path):
+    rng = np.random.default_rng(1)
+    path = str(tmp_path / "sensor.txt")
+    _write_sensor_file(path, rng.uniform(100, 200, size=(20, 50)))
+
+    raw = load_sensor_file(path, use_cache=False)
+    first = load_sensor_file(path)
+    second = load_sensor_file(path)
+
+    pd.testing.assert_frame_equal(first, raw)
+    pd.testing.assert_frame_equal(second, raw)
+    assert all(os.path.exists(p) for p in get_cache_paths(path))
+    assert isinstance(np.load(get_cache_paths(path)[0], mmap_mode='r'), np.memmap)
+
+
+def test_cache_invalidated_when_source_changes(tmp_path):
+    path = str(tmp_path / "sensor.txt")
+    _write_sensor_file(path, np.ones((5, 10)))
+    load_sensor_file(path)
+
+    _write_sensor_file(path, np.full((8, 10), 2.0))
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+
+    reloaded = load_sensor_file(path)
+    assert reloaded.shape == (7, 10)
+    assert (reloaded.to_numpy() == 2.0).all()
+
+
+def test_load_all_data_cached_and_raw_agree(tmp_path):
+    rng = np.random.default_rng(2)
+    _write_sensor_file(tmp_path / "PS2.txt", rng.uniform(100, 200, size=(6, 6000)))
+    _write_sensor_file(tmp_path / "FS1.txt", rng.uniform(5, 10, size=(6, 600)))
+    np.savetxt(tmp_path / "profile.txt", np.tile([3, 100, 0, 130, 1], (6, 1)), delimiter='\t', fmt='%d')
+
+    cached = load_all_data(data_dir=str(tmp_path))
+    raw = load_all_data(use_cache=False, data_dir=str(tmp_path))
+
+    for cached_df, raw_df in zip(cached, raw):
+        pd.testing.assert_frame_equal(cached_df, raw_df)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_parallel_parser_matches_pandas(tmp_path, dtype):
+    rng = np.random.default_rng(3)
+    path = str(tmp_path / "sensor.txt")
+    _write_sensor_file(path, rng.uniform(0, 10, size=(40, 25)))
+
+    values, columns = parse_sensor_file(
+        path, str(tmp_path / "out.npy"), dtype=dtype, n_workers=2, chunk_bytes=512
+    )
+
+    expected = pd.read_csv(path, sep='\t', engine='python')
+    assert values.dtype == dtype
+    assert columns == list(expected.columns)
+    np.testing.assert_array_equal(values, expected.to_numpy().astype(dtype))
+
+
+def test_parallel_parser_rejects_wrong_column_count(tmp_path):
+    path = str(tmp_path / "FS1.txt")
+    _write_sensor_file(path, np.ones((3, 600)))
+    with open(path, 'a') as f:
+        f.write('\t'.join(['1.0'] * 599) + '\n')
+
+    with pytest.raises(ValueError, match="ligne 4"):
+        parse_sensor_file(path, str(tmp_path / "out.npy"), chunk_bytes=1024)
+
+
+def test_failed_cache_build_leaves_no_temporary_files(tmp_path):
+    path = str(tmp_path / "FS1.txt")
+    _write_sensor_file(path, np.ones((3, 600)))
+    with open(path, 'a') as f:
+        f.write('\t'.join(['1.0'] * 599 + ['abc']) + '\n')
+
+    with pytest.raises(ValueError):
+        load_sensor_file(path, n_workers=1)
+    assert sorted(os.listdir(tmp_path)) == ["FS1.txt"]
+
+
+def test_parallel_parser_deduplicates_header_like_pandas(tmp_path):
+    path = str(tmp_path / "sensor.txt")
+    values = np.array([[1.5, 1.5, 2.0, 1.5], [3.0, 4.0, 5.0, 6.0]])
+    _write_sensor_file(path, values)
+
+    _, columns = parse_sensor_file(path, str(tmp_path / "out.npy"))
+
+    assert columns == list(pd.read_csv(path, sep='\t', engine='python').columns)
+
+
+def test_sensor_set_loads_only_accessed_sensors(tmp_path):
+    rng = np.random.default_rng(5)
+    for name in ('TS1', 'VS1', 'FS2'):
+        _write_sensor_file(str(tmp_path / SENSORS[name]['file']),
+                           rng.normal(size=(6, SENSORS[name]['width'])))
+
+    sensors = SensorSet(data_dir=str(tmp_path))
+    assert sorted(sensors) == ['FS2', 'TS1', 'VS1']
+    assert sensors.loaded == []
+
+    ts1 = sensors['TS1']
+    assert ts1.shape == (5, 60)
+    assert sensors.loaded == ['TS1']
+    assert sensors['TS1'] is ts1
+    np.testing.assert_array_equal(ts1, load_sensor('TS1', data_dir=str(tmp_path)).to_numpy())
+    with pytest.raises(KeyError):
+        sensors['PS1']
+    with pytest.raises(ValueError):
+        SensorSet(data_dir=str(tmp_path), names=['XX1'])
+
+
+def test_sensor_width_is_checked_against_registry(tmp_path):
+    _write_sensor_file(str(tmp_path / "TS1.txt"), np.ones((4, 59)))
+    with pytest.raises(ValueError):
+        SensorSet(data_dir=str(tmp_path))['TS1']
@@ -0,0 +1,63 @@
+import json
+import subprocess
+import sys
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score, precision_score, recall_score, roc_auc_score
+
+from src.evaluate import compute_metrics, evaluate_model, threshold_sweep
+
+
+def test_threshold_sweep_matches_per_threshold_metrics():
+    rng = np.random.default_rng(7)
+    y = rng.integers(0, 2, 500)
+    scores = np.clip(0.3 * y + rng.random(500) * 0.7, 0, 1)
+    thresholds = [0.1, 0.35, 0.5, 0.8]
+
+    sweep = threshold_sweep(y, scores, thresholds)
+
+    for i, threshold in enumerate(thresholds):
+        y_pred = (scores >= threshold).astype(int)
+        assert np.isclose(sweep['precision'][i], precision_score(y, y_pred, zero_division=0))
+        assert np.isclose(sweep['recall'][i], recall_score(y, y_pred))
+        assert np.isclose(sweep['f1'][i], f1_score(y, y_pred))
+        assert np.isclose(sweep['accuracy'][i], (y_pred == y).mean())
+
+
+def test_headless_evaluation_writes_metrics_and_figures(tmp_path):
+    rng = np.random.default_rng(8)
+    X = rng.normal(size=(300, 3))
+    y = (X[:, 0] > 0).astype(int)
+    model = LogisticRegression().fit(X, y)
+
+    metrics = evaluate_model(model, X, y, output_dir=str(tmp_path), show=False)
+
+    saved = json.loads((tmp_path / "metrics.json").read_text())
+    assert saved['confusion_matrix'] == metrics['confusion_matrix']
+    assert np.sum(saved['confusion_matrix']) == 300
+    assert 0.5 < saved['roc_auc'] <= 1.0
+    for name in ('confusion_matrix', 'roc_curve', 'precision_recall_curve'):
+        assert (tmp_path / f"{name}.png").exists()
+
+
+def test_curves_are_decimated_for_large_test_sets():
+    rng = np.random.default_rng(9)
+    y = rng.integers(0, 2, 50000)
+    scores = np.clip(0.2 * y + rng.random(50000) * 0.8, 0, 1)
+
+    metrics = compute_metrics(y, (scores >= 0.5).astype(int), scores, max_curve_points=100)
+
+    assert np.isclose(metrics['roc_auc'], roc_auc_score(y, scores))
+    for curve in ('roc_curve', 'pr_curve'):
+        lengths = {len(values) for values in metrics[curve].values()}
+        assert len(lengths) == 1 and lengths.pop() <= 100
+    assert metrics['roc_curve']['fpr'][0] == 0.0 and metrics['roc_curve']['fpr'][-1] == 1.0
+    assert metrics['pr_curve']['thresholds'][-1] is None
+    json.dumps(metrics)
+
+
+def test_import_does_not_load_plotting_stack():
+    code = "import sys, src.evaluate; print('matplotlib' in sys.modules or 'seaborn' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
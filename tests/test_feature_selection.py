@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from src.feature_selection import load_selected_profile, measure_cost, save_selection, select_features
+from src.features import get_feature_names
+from src.synthetic import generate_cycles
+
+
+@pytest.fixture(scope='module')
+def cycles():
+    pressure, flow, valve_opening = generate_cycles(160, seed=4)
+    return pressure, flow, (valve_opening == 100).astype(int)
+
+
+def test_measure_cost_is_per_cycle(cycles):
+    pressure, flow, _ = cycles
+    cost = measure_cost(pressure, flow, get_feature_names('base'), repeats=1)
+    assert 0 < cost < measure_cost(pressure[:1], flow[:1], get_feature_names('base'), repeats=1) * 160
+
+
+def test_large_budget_keeps_full_profile(cycles):
+    pressure, flow, y = cycles
+    selection = select_features(pressure, flow, y, budget_s=1.0, profile='base', importance='model', repeats=1)
+    assert selection['features'] == get_feature_names('base')
+    assert selection['within_budget'] and len(selection['history']) == 1
+
+
+def test_zero_budget_prunes_within_tolerance(cycles, tmp_path):
+    pressure, flow, y = cycles
+    selection = select_features(pressure, flow, y, budget_s=0.0, profile='base', tolerance=0.0,
+                                importance='model', repeats=1)
+
+    assert not selection['within_budget']
+    assert set(selection['features']) < set(get_feature_names('base'))
+    assert selection['score'] >= selection['baseline_score']
+    removed = [step['removed'] for step in selection['history'][1:]]
+    assert sorted(removed + selection['features']) == sorted(get_feature_names('base'))
+
+    save_selection(selection, tmp_path / "selected.json")
+    assert load_selected_profile(tmp_path / "selected.json") == selection['features']
+
+
+def test_unknown_importance_is_rejected(cycles):
+    pressure, flow, y = cycles
+    with pytest.raises(ValueError):
+        select_features(pressure, flow, y, budget_s=1.0, importance='shap')
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from src.feature_store import evict, load_or_compute_features
+from src.features import extract_features_batch
+
+
+def test_hit_after_first_computation(tmp_path, sensor_matrices):
+    pressure, flow = sensor_matrices
+    first, status_first = load_or_compute_features(pressure, flow, store_dir=str(tmp_path))
+    second, status_second = load_or_compute_features(pressure, flow, store_dir=str(tmp_path))
+
+    assert (status_first, status_second) == ('miss', 'hit')
+    pd.testing.assert_frame_equal(second, first)
+    pd.testing.assert_frame_equal(first, extract_features_batch(pressure, flow))
+
+
+def test_appended_cycles_reuse_cached_prefix(tmp_path, sensor_matrices):
+    pressure, flow = sensor_matrices
+    load_or_compute_features(pressure[:8], flow[:8], store_dir=str(tmp_path))
+
+    extended, status = load_or_compute_features(pressure, flow, store_dir=str(tmp_path))
+
+    assert status == 'partial'
+    np.testing.assert_allclose(extended.to_numpy(), extract_features_batch(pressure, flow).to_numpy())
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+
+
+def test_profile_and_data_changes_miss(tmp_path, sensor_matrices):
+    pressure, flow = sensor_matrices
+    load_or_compute_features(pressure, flow, store_dir=str(tmp_path))
+
+    _, status_profile = load_or_compute_features(pressure, flow, profile='extended', store_dir=str(tmp_path))
+    modified = pressure.copy()
+    modified[0, 0] += 1.0
+    _, status_data = load_or_compute_features(modified, flow, store_dir=str(tmp_path))
+
+    assert (status_profile, status_data) == ('miss', 'miss')
+
+
+def test_eviction_respects_size_limit(tmp_path, sensor_matrices):
+    pressure, flow = sensor_matrices
+    for shift in range(3):
+        load_or_compute_features(pressure + shift, flow, store_dir=str(tmp_path))
+
+    assert evict(str(tmp_path), max_bytes=0) == 3
+    assert not list(tmp_path.glob("*.npy"))
+
+
+def test_empty_input_returns_empty_features(tmp_path):
+    features_df, status = load_or_compute_features(np.zeros((0, 6000)), np.zeros((0, 600)),
+                                                   store_dir=str(tmp_path))
+
+    assert status == 'miss' and features_df.shape[0] == 0
+    assert list(features_df.columns) == list(extract_features_batch(np.zeros((1, 6000)), np.zeros((1, 600))).columns)
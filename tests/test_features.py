@@ -1,10 +1,39 @@
 import numpy as np
+import pandas as pd
+import pytest
 from scipy.stats import skew, kurtosis
 from scipy.signal import correlate
 
+from src.features import (
+    FEATURE_PROFILES,
+    extract_features,
+    extract_features_batch,
+    extract_multi_sensor_features,
+)
 
-def extract_features(pressure_segment, flow_segment):
+
+def reference_base_features(pressure_segment, flow_segment):
+    """
+    Implémentation de référence (scipy, cycle par cycle) du profil 'base'.
+    """
+    pressure_segment = np.array(pressure_segment)
+    flow_segment = np.array(flow_segment)
+
+    return {
+        'skew_pressure': skew(pressure_segment),
+        'kurtosis_pressure': kurtosis(pressure_segment),
+        'autocorr_pressure': np.corrcoef(pressure_segment[:-1], pressure_segment[1:])[0, 1],
+        'derivative_max_pressure': np.max(np.diff(pressure_segment)),
+
+        'derivative_kurtosis_flow': kurtosis(np.diff(flow_segment)),
+        'integral_flow': np.trapz(flow_segment),
+        'skew_flow': skew(flow_segment),
+    }
+
+
+def reference_extended_features(pressure_segment, flow_segment):
     """
+    Implémentation de référence du profil 'extended'.
     Extrait un ensemble complet de caractéristiques statistiques à partir des segments de pression (PS2) et de débit (FS1).
     :param pressure_segment: liste ou tableau numpy contenant les valeurs de pression pour un cycle
     :param flow_segment: liste ou tableau numpy contenant les valeurs de débit pour un cycle
@@ -61,3 +90,62 @@ def extract_features(pressure_segment, flow_segment):
     return features
 
 
+REFERENCES = {
+    'base': reference_base_features,
+    'extended': reference_extended_features,
+}
+
+
+@pytest.mark.parametrize("profile", ['base', 'extended'])
+def test_profiles_match_reference(sensor_matrices, profile):
+    pressure, flow = sensor_matrices
+    expected = pd.DataFrame([REFERENCES[profile](p, f) for p, f in zip(pressure, flow)])
+
+    single = pd.DataFrame([extract_features(p, f, profile=profile) for p, f in zip(pressure, flow)])
+    batch = extract_features_batch(pressure, flow, profile=profile)
+
+    assert list(batch.columns) == list(FEATURE_PROFILES[profile]) == list(expected.columns)
+    np.testing.assert_allclose(single.to_numpy(), expected.to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(batch.to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+
+def test_batch_chunking_is_transparent(sensor_matrices):
+    pressure, flow = sensor_matrices
+    whole = extract_features_batch(pressure, flow, profile='extended')
+    chunked = extract_features_batch(pressure, flow, profile='extended', chunk_size=5)
+    pd.testing.assert_frame_equal(whole, chunked)
+
+
+def test_explicit_feature_list_and_unknown_names(sensor_matrices):
+    pressure, flow = sensor_matrices
+    result = extract_features_batch(pressure, flow, profile=['integral_flow', 'median_pressure'])
+    assert list(result.columns) == ['integral_flow', 'median_pressure']
+
+    with pytest.raises(ValueError):
+        extract_features(pressure[0], flow[0], profile='inconnu')
+    with pytest.raises(ValueError):
+        extract_features(pressure[0], flow[0], profile=['inconnue'])
+
+
+def test_multi_sensor_features_touch_only_requested_sensors(sensor_matrices):
+    pressure, flow = sensor_matrices
+
+    class Sensors(dict):
+        accessed = []
+
+        def __getitem__(self, name):
+            self.accessed.append(name)
+            return dict.__getitem__(self, name)
+
+    sensors = Sensors(PS2=pressure, FS1=flow, TS1=pressure[:, ::100])
+    features = extract_multi_sensor_features(
+        sensors, {'TS1': ['mean', 'skew'], 'FS1': None}, n_workers=2, chunk_size=5
+    )
+
+    assert sorted(sensors.accessed) == ['FS1', 'TS1']
+    assert list(features.columns[:3]) == ['mean_TS1', 'skew_TS1', 'mean_FS1']
+    np.testing.assert_allclose(features['mean_TS1'], pressure[:, ::100].mean(axis=1))
+    np.testing.assert_allclose(features['skew_TS1'], skew(pressure[:, ::100], axis=1))
+    np.testing.assert_allclose(features['kurtosis_FS1'], kurtosis(flow, axis=1))
+    with pytest.raises(ValueError):
+        extract_multi_sensor_features(sensors, {'TS1': ['unknown']})
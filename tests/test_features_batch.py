@@ -0,0 +1,9 @@
+import pytest
+
+from src.features import extract_features_batch
+
+
+def test_batch_rejects_mismatched_cycle_counts(sensor_matrices):
+    pressure, flow = sensor_matrices
+    with pytest.raises(ValueError):
+        extract_features_batch(pressure, flow[:-1])
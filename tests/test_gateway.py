@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import numpy as np
+
+from src.gateway import (
+    RESULT,
+    SENSOR_FLOW,
+    SENSOR_PRESSURE,
+    STATUS_INVALID_FRAME,
+    STATUS_OK,
+    STATUS_SCORING_FAILED,
+    CycleAssembler,
+    IngestionGateway,
+    encode_frame,
+    simulate_plc,
+)
+from src.synthetic import generate_cycles
+
+
+class MeanScorer:
+    """Scorer factice : moyenne des pressions, éventuellement ralenti."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batch_sizes = []
+
+    def predict_proba(self, pressure_matrix, flow_matrix):
+        time.sleep(self.delay)
+        self.batch_sizes.append(len(pressure_matrix))
+        return pressure_matrix.mean(axis=1) / 1000.0 + flow_matrix.shape[1]
+
+
+class FailingOnNegativeScorer(MeanScorer):
+    """Scorer factice qui échoue dès qu'un cycle du lot a une pression moyenne négative."""
+
+    def predict_proba(self, pressure_matrix, flow_matrix):
+        if (pressure_matrix.mean(axis=1) < 0).any():
+            raise ValueError("cycle invalide")
+        return super().predict_proba(pressure_matrix, flow_matrix)
+
+
+def _cycle_frames(valve_id, cycle, pressure_value):
+    return (encode_frame(valve_id, cycle, SENSOR_PRESSURE, 0, np.full(6000, pressure_value))
+            + encode_frame(valve_id, cycle, SENSOR_FLOW, 0, np.ones(600)))
+
+
+def _run_gateway(scorer, n_valves, **options):
+    async def scenario():
+        gateway = await IngestionGateway(scorer, **options).start(port=0)
+        try:
+            results = await simulate_plc('127.0.0.1', gateway.port, n_valves, n_cycles=2, n_connections=4)
+        finally:
+            await gateway.close()
+        return results, gateway.stats()
+    return asyncio.run(scenario())
+
+
+def test_assembler_completes_and_drops_cycles():
+    assembler = CycleAssembler()
+    assert assembler.add(7, 0, SENSOR_PRESSURE, 0, np.ones(6000)) is None
+    assert assembler.add(7, 1, SENSOR_FLOW, 0, np.ones(600)) is None
+    assert assembler.dropped == 1
+
+    assert assembler.add(7, 1, SENSOR_PRESSURE, 3000, np.full(3000, 2.0)) is None
+    valve_id, cycle, pressure, flow = assembler.add(7, 1, SENSOR_PRESSURE, 0, np.zeros(3000))
+    assert (valve_id, cycle) == (7, 1)
+    assert pressure[:3000].sum() == 0 and pressure[3000:].sum() == 6000 and flow.sum() == 600
+    assert len(assembler) == 0
+
+
+def test_gateway_scores_every_cycle_of_every_valve():
+    pressure, _, _ = generate_cycles(40, seed=0)
+    results, stats = _run_gateway(MeanScorer(), 40)
+
+    assert len(results) == 80
+    for valve_id in range(40):
+        np.testing.assert_allclose(results[(valve_id, 1)], pressure[valve_id].mean() / 1000.0 + 600)
+    assert stats['cycles'] == 80 and stats['partial_cycles'] == 0 and stats['errors'] == 0
+
+
+def test_gateway_applies_backpressure_when_pool_saturates():
+    scorer = MeanScorer(delay=0.02)
+    results, stats = _run_gateway(scorer, 30, max_pending_cycles=2, max_batch_size=4, n_workers=1)
+
+    assert len(results) == 60
+    assert stats['backpressure_waits'] > 0
+    assert stats['max_pending'] <= 2
+    assert max(scorer.batch_sizes) <= 4
+
+
+def test_assembler_does_not_complete_cycles_on_duplicate_frames():
+    assembler = CycleAssembler()
+    assert assembler.add(3, 0, SENSOR_PRESSURE, 0, np.ones(3000)) is None
+    assert assembler.add(3, 0, SENSOR_PRESSURE, 0, np.ones(3000)) is None
+    assert assembler.add(3, 0, SENSOR_PRESSURE, 1000, np.ones(3000)) is None
+    assert assembler.add(3, 0, SENSOR_FLOW, 0, np.ones(600)) is None
+    assert assembler.overlapping == 2
+
+    _, _, pressure, _ = assembler.add(3, 0, SENSOR_PRESSURE, 4000, np.full(2000, 2.0))
+    assert pressure[:4000].sum() == 4000 and pressure[4000:].sum() == 4000
+
+
+def test_assembler_evicts_cycles_of_closed_connections():
+    assembler = CycleAssembler()
+    first, second = object(), object()
+    assembler.add(1, 0, SENSOR_PRESSURE, 0, np.ones(600), owner=first)
+    assembler.add(2, 0, SENSOR_PRESSURE, 0, np.ones(600), owner=first)
+    assembler.add(2, 0, SENSOR_PRESSURE, 600, np.ones(600), owner=second)
+
+    assembler.evict({1, 2}, first)
+    assert len(assembler) == 1 and assembler.dropped == 1
+
+
+def test_gateway_isolates_invalid_frames_and_failing_cycles():
+    async def scenario():
+        gateway = await IngestionGateway(FailingOnNegativeScorer(), max_batch_size=8, n_workers=1).start(port=0)
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', gateway.port)
+            writer.write(encode_frame(9, 0, 5, 0, np.ones(10)) + _cycle_frames(1, 0, 1000.0)
+                         + _cycle_frames(2, 0, -1.0) + _cycle_frames(3, 0, 2000.0))
+            await writer.drain()
+            results = {}
+            for _ in range(4):
+                valve_id, _, status, probability = RESULT.unpack(await reader.readexactly(RESULT.size))
+                results[valve_id] = (status, probability)
+            writer.close()
+        finally:
+            await gateway.close()
+        return results, gateway.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert results[9][0] == STATUS_INVALID_FRAME
+    assert results[2][0] == STATUS_SCORING_FAILED
+    assert results[1] == (STATUS_OK, 601.0) and results[3] == (STATUS_OK, 602.0)
+    assert stats['errors'] == 2 and stats['cycles'] == 3
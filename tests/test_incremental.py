@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.incremental import full_retrain, rescale_model, update_model
+from src.train_model import train_gradient_boosting, train_knn, train_random_forest
+
+
+def make_data(n, seed, offset=0.0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(loc=offset, size=(n, 4)) * [1.0, 2.0, 0.5, 3.0] + [10.0, -5.0, 0.0, 100.0]
+    y = (X[:, 0] - 10.0 + (X[:, 1] + 5.0) / 2 > 0).astype(int)
+    return X, y
+
+
+@pytest.fixture
+def trained():
+    X, y = make_data(400, seed=0)
+    scaler = StandardScaler().fit(X)
+    return X, y, scaler
+
+
+@pytest.mark.parametrize('trainer', [train_gradient_boosting, train_random_forest])
+def test_rescale_model_keeps_tree_predictions(trained, trainer):
+    X, y, scaler = trained
+    model = trainer(scaler.transform(X), y, n_estimators=10)
+    X_new, _ = make_data(100, seed=1)
+    new_scaler = StandardScaler().fit(np.vstack([X, X_new]))
+    expected = model.predict_proba(scaler.transform(X_new))
+
+    assert rescale_model(model, scaler, new_scaler)
+    np.testing.assert_allclose(model.predict_proba(new_scaler.transform(X_new)), expected)
+
+
+def test_rescale_model_keeps_linear_predictions(trained):
+    X, y, scaler = trained
+    model = SGDClassifier(loss='log_loss', random_state=42).fit(scaler.transform(X), y)
+    new_scaler = StandardScaler().fit(X * 1.5 + 2.0)
+    expected = model.decision_function(scaler.transform(X))
+
+    assert rescale_model(model, scaler, new_scaler)
+    np.testing.assert_allclose(model.decision_function(new_scaler.transform(X)), expected)
+
+
+def test_update_model_adds_boosting_stages(trained):
+    X, y, scaler = trained
+    model = train_gradient_boosting(scaler.transform(X), y, n_estimators=30)
+    X_new, y_new = make_data(100, seed=1)
+    X_val, y_val = make_data(100, seed=2)
+
+    updated, updated_scaler, info = update_model(model, scaler, X_new, y_new, X_val, y_val, n_new_stages=5)
+
+    assert info['mode'] == 'incremental' and info['reason'] is None
+    assert updated.n_estimators_ == 35 and model.n_estimators_ == 30
+    assert updated_scaler.n_samples_seen_ == 500 and scaler.n_samples_seen_ == 400
+    assert info['score_after'] >= info['score_before'] - 0.02
+
+
+def test_update_model_retrains_on_drift(trained):
+    X, y, scaler = trained
+    model = train_gradient_boosting(scaler.transform(X), y, n_estimators=30)
+    X_new, y_new = make_data(100, seed=1, offset=3.0)
+    X_val, y_val = make_data(100, seed=2)
+    X_full, y_full = np.vstack([X, X_new]), np.concatenate([y, y_new])
+
+    updated, updated_scaler, info = update_model(model, scaler, X_new, y_new, X_val, y_val,
+                                                 X_full=X_full, y_full=y_full)
+
+    assert info['mode'] == 'full' and info['reason'] == 'dérive des caractéristiques'
+    assert updated.n_estimators == 30 and updated_scaler.n_samples_seen_ == 500
+
+    _, _, info = update_model(model, scaler, X_new, y_new, X_val, y_val)
+    assert info['mode'] == 'unchanged'
+
+
+def test_update_model_retrains_models_without_incremental_path(trained):
+    X, y, scaler = trained
+    model = train_knn(scaler.transform(X), y)
+    X_new, y_new = make_data(50, seed=1)
+
+    _, _, info = update_model(model, scaler, X_new, y_new, X_new, y_new,
+                              X_full=np.vstack([X, X_new]), y_full=np.concatenate([y, y_new]))
+
+    assert info['mode'] == 'full' and info['reason'] == 'modèle non incrémental'
+
+
+def test_full_retrain_resets_warm_start(trained):
+    X, y, _ = trained
+    model, _ = full_retrain(train_gradient_boosting(X, y, n_estimators=10).set_params(warm_start=True), X, y,
+                            base_n_estimators=12)
+    assert model.n_estimators_ == 12 and not model.warm_start
+
+
+def test_full_retrain_restores_size_before_incremental_stages(trained):
+    X, y, scaler = trained
+    model = train_gradient_boosting(scaler.transform(X), y, n_estimators=30)
+    X_new, y_new = make_data(100, seed=1)
+    updated, updated_scaler, _ = update_model(model, scaler, X_new, y_new, X_new, y_new, n_new_stages=5)
+    assert updated.n_estimators == 35
+
+    retrained, _ = full_retrain(updated, np.vstack([X, X_new]), np.concatenate([y, y_new]))
+    assert retrained.n_estimators_ == 30
@@ -0,0 +1,39 @@
+import json
+import os
+
+import numpy as np
+
+from src.instrumentation import RunReport
+
+
+def test_stages_are_recorded_and_saved(tmp_path):
+    report = RunReport('test', profile_stage='compute', profile_dir=str(tmp_path))
+
+    with report.stage('allocate', rows=1000):
+        np.ones((1000, 1000)).sum()
+
+    @report.timed('compute', rows=len)
+    def compute():
+        return list(range(500))
+
+    compute()
+    report.save(str(tmp_path / "report.json"))
+    saved = json.loads((tmp_path / "report.json").read_text())
+
+    assert [stage['name'] for stage in saved['stages']] == ['allocate', 'compute']
+    allocate, computed = saved['stages']
+    assert allocate['rows'] == 1000 and allocate['wall_s'] >= 0 and allocate['cpu_s'] >= 0
+    assert computed['rows'] == 500
+    assert os.path.exists(computed['profile']['path'])
+    assert 'profile' not in allocate
+    assert 'allocate' in report.summary()
+
+
+def test_stage_is_recorded_when_it_fails():
+    report = RunReport()
+    try:
+        with report.stage('failing'):
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert report.stages[0]['name'] == 'failing'
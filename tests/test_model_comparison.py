@@ -0,0 +1,44 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.model_comparison import compare_models
+
+
+def test_compare_models_writes_table_and_best_model(tmp_path):
+    rng = np.random.default_rng(5)
+    X = rng.normal(size=(200, 7))
+    y = (X[:, 0] + X[:, 1] > 0).astype(int)
+
+    results = compare_models(
+        X[:150], y[:150], X[150:], y[150:],
+        model_names=['logistic_regression', 'knn'], n_jobs=2, output_dir=str(tmp_path),
+    )
+
+    assert set(results['model']) == {'logistic_regression', 'knn'}
+    assert results['f1'].is_monotonic_decreasing
+    assert {'fit_time_s', 'predict_rows_per_s', 'wall_time_s', 'peak_rss_mb'} <= set(results.columns)
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "model_comparison.csv"), results, check_dtype=False)
+    best = joblib.load(tmp_path / "best_model.pkl")
+    assert type(best).__name__ == {'logistic_regression': 'LogisticRegression',
+                                   'knn': 'KNeighborsClassifier'}[results.loc[0, 'model']]
+
+
+def test_peak_memory_excludes_parent_memory(tmp_path):
+    rng = np.random.default_rng(5)
+    X = rng.normal(size=(200, 7))
+    y = (X[:, 0] > 0).astype(int)
+    parent_memory = np.ones(200 * 1024 ** 2 // 8)
+
+    results = compare_models(X[:150], y[:150], X[150:], y[150:], model_names=['knn'],
+                             n_jobs=1, output_dir=str(tmp_path))
+
+    assert parent_memory.sum() > 0
+    assert results.loc[0, 'peak_rss_mb'] < 100
+
+
+def test_unknown_model_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        compare_models(np.zeros((4, 2)), [0, 1, 0, 1], np.zeros((2, 2)), [0, 1],
+                       model_names=['inconnu'], output_dir=str(tmp_path))
@@ -0,0 +1,127 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.features import extract_features_batch
+from src.serving import MicroBatcher, ValveScorer, create_server
+
+
+class _CountingScorer:
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, pressure_matrix, flow_matrix):
+        self.calls += 1
+        return pressure_matrix[:, 0] / 1000.0
+
+
+class _FailingOnNegativeScorer(_CountingScorer):
+    def predict_proba(self, pressure_matrix, flow_matrix):
+        if (pressure_matrix < 0).any():
+            raise ValueError("pression négative")
+        return super().predict_proba(pressure_matrix, flow_matrix)
+
+
+@pytest.fixture
+def fitted_scorer(sensor_matrices):
+    pressure, flow = sensor_matrices
+    features = extract_features_batch(pressure, flow)
+    scaler = StandardScaler().fit(features)
+    labels = np.arange(len(features)) % 2
+    model = LogisticRegression().fit(scaler.transform(features), labels)
+    return ValveScorer(model, scaler)
+
+
+def test_scorer_matches_manual_pipeline(sensor_matrices, fitted_scorer):
+    pressure, flow = sensor_matrices
+    expected = fitted_scorer.model.predict_proba(
+        fitted_scorer.scaler.transform(extract_features_batch(pressure, flow))
+    )[:, 1]
+    np.testing.assert_allclose(fitted_scorer.predict_proba(pressure, flow), expected)
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    scorer = _CountingScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=64, max_wait_ms=50)
+    pressure = np.arange(32, dtype=float).reshape(32, 1) * np.ones((1, 4))
+    flow = np.zeros((32, 2))
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        futures = list(pool.map(lambda i: batcher.submit(pressure[i], flow[i]), range(32)))
+    results = [future.result(timeout=5) for future in futures]
+    batcher.close()
+
+    np.testing.assert_allclose(np.concatenate(results), np.arange(32) / 1000.0)
+    assert scorer.calls < 32
+    assert batcher.tracker.summary()['requests'] == 32
+
+
+def test_micro_batcher_isolates_failing_request():
+    scorer = _FailingOnNegativeScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=64, max_wait_ms=50)
+    pressure = np.arange(8, dtype=float).reshape(8, 1) * np.ones((1, 4))
+    pressure[3] = -1.0
+
+    futures = [batcher.submit(pressure[i], np.zeros(2)) for i in range(8)]
+    with pytest.raises(ValueError):
+        futures[3].result(timeout=5)
+    results = [futures[i].result(timeout=5) for i in range(8) if i != 3]
+    batcher.close()
+
+    np.testing.assert_allclose(np.concatenate(results), np.delete(np.arange(8), 3) / 1000.0)
+    assert batcher.tracker.summary()['requests'] == 7
+
+
+def test_http_scoring_failure_returns_json_error(sensor_matrices):
+    pressure, flow = sensor_matrices
+    batcher = MicroBatcher(_FailingOnNegativeScorer())
+    server = create_server(batcher, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_port}/predict",
+            data=json.dumps({'pressure': (-pressure[:1]).tolist(), 'flow': flow[:1].tolist()}).encode(),
+            headers={'Content-Type': 'application/json'},
+        )
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request)
+        assert error.value.code == 500
+        assert 'pression négative' in json.load(error.value)['error']
+    finally:
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+
+
+def test_http_predict_and_stats(sensor_matrices, fitted_scorer):
+    pressure, flow = sensor_matrices
+    batcher = MicroBatcher(fitted_scorer)
+    server = create_server(batcher, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        request = urllib.request.Request(
+            f"{base_url}/predict",
+            data=json.dumps({'pressure': pressure[:2].tolist(), 'flow': flow[:2].tolist()}).encode(),
+            headers={'Content-Type': 'application/json'},
+        )
+        with urllib.request.urlopen(request) as response:
+            payload = json.load(response)
+        with urllib.request.urlopen(f"{base_url}/stats") as response:
+            stats = json.load(response)
+    finally:
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+
+    np.testing.assert_allclose(payload['probabilities'], fitted_scorer.predict_proba(pressure[:2], flow[:2]))
+    assert stats['requests'] == 1
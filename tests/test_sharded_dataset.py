@@ -0,0 +1,102 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from src.features import extract_features_batch
+from src.sharded_dataset import (
+    extract_shard_features,
+    import_text_dataset,
+    iter_feature_chunks,
+    iter_shards,
+    list_shards,
+    train_on_feature_chunks,
+    write_shard,
+)
+from src.synthetic import generate_cycles, write_dataset
+
+
+@pytest.fixture
+def sharded_root(tmp_path):
+    root = str(tmp_path / "shards")
+    for index, (plant, start, end) in enumerate([
+        ('lyon', '2024-01-01', '2024-01-31'),
+        ('lyon', '2024-02-01', '2024-02-29'),
+        ('nantes', '2024-01-01', '2024-01-31'),
+    ]):
+        pressure, flow, valve_opening = generate_cycles(30, seed=index)
+        write_shard(root, plant, pressure, flow, valve_opening, start=start, end=end)
+    return root
+
+
+def test_list_shards_filters_by_plant_and_period(sharded_root):
+    assert [(s['plant'], s['shard_id']) for s in list_shards(sharded_root)] == [
+        ('lyon', 'part-00000'), ('lyon', 'part-00001'), ('nantes', 'part-00000'),
+    ]
+    assert len(list_shards(sharded_root, plants=['nantes'])) == 1
+    assert [s['start'] for s in list_shards(sharded_root, start='2024-02-01')] == ['2024-02-01']
+
+    shard, pressure, flow, valve_opening = next(iter_shards(sharded_root))
+    assert isinstance(pressure, np.memmap)
+    assert pressure.shape == (30, 6000) and flow.shape == (30, 600) and len(valve_opening) == 30
+
+
+def test_shard_features_are_incremental_and_match_batch(sharded_root, tmp_path):
+    feature_dir = str(tmp_path / "features")
+
+    first = extract_shard_features(sharded_root, feature_dir, n_workers=2, chunk_size=7)
+    assert len(first['computed']) == 3 and first['skipped'] == []
+
+    pressure, flow, valve_opening = generate_cycles(30, seed=0)
+    X, y = next(iter_feature_chunks(feature_dir, plants=['lyon']))
+    np.testing.assert_allclose(X[:30], extract_features_batch(pressure, flow).to_numpy())
+    np.testing.assert_array_equal(y[:30], (valve_opening == 100).astype(int))
+
+    write_shard(sharded_root, 'nantes', *generate_cycles(10, seed=9))
+    second = extract_shard_features(sharded_root, feature_dir, n_workers=1)
+    assert second['computed'] == ['nantes/part-00001']
+    assert len(second['skipped']) == 3
+
+
+def test_training_consumes_features_in_bounded_chunks(sharded_root, tmp_path):
+    feature_dir = str(tmp_path / "features")
+    extract_shard_features(sharded_root, feature_dir, n_workers=1)
+
+    chunks = list(iter_feature_chunks(feature_dir, chunk_rows=8))
+    assert max(len(X) for X, _ in chunks) == 8
+    assert sum(len(X) for X, _ in chunks) == 90
+
+    model, scaler = train_on_feature_chunks(feature_dir, chunk_rows=8, n_epochs=5)
+    X = np.vstack([X for X, _ in chunks])
+    y = np.concatenate([y for _, y in chunks])
+    assert model.score(scaler.transform(X), y) > 0.6
+
+
+def test_import_text_dataset(tmp_path):
+    write_dataset(str(tmp_path / "data"), 25)
+    paths = import_text_dataset(str(tmp_path / "shards"), 'lyon', data_dir=str(tmp_path / "data"), shard_cycles=10)
+
+    assert len(paths) == 3
+    assert [s['n_cycles'] for s in list_shards(str(tmp_path / "shards"))] == [10, 10, 4]
+
+    again = import_text_dataset(str(tmp_path / "shards"), 'lyon', data_dir=str(tmp_path / "data"), shard_cycles=10)
+    assert again == paths
+    assert len(list_shards(str(tmp_path / "shards"))) == 3
+
+
+def test_write_shard_never_reuses_a_live_shard_id(sharded_root):
+    first = list_shards(sharded_root, plants=['lyon'])[0]
+    shutil.rmtree(first['path'])
+
+    write_shard(sharded_root, 'lyon', *generate_cycles(5, seed=3))
+
+    assert [s['shard_id'] for s in list_shards(sharded_root, plants=['lyon'])] == ['part-00001', 'part-00002']
+    assert list_shards(sharded_root, plants=['lyon'])[0]['n_cycles'] == 30
+
+
+def test_feature_chunks_skip_deleted_shards(sharded_root, tmp_path):
+    feature_dir = str(tmp_path / "features")
+    extract_shard_features(sharded_root, feature_dir, n_workers=1)
+    shutil.rmtree(list_shards(sharded_root, plants=['nantes'])[0]['path'])
+
+    assert sum(len(X) for X, _ in iter_feature_chunks(feature_dir)) == 60
@@ -0,0 +1,36 @@
+import numpy as np
+
+from src.features import extract_features
+from src.streaming import StreamingFeatureExtractor
+
+
+def _assert_features_close(actual, expected):
+    assert list(actual) == list(expected)
+    np.testing.assert_allclose(list(actual.values()), list(expected.values()), rtol=1e-8)
+
+
+def test_closed_cycle_matches_batch(sensor_matrices):
+    pressure, flow = sensor_matrices
+    extractor = StreamingFeatureExtractor()
+
+    for p_cycle, f_cycle in zip(pressure[:3], flow[:3]):
+        # Arrivée entrelacée : 10 échantillons PS2 pour 1 échantillon FS1
+        for i, f_value in enumerate(f_cycle):
+            extractor.extend(p_cycle[10 * i:10 * (i + 1)], [f_value])
+        _assert_features_close(extractor.close_cycle(), extract_features(p_cycle, f_cycle))
+        assert extractor.n_pressure == extractor.n_flow == 0
+
+
+def test_provisional_features_match_prefix(sensor_matrices):
+    pressure, flow = sensor_matrices
+    extractor = StreamingFeatureExtractor()
+    extractor.extend(pressure[0, :2500], flow[0, :250])
+
+    _assert_features_close(extractor.features(), extract_features(pressure[0, :2500], flow[0, :250]))
+
+
+def test_empty_cycle_is_undefined():
+    features = StreamingFeatureExtractor().features()
+    assert np.isnan(features['skew_pressure'])
+    assert np.isnan(features['derivative_max_pressure'])
+    assert features['integral_flow'] == 0.0
@@ -0,0 +1,40 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.tuning import tune_model, tune_models
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(6)
+    X = rng.normal(size=(240, 5))
+    y = (X[:, 0] - X[:, 2] + rng.normal(0, 0.3, 240) > 0).astype(int)
+    return X, y
+
+
+def test_halving_prunes_candidates(dataset):
+    X, y = dataset
+    result = tune_model('gradient_boosting', X, y, n_splits=3, n_candidates=9, n_jobs=1)
+
+    candidates = result['candidates_per_iteration']
+    assert candidates[0] == 9
+    assert all(later < earlier for earlier, later in zip(candidates, candidates[1:]))
+    assert result['resources_per_iteration'][-1] > result['resources_per_iteration'][0]
+    assert {'learning_rate', 'max_depth', 'n_estimators'} <= set(result['params'])
+
+
+def test_tune_models_writes_best_params(tmp_path, dataset):
+    X, y = dataset
+    output = tmp_path / "best_params.json"
+    results = tune_models(X, y, model_names=['knn', 'logistic_regression'], output_path=str(output),
+                          n_splits=3, n_jobs=1)
+
+    assert json.loads(output.read_text()) == json.loads(json.dumps(results))
+    assert set(results) == {'knn', 'logistic_regression'}
+
+
+def test_unknown_model_is_rejected(dataset):
+    with pytest.raises(ValueError):
+        tune_model('inconnu', *dataset)
@@ -0,0 +1,81 @@
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+matplotlib.use('Agg')
+
+from src.synthetic import generate_cycles
+from src.utils import (
+    extract_cycles,
+    extract_segments,
+    lttb,
+    minmax_envelope,
+    plot_cycles,
+    plot_feature_histograms,
+)
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    pressure, flow, valve_opening = generate_cycles(80, seed=2)
+    return pd.DataFrame({'valve_opening': valve_opening}), pd.DataFrame(pressure), pd.DataFrame(flow)
+
+
+def test_extract_cycles_matches_extract_segments(dataset):
+    df_profile, df_pressure, df_flow = dataset
+    selected = [3, 0, 41]
+    pressure, flow, optimal = extract_cycles(df_profile, df_pressure, df_flow, selected)
+    pressure_segments, flow_segments, labels = extract_segments(df_profile, df_pressure, df_flow, selected)
+
+    np.testing.assert_array_equal(pressure, np.vstack(pressure_segments))
+    np.testing.assert_array_equal(flow, np.vstack(flow_segments))
+    assert labels == ['Optimale' if value else 'Non optimale' for value in optimal]
+    assert len(extract_cycles(df_profile, df_pressure, df_flow)[0]) == 80
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    signal = np.sin(np.linspace(0, 6 * np.pi, 2000))
+    signal[1234] = 5.0
+    indices, decimated = lttb(np.vstack([signal, -signal]), 100)
+
+    assert indices.shape == decimated.shape == (2, 100)
+    assert (indices[:, 0] == 0).all() and (indices[:, -1] == 1999).all()
+    assert (np.diff(indices, axis=1) > 0).all()
+    assert 1234 in indices[0] and 1234 in indices[1]
+    np.testing.assert_array_equal(decimated[0], signal[indices[0]])
+
+    _, short = lttb(signal[:50], 100)
+    np.testing.assert_array_equal(short[0], signal[:50])
+
+
+def test_minmax_envelope_bounds_each_bin():
+    values = np.random.default_rng(0).normal(size=(3, 100))
+    centers, lower, upper, mean = minmax_envelope(values, 10)
+
+    np.testing.assert_allclose(centers, np.arange(4.5, 100, 10))
+    np.testing.assert_array_equal(lower, values.reshape(3, 10, 10).min(axis=2))
+    np.testing.assert_array_equal(upper, values.reshape(3, 10, 10).max(axis=2))
+    np.testing.assert_allclose(mean, values.reshape(3, 10, 10).mean(axis=2))
+
+
+def test_plot_cycles_switches_to_bands_for_large_groups(dataset):
+    df_profile, df_pressure, df_flow = dataset
+    pressure, flow, optimal = extract_cycles(df_profile, df_pressure, df_flow)
+
+    fig = plot_cycles(pressure, flow, optimal, max_lines=10, show=False)
+    assert all(ax.collections and ax.get_legend() is not None for ax in fig.axes)
+
+    fig = plot_cycles(pressure, flow, optimal, max_lines=100, n_points=200, show=False)
+    lines = fig.axes[0].collections[0].get_segments()
+    assert len(lines) == optimal.sum() and all(len(line) == 200 for line in lines)
+
+
+def test_plot_feature_histograms_one_panel_per_feature():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'a': rng.normal(size=500), 'b': rng.normal(size=500),
+                       'target': rng.integers(0, 2, 500)})
+    df.loc[0, 'a'] = np.nan
+
+    fig = plot_feature_histograms(df, 'target', ['a', 'b'], bins=20, n_cols=3, show=False)
+    assert [ax.get_visible() for ax in fig.axes] == [True, True, False]
@@ -0,0 +1,71 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from src.features import extract_features_batch
+from src.windowed_features import (
+    extract_window_features,
+    first_alarm,
+    score_windows,
+    train_window_model,
+    window_views,
+)
+
+
+def test_window_views_share_memory():
+    matrix = np.arange(40, dtype=np.float64).reshape(2, 20)
+    views = window_views(matrix, 10, 5)
+    assert views.shape == (2, 3, 10)
+    assert np.shares_memory(views, matrix)
+    np.testing.assert_array_equal(views[1, 2], matrix[1, 10:20])
+
+
+def test_window_features_match_full_extraction_on_each_slice(sensor_matrices):
+    pressure, flow = sensor_matrices
+    windows = extract_window_features(pressure, flow, window_s=20, step_s=10, profile='extended', chunk_size=5)
+
+    assert len(windows) == len(pressure) * 5
+    for window in range(5):
+        expected = extract_features_batch(pressure[:, window * 1000:window * 1000 + 2000],
+                                          flow[:, window * 100:window * 100 + 200], profile='extended')
+        got = windows[windows['window'] == window].drop(columns=['cycle', 'window', 'start_s', 'end_s'])
+        np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(dtype=np.float64))
+    assert windows['end_s'].max() == 60
+
+
+def test_partial_cycle_yields_only_complete_windows(sensor_matrices):
+    pressure, flow = sensor_matrices
+    windows = extract_window_features(pressure[:, :2500], flow[:, :250])
+    assert sorted(windows['end_s'].unique()) == [10, 15, 20, 25]
+    with pytest.raises(ValueError):
+        extract_window_features(pressure[:, :500], flow[:, :50])
+    with pytest.raises(ValueError):
+        extract_window_features(pressure, flow, window_s=0.05)
+
+
+def test_working_memory_does_not_grow_with_overlap(sensor_matrices):
+    pressure, flow = sensor_matrices
+
+    def working_memory(step_s):
+        tracemalloc.start()
+        result = extract_window_features(pressure, flow, step_s=step_s)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        return peak - current
+
+    assert working_memory(0.5) < 1.5 * working_memory(5.0)
+
+
+def test_window_model_raises_alarms_before_end_of_cycle(sensor_matrices):
+    pressure, flow = sensor_matrices
+    y = np.arange(len(pressure)) % 2
+    pressure = pressure + 15 * y[:, None]
+
+    windows = extract_window_features(pressure, flow, profile=['mean_pressure', 'std_flow'])
+    model, scaler = train_window_model(windows, y, model_name='random_forest', n_estimators=20)
+    alarms = first_alarm(windows, score_windows(model, scaler, windows))
+
+    assert alarms[y == 0].max() < 60
+    assert alarms[y == 1].isna().all()